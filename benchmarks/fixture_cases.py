@@ -0,0 +1,20 @@
+# Trivial tests run by benchmarks/run_benchmarks.py to time the conftest.py fixtures around them.
+# The file name keeps it out of normal test collection.
+import os
+import pytest
+from tests.base_ui_test import BaseUITest
+
+ITERATIONS = range(int(os.environ.get("BENCH_FIXTURE_ITERATIONS", "10")))
+
+
+@pytest.mark.api
+@pytest.mark.parametrize("iteration", ITERATIONS)
+def test_api_fixture(api_setup, iteration):
+    assert api_setup.get("endpoint")["key"] == "expected_value"
+
+
+@pytest.mark.ui
+class TestUIFixture(BaseUITest):
+    @pytest.mark.parametrize("iteration", ITERATIONS)
+    def test_ui_fixture(self, iteration):
+        self.ui_actions.open_url(os.environ["BENCH_BASE_URL"] + "/index.html")
@@ -0,0 +1,155 @@
+import json
+import os
+import threading
+import uuid
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+SITE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "site")
+
+
+class _Handler(SimpleHTTPRequestHandler):
+    """Static files from benchmarks/site, a small JSON stub API under /api/ and a stub WebDriver hub under /wd/hub/"""
+
+    protocol_version = "HTTP/1.1"  # Keep-alive, like a real API server
+    disable_nagle_algorithm = True  # Headers and body go out in separate writes; avoid delayed-ACK stalls
+
+    def do_GET(self):
+        parts = urlsplit(self.path)
+        if parts.path.startswith("/wd/hub/"):
+            return self._webdriver("GET", b"")
+        if not parts.path.startswith("/api/"):
+            return super().do_GET()
+        query = parse_qs(parts.query)
+        if parts.path == "/api/items":
+            # Link-header pagination over 10 pages of 20 items.
+            page = int(query.get("page", ["1"])[0])
+            items = [{"id": (page - 1) * 20 + i, "name": f"item {i}"} for i in range(20)]
+            headers = {}
+            if page < 10:
+                headers["Link"] = f'<{self._base()}/api/items?page={page + 1}>; rel="next"'
+            return self._json(200, items, headers)
+        if parts.path == "/api/endpoint":
+            return self._json(200, {"key": "expected_value"})
+        return self._json(404, {"error": "not found"})
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        if urlsplit(self.path).path.startswith("/wd/hub/"):
+            return self._webdriver("POST", body)
+        if urlsplit(self.path).path == "/api/echo":
+            try:
+                payload = json.loads(body or b"null")
+            except ValueError:
+                payload = body.decode("utf-8", "replace")
+            return self._json(201, {"echo": payload})
+        return self._json(404, {"error": "not found"})
+
+    def do_DELETE(self):
+        if urlsplit(self.path).path.startswith("/wd/hub/"):
+            return self._webdriver("DELETE", b"")
+        return self._json(404, {"error": "not found"})
+
+    def _webdriver(self, method: str, body: bytes) -> None:
+        # Just enough of the W3C protocol for sessions to start, pass pool health checks and resets, and quit.
+        parts = urlsplit(self.path).path[len("/wd/hub/"):].strip("/").split("/")
+        sessions = self.server.webdriver_sessions
+        if parts == ["session"] and method == "POST":
+            requested = json.loads(body or b"{}").get("capabilities", {}).get("alwaysMatch", {})
+            session_id = uuid.uuid4().hex
+            sessions[session_id] = "about:blank"
+            capabilities = {"browserName": requested.get("browserName", "chrome"), "browserVersion": "stub"}
+            return self._json(200, {"value": {"sessionId": session_id, "capabilities": capabilities}})
+        if parts == ["status"]:
+            return self._json(200, {"value": {"ready": True, "message": "stub hub"}})
+        if len(parts) < 2 or parts[0] != "session" or parts[1] not in sessions:
+            return self._json(404, {"value": {"error": "invalid session id", "message": "no such session",
+                                              "stacktrace": ""}})
+        session_id, command = parts[1], "/".join(parts[2:])
+        if not command and method == "DELETE":
+            del sessions[session_id]
+            return self._json(200, {"value": None})
+        if command == "window/handles":
+            return self._json(200, {"value": ["stub-window"]})
+        if command == "window" and method == "GET":
+            return self._json(200, {"value": "stub-window"})
+        if command == "url":
+            if method == "POST":
+                sessions[session_id] = json.loads(body or b"{}").get("url", "about:blank")
+                return self._json(200, {"value": None})
+            return self._json(200, {"value": sessions[session_id]})
+        return self._json(200, {"value": None})
+
+    def _base(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _json(self, status: int, payload, headers=None) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class LocalServer:
+    """Serves the fixture pages, the stub API and the stub WebDriver hub on 127.0.0.1 from a background thread"""
+
+    def __init__(self, port: int = 0):
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), partial(_Handler, directory=SITE_DIR))
+        self._server.daemon_threads = True
+        self._server.webdriver_sessions = {}
+        self._thread = threading.Thread(target=self._server.serve_forever, name="benchmark-server", daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def api_url(self) -> str:
+        return f"{self.url}/api"
+
+    @property
+    def hub_url(self) -> str:
+        return f"{self.url}/wd/hub"
+
+    @property
+    def open_sessions(self) -> int:
+        return len(self._server.webdriver_sessions)
+
+    def start(self) -> "LocalServer":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "LocalServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+if __name__ == "__main__":
+    # Serve in the foreground, e.g. for `pytest --execution=cloud --hub-url=<hub>` session plumbing checks.
+    import sys
+    import time
+
+    with LocalServer(int(sys.argv[1]) if len(sys.argv) > 1 else 0) as server:
+        print(f"site: {server.url}\napi: {server.api_url}\nhub: {server.hub_url}")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            pass
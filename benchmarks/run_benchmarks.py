@@ -0,0 +1,288 @@
+"""Offline benchmarks of the framework's own overhead.
+
+Run from the project root:
+
+    python -m benchmarks.run_benchmarks --output benchmarks/results/baseline.json
+    python -m benchmarks.run_benchmarks --compare benchmarks/results/baseline.json --fail-on-regression
+
+Everything runs against benchmarks/local_server.py on 127.0.0.1; no network access is needed.
+Browser benchmarks need a local browser and are skipped (with a note) when none can be started.
+"""
+import argparse
+import itertools
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List, Optional
+
+import pytest
+import selenium
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options as ChromeOptions
+from selenium.webdriver.common.by import By
+
+from benchmarks.local_server import LocalServer
+from benchmarks.stats import DEFAULT_THRESHOLD, compare, summarize
+from utils.api_actions import APIActions
+from utils.browser_setup import get_driver, stop_shared_services
+from utils.config import get_config, load_config, set_config
+from utils.session_broker import RemoteSessionBroker, SessionSlots
+from utils.ui_actions import UIActions
+from utils.waits import PRESENT, STRATEGIES, WaitEngine
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+WAIT_DELAY_MS = 100
+
+
+class BenchmarkRun:
+    """Collects timing samples per benchmark name"""
+
+    def __init__(self, iterations: int, warmup: int):
+        self.iterations = iterations
+        self.warmup = warmup
+        self.samples: Dict[str, List[float]] = {}
+
+    def measure(self, name: str, action: Callable[[], Optional[float]], iterations: Optional[int] = None,
+                warmup: Optional[int] = None, setup: Optional[Callable[[], None]] = None) -> None:
+        """Time `action`; if it returns a number, that number is the sample instead of the wall time"""
+        samples = []
+        for i in range((self.warmup if warmup is None else warmup) + (iterations or self.iterations)):
+            if setup is not None:
+                setup()
+            start = time.perf_counter()
+            result = action()
+            elapsed = time.perf_counter() - start
+            if i >= (self.warmup if warmup is None else warmup):
+                samples.append(result if isinstance(result, float) else elapsed)
+        self.add(name, samples)
+
+    def add(self, name: str, samples: List[float]) -> None:
+        if samples:
+            self.samples[name] = samples
+            summary = summarize(samples)
+            print(f"  {name:<32} median {summary['median'] * 1000:9.2f} ms   p95 {summary['p95'] * 1000:9.2f} ms")
+
+    def results(self) -> Dict[str, dict]:
+        return {name: {"unit": "s", "samples": samples, "summary": summarize(samples)}
+                for name, samples in self.samples.items()}
+
+
+def bench_config(run: BenchmarkRun) -> None:
+    print("config")
+    run.measure("config.load", lambda: load_config())
+
+
+def bench_api(run: BenchmarkRun, server: LocalServer) -> None:
+    print("api")
+    api = APIActions(server.api_url)
+    run.measure("api.get", lambda: api.get("endpoint"))
+    run.measure("api.post", lambda: api.post("echo", {"name": "benchmark"}))
+    paths = ["endpoint"] * 50
+    run.measure("api.get_many_50", lambda: api.get_many(paths))
+    run.measure("api.iter_items_10_pages", lambda: sum(1 for _ in api.iter_items("items")))
+    api.session.close()
+
+
+def bench_remote(run: BenchmarkRun, server: LocalServer) -> None:
+    print("remote")
+    # Session start + quit on the stub hub: a new connection per session versus the broker's kept-alive one.
+    run.measure("remote.session_plain", lambda: webdriver.Remote(server.hub_url, options=ChromeOptions()).quit())
+    with tempfile.TemporaryDirectory() as slots_dir:
+        broker = RemoteSessionBroker(server.hub_url, SessionSlots(slots_dir, 1))
+        run.measure("remote.session_broker", lambda: broker.open(ChromeOptions()).quit())
+        broker.close()
+
+
+def bench_browser(run: BenchmarkRun, config, browser: str, start_iterations: int) -> bool:
+    """Driver start, navigation, UIActions and wait benchmarks; False when no browser can be started"""
+    index_url = config["base_url"] + "/index.html"
+    second_url = config["base_url"] + "/second.html"
+    try:
+        get_driver(browser, config).quit()
+    except Exception as e:
+        print(f"browser: skipped, could not start {browser}: {str(e).splitlines()[0]}")
+        return False
+
+    print("driver")
+    run.measure("driver.cold_start", lambda: get_driver(browser, config).quit(),
+                iterations=start_iterations, warmup=0, setup=stop_shared_services)
+    # With a shared service the next sessions reuse the already running driver binary.
+    warm_config = dict(config, launcher=dict(config.get("launcher", {}), shared_service=True))
+    get_driver(browser, warm_config).quit()
+    run.measure("driver.warm_start", lambda: get_driver(browser, warm_config).quit(),
+                iterations=start_iterations, warmup=0)
+
+    driver = get_driver(browser, warm_config)
+    try:
+        print("navigation")
+        pages = itertools.cycle([index_url, second_url])
+        run.measure("navigation.get", lambda: driver.get(next(pages)))
+
+        print("ui_actions")
+        driver.get(index_url)
+        ui = UIActions(driver)
+        run.measure("ui.open_url", lambda: ui.open_url(index_url))
+        run.measure("ui.click", lambda: ui.click((By.ID, "submit")))
+        run.measure("ui.type_text", lambda: ui.type_text((By.ID, "name"), "benchmark"))
+        run.measure("ui.get_text", lambda: ui.get_text((By.ID, "title")))
+        run.measure("ui.get_attribute", lambda: ui.get_attribute((By.ID, "name"), "value"))
+        run.measure("ui.is_visible", lambda: ui.is_visible((By.ID, "title")))
+        run.measure("ui.is_enabled", lambda: ui.is_enabled((By.ID, "submit")))
+        run.measure("ui.select_by_text", lambda: ui.select_by_text((By.ID, "colour"), "Green"))
+        run.measure("ui.hover", lambda: ui.hover((By.ID, "hover")))
+        run.measure("ui.execute_script", lambda: ui.execute_script("return 1;"))
+        run.measure("ui.get_shadow_element", lambda: ui.get_shadow_element((By.ID, "host"), ".inner"))
+        run.measure("ui.read_fields_4", lambda: ui.read_fields(
+            {"title": (By.ID, "title"), "name": (By.ID, "name"), "result": (By.ID, "result"), "link": (By.ID, "link")},
+            ("text", "visible"),
+        ))
+        run.measure("ui.snapshot", lambda: ui.snapshot().get_text((By.ID, "title")))
+        run.measure("ui.accept_alert", lambda: ui.accept_alert(), setup=lambda: driver.execute_script(
+            "setTimeout(function () { document.getElementById('alert').click(); }, 0);"))
+
+        print("waits")
+        driver.get(index_url)
+        driver.execute_script("document.getElementById('delay').setAttribute('data-ms', arguments[0]);", WAIT_DELAY_MS)
+
+        def reset_delayed():
+            driver.execute_script("var el = document.getElementById('delayed'); if (el) { el.remove(); }")
+
+        for strategy in STRATEGIES:
+            waits = WaitEngine(driver, strategy)
+
+            def wait_latency(waits=waits):
+                # Time from the element being scheduled to the wait returning, minus the scheduled delay.
+                start = time.perf_counter()
+                driver.execute_script("document.getElementById('delay').click();")
+                waits.until((By.ID, "delayed"), PRESENT, 5)
+                return max(time.perf_counter() - start - WAIT_DELAY_MS / 1000, 0.0)
+
+            run.measure(f"wait.{strategy}", wait_latency, setup=reset_delayed)
+    finally:
+        driver.quit()
+        stop_shared_services()
+    return True
+
+
+class _FixtureTimer:
+    """pytest plugin recording setup/teardown durations of the benchmark fixture cases"""
+
+    def __init__(self):
+        self.samples: Dict[str, List[float]] = {}
+
+    def pytest_runtest_logreport(self, report):
+        if report.when in ("setup", "teardown") and report.passed:
+            kind = "ui" if "TestUIFixture" in report.nodeid else "api"
+            self.samples.setdefault(f"fixture.{kind}.{report.when}", []).append(report.duration)
+
+
+def bench_fixtures(run: BenchmarkRun, server: LocalServer, browser: Optional[str]) -> None:
+    print("fixtures")
+    timer = _FixtureTimer()
+    previous_config = get_config()
+    previous_env = dict(os.environ)
+    with tempfile.TemporaryDirectory() as tmp:
+        # The inner run gets its own histories and outputs, so benchmarking never feeds the project's
+        # duration or flaky history, reports or auth states.
+        os.environ.update({
+            "BENCH_BASE_URL": server.url,
+            "BENCH_FIXTURE_ITERATIONS": str(run.iterations + run.warmup),
+            "FRAMEWORK_RESULTS__ENABLED": "false",
+            "FRAMEWORK_RESULTS__PYTEST_HTML": "false",
+            "FRAMEWORK_SCHEDULER__HISTORY_PATH": os.path.join(tmp, "durations.sqlite"),
+            "FRAMEWORK_RERUNS__HISTORY_PATH": os.path.join(tmp, "flaky.sqlite"),
+            "FRAMEWORK_ARTIFACTS__DIRECTORY": os.path.join(tmp, "artifacts"),
+            "FRAMEWORK_INSTRUMENTATION__TRACE_PATH": os.path.join(tmp, "trace.json"),
+            "FRAMEWORK_AUTH__STATE_PATH": os.path.join(tmp, "auth_state"),
+        })
+        args = [
+            os.path.join(ROOT, "benchmarks", "fixture_cases.py"), "-q", "-p", "no:cacheprovider",
+            "--execution", "local", "--api-mode", "live",
+            "--base_url", server.url, "--api_base_url", server.api_url, "--network-profile", "none",
+        ]
+        args += ["--browsers", browser] if browser else ["-m", "api"]
+        if not browser:
+            # Nothing to pre-warm without a browser.
+            os.environ["FRAMEWORK_LAUNCHER__ENABLED"] = "false"
+        try:
+            pytest.main(args, plugins=[timer])
+        finally:
+            os.environ.clear()
+            os.environ.update(previous_env)
+            set_config(previous_config)
+    for name, samples in sorted(timer.samples.items()):
+        run.add(name, samples[run.warmup:])
+
+
+def print_comparison(rows: List[dict]) -> None:
+    print("\ncomparison with baseline")
+    for row in rows:
+        if row["verdict"] == "new":
+            print(f"  {row['name']:<32} new")
+            continue
+        print(f"  {row['name']:<32} {row['before'] * 1000:9.2f} -> {row['after'] * 1000:9.2f} ms "
+              f"({row['change']:+.1%}, t={row['t']:+.1f})  {row['verdict']}")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--browser", default="chrome", help="Browser for the browser benchmarks")
+    parser.add_argument("--no-browser", action="store_true", help="Only run the benchmarks that need no browser")
+    parser.add_argument("--iterations", type=int, default=20, help="Samples per benchmark")
+    parser.add_argument("--warmup", type=int, default=2, help="Unrecorded iterations before sampling")
+    parser.add_argument("--start-iterations", type=int, default=5, help="Samples for driver cold/warm start")
+    parser.add_argument("--output", default=os.path.join("benchmarks", "results", "latest.json"),
+                        help="Where to write the results (JSON)")
+    parser.add_argument("--compare", help="Results file of a previous run to compare against")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Minimum relative change of the median to report")
+    parser.add_argument("--fail-on-regression", action="store_true", help="Exit with status 1 on any regression")
+    options = parser.parse_args(argv)
+
+    run = BenchmarkRun(options.iterations, options.warmup)
+    with LocalServer() as server:
+        config = load_config({
+            "execution": "local", "base_url": server.url, "api_base_url": server.api_url,
+            "api__mode": "live", "api__lru_cache_size": 0, "network__profile": "none",
+        })
+        set_config(config)
+        bench_config(run)
+        bench_api(run, server)
+        bench_remote(run, server)
+        browser = None
+        if not options.no_browser and bench_browser(run, config.to_dict(), options.browser, options.start_iterations):
+            browser = options.browser
+        bench_fixtures(run, server, browser)
+
+    results = run.results()
+    output = {
+        "meta": {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "selenium": selenium.__version__,
+            "platform": platform.platform(),
+            "browser": browser,
+            "iterations": options.iterations,
+        },
+        "benchmarks": results,
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(options.output)), exist_ok=True)
+    with open(options.output, "w", encoding="utf-8") as f:
+        json.dump(output, f, indent=2)
+    print(f"\nresults written to {options.output}")
+
+    if options.compare:
+        with open(options.compare, encoding="utf-8") as f:
+            baseline = json.load(f)["benchmarks"]
+        rows = compare(baseline, results, options.threshold)
+        print_comparison(rows)
+        if options.fail_on_regression and any(row["verdict"] == "regression" for row in rows):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
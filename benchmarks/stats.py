@@ -0,0 +1,52 @@
+import math
+import statistics
+from typing import Dict, List, Mapping, Sequence
+
+# A change counts as a regression or improvement only when it is both large enough in relative
+# terms and statistically distinguishable from run-to-run noise (Welch's t-test, |t| above ~95%).
+DEFAULT_THRESHOLD = 0.10
+T_CRITICAL = 2.0
+
+
+def summarize(samples: Sequence[float]) -> Dict[str, float]:
+    """Summary statistics of timing samples (seconds)"""
+    ordered = sorted(samples)
+    n = len(ordered)
+    return {
+        "n": n,
+        "mean": statistics.fmean(ordered),
+        "median": statistics.median(ordered),
+        "stdev": statistics.stdev(ordered) if n > 1 else 0.0,
+        "min": ordered[0],
+        "p95": ordered[min(n - 1, math.ceil(0.95 * n) - 1)],
+    }
+
+
+def welch_t(a: Sequence[float], b: Sequence[float]) -> float:
+    """Welch's t statistic for the difference of the means of b and a"""
+    if len(a) < 2 or len(b) < 2:
+        return 0.0
+    difference = statistics.fmean(b) - statistics.fmean(a)
+    variance = statistics.variance(a) / len(a) + statistics.variance(b) / len(b)
+    if variance == 0:
+        return math.copysign(math.inf, difference) if difference else 0.0
+    return difference / math.sqrt(variance)
+
+
+def compare(baseline: Mapping[str, Mapping], current: Mapping[str, Mapping],
+            threshold: float = DEFAULT_THRESHOLD) -> List[Dict[str, object]]:
+    """Compare every benchmark present in both runs; lower is better for all of them"""
+    rows = []
+    for name, result in current.items():
+        previous = baseline.get(name)
+        if previous is None:
+            rows.append({"name": name, "verdict": "new"})
+            continue
+        before, after = previous["summary"]["median"], result["summary"]["median"]
+        change = (after - before) / before if before else 0.0
+        t = welch_t(previous["samples"], result["samples"])
+        verdict = "unchanged"
+        if abs(t) >= T_CRITICAL and abs(change) >= threshold:
+            verdict = "regression" if change > 0 else "improvement"
+        rows.append({"name": name, "verdict": verdict, "before": before, "after": after, "change": change, "t": t})
+    return rows
@@ -1,10 +1,25 @@
+import time
+_import_started = time.perf_counter()
 import pytest
-import yaml
-from utils.browser_setup import get_driver
-from utils.ui_actions import UIActions
-from utils.api_actions import APIActions
-from py.xml import html
+# Selenium and the UI helpers (utils.browser_setup, utils.ui_actions, utils.auth_state) are imported lazily,
+# once a UI test has been selected, so API-only and collect-only runs never load them.
+from utils.browser_launcher import BrowserLauncher, merge_launcher_stats, format_launcher_stats
+from utils.api_actions import APIActions, session_from_config, timeout_from_config
+from utils.api_recorder import API_MODES, ApiRecorder, LRUCache
+from utils.network_control import NetworkController, merge_network_stats, profile_from_config
+from utils.driver_pool import DriverPool
+from utils import instrumentation
+from utils.duration_history import DurationHistory, browser_from_nodeid
+from utils.artifacts import ArtifactWriter, capture_failure
+from utils.results_sink import ResultsSink
+from utils.rerun import FlakyHistory, SmartReruns
+from utils.startup_profile import StartupProfile, format_startup_profile
+from utils.config import FrameworkConfig, get_config, load_config, set_config
+from pytest_html import extras
 import os
+import sys
+# Reported with --profile-startup.
+_import_time = time.perf_counter() - _import_started
 
 def pytest_addoption(parser):
     parser.addoption(
@@ -31,57 +46,91 @@ def pytest_addoption(parser):
         default=None,
         help="Override API base_url from config"
     )
+    parser.addoption(
+        "--api-mode",
+        action="store",
+        default=None,
+        choices=API_MODES,
+        help="Override API mode from config: live (network), record (network + store responses) or replay (stored responses only)"
+    )
+    parser.addoption(
+        "--launch-profile",
+        action="store",
+        default=None,
+        help="Override the browser launch profile from config (a name under launch_profiles.profiles, e.g. standard, fast, fidelity, debug)"
+    )
+    parser.addoption(
+        "--instrument",
+        action="store_true",
+        default=None,
+        help="Time UIActions, page waits, APIActions, driver commands and HTTP bytes per test (HTML columns + Chrome trace)"
+    )
+    parser.addoption(
+        "--scheduler",
+        action="store",
+        default=None,
+        choices=("duration", "load"),
+        help="xdist scheduling with -n: duration (longest-first from run history, workers pinned to a browser) or load (plain xdist)"
+    )
+    parser.addoption(
+        "--network-profile",
+        action="store",
+        default=None,
+        help="Override the BiDi network profile for UI tests from config (a name under network.profiles, or none)"
+    )
+    parser.addoption(
+        "--hub-url",
+        action="store",
+        default=None,
+        help="Open cloud sessions on this WebDriver hub instead of the provider's (e.g. a local Selenium Grid or stub server)"
+    )
+    parser.addoption(
+        "--profile-startup",
+        action="store_true",
+        default=None,
+        help="Report import, collection and lazy UI import time, loaded modules and memory per process"
+    )
+    parser.addoption(
+        "--smart-reruns",
+        action="store",
+        type=int,
+        default=None,
+        help="Turn smart reruns on: re-run a test failing with a transient or browser-session error up to N times (0 turns them off)"
+    )
 
 def pytest_generate_tests(metafunc):
     if "browser_name" in metafunc.fixturenames:
-        # Determine execution mode: command-line overrides if provided, else from config file.
-        execution_cli = metafunc.config.getoption("--execution")
-        if execution_cli:
-            execution = execution_cli
-        else:
-            with open(os.getcwd()+"/config/config.yaml", "r") as file:
-                conf = yaml.safe_load(file)
-            execution = conf.get("execution", "local")
-
-        if execution == "local":
-            browsers_cli = metafunc.config.getoption("--browsers")
-            if browsers_cli:
-                browsers = [b.strip() for b in browsers_cli.split(",")]
-            else:
-                with open("config/config.yaml", "r") as file:
-                    conf = yaml.safe_load(file)
-                browsers = conf.get("browsers", ["chrome"])
-            metafunc.parametrize("browser_name", browsers, indirect=True)
+        # The run configuration already has command-line overrides applied (see pytest_configure).
+        conf = get_config()
+        if conf.execution == "local":
+            metafunc.parametrize("browser_name", list(conf.browsers), indirect=True)
         else:
             metafunc.parametrize("browser_name", ["cloud"], indirect=True)
 
-# Fixture to load configuration and override with command-line arguments (if provided)
+# Command-line options that override config values, keyed by config path ("__" separates nested keys)
+def cli_overrides(pytest_config):
+    browsers = pytest_config.getoption("--browsers")
+    smart_reruns = pytest_config.getoption("--smart-reruns")
+    return {
+        "execution": pytest_config.getoption("--execution"),
+        "browsers": [b.strip() for b in browsers.split(",")] if browsers else None,
+        "base_url": pytest_config.getoption("--base_url"),
+        "api_base_url": pytest_config.getoption("--api_base_url"),
+        "api__mode": pytest_config.getoption("--api-mode"),
+        "cloud_provider__hub_url": pytest_config.getoption("--hub-url"),
+        "launch_profiles__default": pytest_config.getoption("--launch-profile"),
+        "network__profile": pytest_config.getoption("--network-profile"),
+        "instrumentation__enabled": pytest_config.getoption("--instrument"),
+        "instrumentation__startup_profile": pytest_config.getoption("--profile-startup"),
+        "scheduler__strategy": pytest_config.getoption("--scheduler"),
+        "reruns__enabled": None if smart_reruns is None else smart_reruns > 0,
+        "reruns__max_reruns": smart_reruns,
+    }
+
+# Fixture to expose the run configuration (config file + environment + command-line overrides)
 @pytest.fixture(scope="session")
-def config_data(request):
-    config_path = os.path.join(os.path.dirname(__file__), "config", "config.yaml")
-    with open(config_path, "r") as file:
-        config = yaml.safe_load(file)
-    
-    # Override execution mode if provided via command-line
-    execution_override = request.config.getoption("--execution")
-    if execution_override:
-        config["execution"] = execution_override
-
-    # Override browsers if provided via command-line
-    browsers_override = request.config.getoption("--browsers")
-    if browsers_override:
-        config["browsers"] = [b.strip() for b in browsers_override.split(",")]
-
-    # Override base_url and api_base_url
-    base_url_override = request.config.getoption("--base_url")
-    if base_url_override:
-        config["base_url"] = base_url_override
-
-    api_base_url_override = request.config.getoption("--api_base_url")
-    if api_base_url_override:
-        config["api_base_url"] = api_base_url_override
-
-    return config
+def config_data():
+    return get_config()
 
 # Define the browser_name fixture. It now safely returns the parameter using getattr.
 @pytest.fixture
@@ -91,18 +140,88 @@ def browser_name(request):
         return param
     return "chrome"  # default fallback
 
-# Fixture for UI tests; driver is created based on the environment & browser_name, using config overrides.
+# Session-scoped driver pool. Each xdist worker is its own process, so each worker gets its own pool.
+@pytest.fixture(scope="session")
+def driver_pool(request, config_data):
+    from utils.browser_setup import get_driver
+
+    launcher = getattr(request.config, "browser_launcher", None)
+    default_profile = config_data.get("launch_profiles", {}).get("default")
+
+    def factory(browser_name, launch_profile):
+        if config_data.get("execution", "local") == "cloud":
+            # Idle pooled sessions hold capped slots, so they are quit before this worker waits on itself.
+            return get_driver(config_dict=config_data, launch_profile=launch_profile, evict_idle=pool.evict_idle)
+        # The launcher only pre-warms browsers with the default launch profile.
+        if launcher is not None and launch_profile == default_profile:
+            return launcher.acquire(browser_name)
+        return get_driver(browser_override=browser_name, config_dict=config_data, launch_profile=launch_profile)
+
+    def on_discard(browser_name, launch_profile):
+        # The pool will need a new driver for this browser: warm it up before the next test asks.
+        if launcher is not None and launch_profile == default_profile:
+            launcher.refill(browser_name)
+
+    pool_config = config_data.get("driver_pool", {})
+    pool = DriverPool(factory, max_uses=pool_config.get("max_uses", 25), on_discard=on_discard)
+    yield pool
+    pool.close_all()
+
+# Logged-in session states per role, shared by every test of the worker (and persisted to disk).
+@pytest.fixture(scope="session")
+def auth_states(config_data):
+    from utils.auth_state import AuthStateCache
+
+    return AuthStateCache(config_data.get("base_url"), config_data.get("auth", {}), root=os.path.dirname(__file__))
+
+# Fixture for UI tests; driver is taken from the pool based on the environment & browser_name.
+# Tests marked with @pytest.mark.fresh_browser (or runs with the pool disabled) get a brand new browser.
 @pytest.fixture(scope="function")
-def ui_setup(request, browser_name, config_data):
+def ui_setup(request, browser_name, config_data, driver_pool):
+    from utils.ui_actions import UIActions
+    from utils.session_broker import slot_wanted
+
+    # --instrument patches the UI side only once it is loaded; a no-op otherwise.
+    instrumentation.install_ui()
     # Record the browser name on the test node for reporting purposes.
     request.node.browser = browser_name
-    if config_data.get("execution", "local") == "cloud":
-        driver = get_driver(config_dict=config_data)
-    else:
-        driver = get_driver(browser_override=browser_name, config_dict=config_data)
-    ui_actions = UIActions(driver)
-    yield driver, ui_actions
-    ui_actions.quit_browser()
+    execution = config_data.get("execution", "local")
+    fresh = (
+        request.node.get_closest_marker("fresh_browser") is not None
+        or not config_data.get("driver_pool", {}).get("enabled", True)
+        # Set by the smart rerun plugin after the browser session crashed in an earlier attempt.
+        or getattr(request.node, "rerun_fresh_driver", False)
+    )
+    # @pytest.mark.launch_profile("name") overrides the run's launch profile for one test.
+    launch_marker = request.node.get_closest_marker("launch_profile")
+    launch_profile = launch_marker.args[0] if launch_marker else config_data.get("launch_profiles", {}).get("default")
+    started = time.perf_counter()
+    entry = driver_pool.acquire(browser_name, execution, fresh=fresh, launch_profile=launch_profile)
+    # Reported next to the browser: the profile used and how long the test waited for its driver.
+    request.node.launch_profile = launch_profile or "N/A"
+    request.node.startup_time = time.perf_counter() - started
+    # Block/stub network traffic through BiDi; @pytest.mark.network_profile("name") overrides the configured profile.
+    profile_marker = request.node.get_closest_marker("network_profile")
+    profile_name = profile_marker.args[0] if profile_marker else config_data.get("network", {}).get("profile")
+    profile = profile_from_config(config_data, profile_name)
+    network = NetworkController(entry.driver, profile, config_data.get("base_url")) if profile else None
+    if network is not None and not network.start():
+        network = None
+    ui_actions = UIActions(entry.driver)
+    # Kept on the node so pytest_runtest_makereport can capture failure artifacts from this browser.
+    request.node.driver = entry.driver
+    # @pytest.mark.role("name") starts the test already logged in as that role.
+    role_marker = request.node.get_closest_marker("role")
+    if role_marker:
+        auth_states = request.getfixturevalue("auth_states")
+        request.node.user_properties.append(("auth", auth_states.apply(ui_actions, role_marker.args[0])))
+    yield entry.driver, ui_actions
+    if network is not None:
+        request.node.user_properties.append(("network", network.stats()))
+        network.stop()
+    # A capped remote session is handed to the waiting worker rather than kept for this worker's next test.
+    discard = fresh or getattr(request.node, "rerun_fresh_driver", False) or slot_wanted(entry.driver)
+    driver_pool.release(entry, discard=discard)
 
 # Autouse fixture to attach ui_setup for UI tests only.
 # It attaches *only* for tests marked with @pytest.mark.ui and defined in a class.
@@ -115,19 +234,369 @@ def attach_ui_setup(request, browser_name):
         from pages.page_factory import create_page_factory
         request.cls.page = create_page_factory(request.cls.driver)
 
+# One keep-alive HTTP session per worker, shared by every API test.
+@pytest.fixture(scope="session")
+def api_session(config_data):
+    session = session_from_config(config_data.get("api", {}))
+    yield session
+    session.close()
+
+# Record/replay store and live GET cache, one per worker.
+@pytest.fixture(scope="session")
+def api_recorder(config_data):
+    api_config = config_data.get("api", {})
+    mode = api_config.get("mode", "live")
+    if mode == "live":
+        yield None
+        return
+    path = os.path.join(os.path.dirname(__file__), api_config.get("recordings_path", "recordings/api"))
+    recorder = ApiRecorder(path, mode, worker_id=os.environ.get("PYTEST_XDIST_WORKER"))
+    yield recorder
+    recorder.close()
+
+@pytest.fixture(scope="session")
+def api_cache(config_data):
+    size = config_data.get("api", {}).get("lru_cache_size", 0)
+    return LRUCache(size) if size else None
+
 # Fixture for API tests uses the overridden API base URL.
 @pytest.fixture(scope="function")
-def api_setup(config_data):
-    return APIActions(config_data["api_base_url"])
+def api_setup(config_data, api_session, api_recorder, api_cache):
+    timeout = timeout_from_config(config_data.get("api", {}))
+    return APIActions(config_data["api_base_url"], session=api_session, timeout=timeout,
+                      recorder=api_recorder, cache=api_cache)
+
+# Duration history of this run (see pytest_configure); module level because pytest_runtest_logreport gets no config.
+_duration_history = None
 
 def pytest_configure(config):
-    # Set default HTML report output if not specified.
-    if not config.option.htmlpath:
+    # Load the configuration once per run. xdist workers receive it from the controller instead of re-reading it.
+    workerinput = getattr(config, "workerinput", None)
+    if workerinput is not None and "framework_config" in workerinput:
+        set_config(FrameworkConfig.from_json(workerinput["framework_config"]))
+    else:
+        set_config(load_config(cli_overrides(config)))
+    config.startup_profile = StartupProfile()
+    config.startup_profile.add("conftest imports", _import_time)
+    config.startup_profiles = []
+    # --collect-only runs no tests: no reports, result stream, artifacts or run history.
+    collect_only = config.option.collectonly
+    results_config = get_config().get("results", {})
+    # Set default HTML report output if not specified (very large runs can rely on the paginated report instead).
+    if not config.option.htmlpath and results_config.get("pytest_html", True) and not collect_only:
         config.option.htmlpath = 'report.html'
+    # Stream every finished test to a JSONL file from the process that receives all reports.
+    if results_config.get("enabled", True) and not hasattr(config, "workerinput") and not collect_only:
+        root = os.path.dirname(__file__)
+        render_dir = results_config.get("html_dir", "reports/html")
+        if not results_config.get("render_on_finish", True):
+            render_dir = None
+        config.pluginmanager.register(ResultsSink(
+            os.path.join(root, results_config.get("jsonl_path", "reports/results.jsonl")),
+            render_dir=os.path.join(root, render_dir) if render_dir else None,
+            page_size=results_config.get("page_size", 500),
+        ), "results_sink")
+    # Reruns by failure kind; pytest-rerunfailures takes over when --reruns is given.
+    config.smart_reruns = None
+    config.rerun_counters = []
+    reruns_config = get_config().get("reruns", {})
+    if (reruns_config.get("enabled", False) and reruns_config.get("max_reruns", 2) > 0
+            and not getattr(config.option, "reruns", None) and not collect_only):
+        history_path = reruns_config.get("history_path", ".pytest_flaky.sqlite")
+        config.smart_reruns = SmartReruns(
+            max_reruns=reruns_config.get("max_reruns", 2),
+            backoff=reruns_config.get("backoff", 0.5),
+            max_backoff=reruns_config.get("max_backoff", 5.0),
+            history=FlakyHistory(os.path.join(os.path.dirname(__file__), history_path)) if history_path else None,
+            defer_known_flaky=reruns_config.get("defer_known_flaky", True),
+            flaky_threshold=reruns_config.get("flaky_threshold", 0.2),
+            min_runs=reruns_config.get("min_runs", 3),
+            record=not hasattr(config, "workerinput"),
+        )
+        config.pluginmanager.register(config.smart_reruns, "smart_reruns")
     # Ensure that a metadata dictionary exists.
     if not hasattr(config, 'metadata'):
         config.metadata = {}
     config.metadata['Project Name'] = 'Selenium & API Automation Testing Framework'
+    # Launcher stats collected from this process or, under xdist, from every worker.
+    config.launcher_stats = []
+    # Remote session broker stats (cloud execution) from this process or every worker.
+    config.session_broker_stats = []
+    # Per-test timings are only collected when instrumentation is switched on.
+    config.trace_writer = None
+    config.worker_trace_paths = []
+    if get_config().get("instrumentation", {}).get("enabled"):
+        instrumentation.install()
+        worker_id = os.environ.get("PYTEST_XDIST_WORKER", "gw0")
+        config.trace_writer = instrumentation.TraceWriter(pid=int(worker_id.lstrip("gw") or 0))
+    # Failure screenshots, page sources and browser logs are written by a background thread.
+    config.artifact_writer = None
+    config.artifacts_captured = 0
+    config.artifact_counters = []
+    artifacts_config = get_config().get("artifacts", {})
+    if artifacts_config.get("enabled", True) and not _is_xdist_controller(config) and not collect_only:
+        config.artifact_writer = ArtifactWriter(
+            os.path.join(os.path.dirname(__file__), artifacts_config.get("directory", "reports/artifacts")),
+            queue_size=artifacts_config.get("queue_size", 32),
+            compress=artifacts_config.get("compress", True),
+        )
+    # Test durations are recorded by the process that sees every report: the xdist controller or a plain run.
+    global _duration_history
+    _duration_history = config.duration_history = None
+    config.duration_scheduler = None
+    scheduler_config = get_config().get("scheduler", {})
+    if (scheduler_config.get("strategy", "duration") == "duration" and not hasattr(config, "workerinput")
+            and not collect_only):
+        _duration_history = config.duration_history = DurationHistory(
+            os.path.join(os.path.dirname(__file__), scheduler_config.get("history_path", ".pytest_durations.sqlite")),
+            smoothing=scheduler_config.get("smoothing", 0.5),
+            default_duration=scheduler_config.get("default_duration", 1.0),
+        )
+
+def _is_xdist_controller(config):
+    return not hasattr(config, "workerinput") and config.pluginmanager.has_plugin("dsession")
+
+def _may_select_ui_tests(config):
+    # With -m, a test marked only `ui` stands in for the UI tests; runs like `pytest -m api` never pre-warm.
+    markexpr = config.option.markexpr
+    if not markexpr:
+        return True
+    # Private pytest API: if it moves or changes, assume UI tests may be selected (pre-warm as before).
+    try:
+        from _pytest.mark.expression import Expression
+        return bool(Expression.compile(markexpr).evaluate(lambda name, **kwargs: name == "ui" and not kwargs))
+    except Exception:
+        return True
+
+def _start_launcher(config):
+    conf = get_config()
+    launcher_conf = conf.get("launcher", {})
+    if not launcher_conf.get("enabled", False) or conf.get("execution", "local") == "cloud":
+        return
+    from utils.browser_setup import get_driver
+    warm_sessions = launcher_conf.get("warm_sessions", {})
+    config.browser_launcher = BrowserLauncher(
+        lambda browser_name: get_driver(browser_override=browser_name, config_dict=conf),
+        {browser_name: warm_sessions.get(browser_name, 0) for browser_name in conf.get("browsers", ["chrome"])},
+    )
+    config.browser_launcher.start()
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_collection(session):
+    config = session.config
+    config.browser_launcher = None
+    # Start warming browsers in the background while the tests are being collected.
+    if not (_is_xdist_controller(config) or config.option.collectonly) and _may_select_ui_tests(config):
+        with config.startup_profile.phase("UI imports"):
+            _start_launcher(config)
+    config.collection_started = time.perf_counter()
+
+def pytest_collection_finish(session):
+    config = session.config
+    config.startup_profile.add("collection", time.perf_counter() - config.collection_started)
+    if _is_xdist_controller(config) or config.option.collectonly:
+        return
+    has_ui_tests = any(item.get_closest_marker("ui") for item in session.items)
+    if not has_ui_tests:
+        # Nothing to warm for runs that selected no UI tests (e.g. `pytest -m api`).
+        if config.browser_launcher is not None:
+            config.browser_launcher.stop()
+            config.browser_launcher = None
+        return
+    # Load the UI machinery now rather than inside the first test's setup.
+    with config.startup_profile.phase("UI imports"):
+        import utils.ui_actions
+        import utils.auth_state
+        instrumentation.install_ui()
+        if config.browser_launcher is None:
+            _start_launcher(config)
+
+def pytest_sessionfinish(session):
+    config = session.config
+    launcher = getattr(config, "browser_launcher", None)
+    if launcher is not None:
+        launcher.stop()
+        if hasattr(config, "workeroutput"):
+            config.workeroutput["launcher_stats"] = launcher.stats()
+        else:
+            config.launcher_stats.append(launcher.stats())
+    # Driver services and remote sessions can only have been started by a run that imported the browser setup.
+    if "utils.browser_setup" in sys.modules:
+        from utils.browser_setup import session_broker_stats, stop_shared_services
+        broker_stats = session_broker_stats()
+        if hasattr(config, "workeroutput"):
+            config.workeroutput["session_broker_stats"] = broker_stats
+        else:
+            config.session_broker_stats.extend(broker_stats)
+        stop_shared_services()
+    if config.artifact_writer is not None:
+        counters = config.artifact_writer.close()
+        if hasattr(config, "workeroutput"):
+            config.workeroutput["artifact_counters"] = counters
+        else:
+            config.artifact_counters.append(counters)
+    if config.trace_writer is not None and not _is_xdist_controller(config):
+        path = _trace_path(config)
+        if hasattr(config, "workeroutput"):
+            # Each worker writes its own file; the controller merges them.
+            path = f"{path}.{os.environ.get('PYTEST_XDIST_WORKER')}"
+            config.workeroutput["trace_path"] = path
+        config.trace_writer.write(path)
+    elif config.worker_trace_paths:
+        instrumentation.merge_traces(config.worker_trace_paths, _trace_path(config))
+    if config.duration_history is not None:
+        config.duration_history.save()
+    if hasattr(config, "workeroutput"):
+        config.workeroutput["startup_profile"] = config.startup_profile.snapshot()
+    if config.smart_reruns is not None and not _is_xdist_controller(config):
+        if hasattr(config, "workeroutput"):
+            config.workeroutput["rerun_counters"] = config.smart_reruns.counters
+        else:
+            config.rerun_counters.append(config.smart_reruns.counters)
+
+def _scheduling_browsers():
+    return list(get_config().browsers) + ["cloud"]
+
+@pytest.hookimpl(optionalhook=True, tryfirst=True)
+def pytest_xdist_make_scheduler(config, log):
+    # Replace plain load balancing (-n without --dist, or --dist load) with the duration-aware scheduler.
+    if config.duration_history is None or config.getvalue("dist") != "load":
+        return None
+    from utils.duration_scheduler import DurationScheduling
+    config.duration_scheduler = DurationScheduling(
+        config, log, history=config.duration_history, browsers=_scheduling_browsers()
+    )
+    return config.duration_scheduler
+
+def _trace_path(config):
+    path = get_config().get("instrumentation", {}).get("trace_path", "reports/trace.json")
+    return os.path.join(os.path.dirname(__file__), path)
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_configure_node(node):
+    # Hand the already loaded configuration to each xdist worker.
+    node.workerinput["framework_config"] = get_config().to_json()
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error):
+    # Collect launcher stats sent back by xdist workers.
+    workeroutput = getattr(node, "workeroutput", {})
+    stats = workeroutput.get("launcher_stats")
+    if stats:
+        node.config.launcher_stats.append(stats)
+    if workeroutput.get("artifact_counters"):
+        node.config.artifact_counters.append(workeroutput["artifact_counters"])
+    if workeroutput.get("trace_path"):
+        node.config.worker_trace_paths.append(workeroutput["trace_path"])
+    if workeroutput.get("rerun_counters"):
+        node.config.rerun_counters.append(workeroutput["rerun_counters"])
+    if workeroutput.get("session_broker_stats"):
+        node.config.session_broker_stats.extend(workeroutput["session_broker_stats"])
+    if workeroutput.get("startup_profile"):
+        node.config.startup_profiles.append((node.gateway.id, workeroutput["startup_profile"]))
+
+def pytest_terminal_summary(terminalreporter, config):
+    if config.launcher_stats:
+        terminalreporter.section("browser launcher")
+        for line in format_launcher_stats(merge_launcher_stats(config.launcher_stats)):
+            terminalreporter.write_line(line)
+    broker_sessions = [session for stats in config.session_broker_stats for session in stats["sessions"]]
+    if broker_sessions:
+        waits = [session["queue_wait"] for session in broker_sessions]
+        creates = [session["create"] for session in broker_sessions]
+        caps = {stats["max_sessions"] for stats in config.session_broker_stats}
+        terminalreporter.section("remote sessions")
+        terminalreporter.write_line(
+            f"sessions: {len(broker_sessions)}, cap: {', '.join(str(cap or 'none') for cap in sorted(caps))}, "
+            f"queue wait: total {sum(waits):.1f}s, max {max(waits):.1f}s, "
+            f"session start: mean {sum(creates) / len(creates):.2f}s"
+        )
+        for number, session in enumerate(broker_sessions[:20], start=1):
+            terminalreporter.write_line(
+                f"  session {number}: queue wait {session['queue_wait']:.2f}s, start {session['create']:.2f}s"
+            )
+        if len(broker_sessions) > 20:
+            terminalreporter.write_line(f"  ... {len(broker_sessions) - 20} more sessions")
+    # Per-test network counters travel in user_properties, so they also arrive from xdist workers.
+    network_stats = [
+        value
+        for reports in terminalreporter.stats.values()
+        for report in reports
+        if getattr(report, "when", None) == "teardown"
+        for name, value in getattr(report, "user_properties", ())
+        if name == "network"
+    ]
+    if network_stats:
+        totals = merge_network_stats(network_stats)
+        terminalreporter.section("network control")
+        terminalreporter.write_line(
+            f"tests: {totals['tests']}, requests: {totals['requests']}, blocked: {totals['blocked']}, "
+            f"stubbed: {totals['stubbed']}, received: {totals['bytes_received'] / 1024:.0f} KiB, "
+            f"saved (estimated): {totals['bytes_saved_estimate'] / 1024:.0f} KiB"
+        )
+    auth_outcomes = [
+        value
+        for reports in terminalreporter.stats.values()
+        for report in reports
+        if getattr(report, "when", None) == "teardown"
+        for name, value in getattr(report, "user_properties", ())
+        if name == "auth"
+    ]
+    if auth_outcomes:
+        terminalreporter.section("auth state")
+        terminalreporter.write_line(
+            f"tests: {len(auth_outcomes)}, injected: {auth_outcomes.count('injected')}, "
+            f"logins: {auth_outcomes.count('login')}, re-logins after rejection: {auth_outcomes.count('relogin')}"
+        )
+    artifact_totals = {
+        key: sum(counters[key] for counters in config.artifact_counters)
+        for key in ("written", "deduplicated", "dropped")
+    }
+    if any(artifact_totals.values()):
+        terminalreporter.section("failure artifacts")
+        terminalreporter.write_line(
+            f"written: {artifact_totals['written']}, deduplicated: {artifact_totals['deduplicated']}, "
+            f"dropped (queue full): {artifact_totals['dropped']}"
+        )
+    rerun_totals = {
+        key: sum(counters[key] for counters in config.rerun_counters)
+        for key in ("transient", "session", "recovered", "deferred")
+    }
+    if rerun_totals["transient"] or rerun_totals["session"]:
+        terminalreporter.section("smart reruns")
+        terminalreporter.write_line(
+            f"reruns after transient failures: {rerun_totals['transient']}, on a fresh driver after session "
+            f"failures: {rerun_totals['session']}, recovered: {rerun_totals['recovered']}, "
+            f"deferred to the end (known flaky): {rerun_totals['deferred']}"
+        )
+    if get_config().get("instrumentation", {}).get("startup_profile"):
+        terminalreporter.section("startup profile")
+        name = "controller" if _is_xdist_controller(config) else "main"
+        for line in format_startup_profile(name, config.startup_profile.snapshot()):
+            terminalreporter.write_line(line)
+        for worker, snapshot in sorted(config.startup_profiles):
+            for line in format_startup_profile(worker, snapshot):
+                terminalreporter.write_line(line)
+    scheduler = config.duration_scheduler
+    if scheduler is not None and scheduler.actual_makespan is not None:
+        terminalreporter.section("xdist scheduling")
+        terminalreporter.write_line(
+            f"predicted makespan: {scheduler.predicted_makespan:.1f}s, actual: {scheduler.actual_makespan:.1f}s, "
+            f"workers: {scheduler.workers}, browser switches: {scheduler.browser_switches}"
+        )
+
+@pytest.hookimpl(trylast=True)
+def pytest_runtest_logreport(report):
+    # Feed setup + call + teardown time into the duration history used by the xdist scheduler.
+    history = _duration_history
+    if history is not None and not (report.when == "setup" and report.skipped):
+        history.add(report.nodeid, browser_from_nodeid(report.nodeid, _scheduling_browsers()), report.duration)
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_runtest_setup(item):
+    # Start a fresh timing record before any fixture of the test runs.
+    if item.config.trace_writer is not None:
+        instrumentation.begin_test(item.nodeid)
 
 @pytest.hookimpl(hookwrapper=True)
 def pytest_runtest_makereport(item, call):
@@ -136,12 +605,60 @@ def pytest_runtest_makereport(item, call):
     rep = outcome.get_result()
     # Attach the browser information (if set) from the test node to the report.
     rep.browser = getattr(item, "browser", "N/A")
+    rep.launch_profile = getattr(item, "launch_profile", "N/A")
+    rep.startup_time = getattr(item, "startup_time", None)
+    if rep.failed and rep.when in ("setup", "call"):
+        _attach_failure_artifacts(item, rep)
+    # Timings so far (setup + call, then + teardown); the finished record goes to the trace file.
+    recorder = instrumentation.current()
+    if recorder is not None and recorder.nodeid == item.nodeid:
+        rep.instrumentation = recorder.summary()
+        if rep.when == "teardown":
+            item.config.trace_writer.add(recorder)
+
+def _attach_failure_artifacts(item, rep):
+    # Capture in memory now; the files are written in the background and only linked from the report.
+    config = item.config
+    driver = getattr(item, "driver", None)
+    limits = get_config().get("artifacts", {})
+    if config.artifact_writer is None or driver is None or config.artifacts_captured >= limits.get("max_per_run", 50):
+        return
+    config.artifacts_captured += 1
+    report_dir = os.path.dirname(os.path.abspath(config.option.htmlpath or __file__))
+    links = []
+    captured = capture_failure(driver, config.artifact_writer, limits)
+    # Also recorded on the report for the JSONL results sink.
+    rep.artifacts = captured
+    for label, path in captured:
+        if path is None:
+            links.append(f"<span>{label}: not captured</span>")
+            continue
+        href = os.path.relpath(path, report_dir).replace(os.sep, "/")
+        if label == "Screenshot":
+            links.append(f'<a href="{href}"><img src="{href}" loading="lazy" style="max-width: 320px;" alt="{label}"></a>')
+        else:
+            links.append(f'<a href="{href}">{label}</a>')
+    rep.extras = getattr(rep, "extras", []) + [extras.html("<div>" + " | ".join(links) + "</div>")]
 
 def pytest_html_results_table_header(cells):
+    from py.xml import html
     # Insert the header for a new column "Browser" into the HTML report.
     cells.insert(2, html.th('Browser'))
+    cells.insert(3, html.th('Launch Profile'))
+    cells.insert(4, html.th('Startup (s)'))
+    if get_config().get("instrumentation", {}).get("enabled"):
+        for offset, (_, title) in enumerate(instrumentation.COLUMNS):
+            cells.insert(5 + offset, html.th(title))
 
 def pytest_html_results_table_row(report, cells):
+    from py.xml import html
     # Safely insert the browser value into the HTML report row.
     browser = getattr(report, "browser", "N/A")
-    cells.insert(2, html.td(browser))    
\ No newline at end of file
+    cells.insert(2, html.td(browser))
+    cells.insert(3, html.td(getattr(report, "launch_profile", "N/A")))
+    startup_time = getattr(report, "startup_time", None)
+    cells.insert(4, html.td(f"{startup_time:.2f}" if startup_time is not None else "N/A"))
+    if get_config().get("instrumentation", {}).get("enabled"):
+        timings = getattr(report, "instrumentation", {})
+        for offset, (key, _) in enumerate(instrumentation.COLUMNS):
+            cells.insert(5 + offset, html.td(timings.get(key, "N/A")))    
\ No newline at end of file
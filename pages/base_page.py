@@ -1,11 +1,52 @@
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
+from utils.batch_read import read_fields
+from utils.config import get_config
+from utils.waits import PRESENT, WaitEngine
+
+class FieldGroup:
+    """Declares a group of named locators on a page object that are read in a single round trip.
+
+    class LoginPage(BasePage):
+        form = FieldGroup(("text", "visible"), username=(By.ID, "user-name"), ...)
+
+    page.form.read() -> {"username": {"text": ..., "visible": ...}, ...}
+    """
+
+    def __init__(self, properties=("text",), **fields):
+        self.properties = properties
+        self.fields = fields
+
+    def __get__(self, page, owner=None):
+        if page is None:
+            return self
+        return BoundFieldGroup(self, page)
+
+
+class BoundFieldGroup:
+    """A FieldGroup attached to a page instance"""
+
+    def __init__(self, group, page):
+        self.group = group
+        self.page = page
+
+    def read(self, properties=None, timeout=None):
+        return self.page.read_fields(self.group.fields, properties or self.group.properties, timeout)
+
 
 class BasePage:
     def __init__(self, driver):
         self.driver = driver
+        self.waits = WaitEngine(driver, get_config().get("selenium", {}).get("wait_strategy", "observer"))
+
+    def wait_for_element(self, locator, timeout=10, condition=PRESENT):
+        return self.waits.until(locator, condition, timeout)
+
+    def read_fields(self, fields, properties=("text",), timeout=10):
+        return read_fields(self.driver, fields, properties, waits=self.waits, timeout=timeout)
+
+    def snapshot(self):
+        """Capture the DOM once and answer locator queries locally (see utils/dom_snapshot.py).
 
-    def wait_for_element(self, locator, timeout=10):
-        return WebDriverWait(self.driver, timeout).until(
-            EC.presence_of_element_located(locator)
-        ) 
\ No newline at end of file
+        Like UIActions.snapshot(), it goes stale on the next interaction through UIActions.
+        """
+        from utils.ui_actions import capture_snapshot
+        return capture_snapshot(self.driver)
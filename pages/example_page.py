@@ -1,11 +1,19 @@
 from selenium.webdriver.common.by import By
-from .base_page import BasePage
+from .base_page import BasePage, FieldGroup
 
 class ExamplePage(BasePage):
+    # Read with self.login_form.read() in a single driver round trip
+    login_form = FieldGroup(
+        ("visible", "enabled", "attribute:value"),
+        username=(By.ID, "user-name"),
+        password=(By.ID, "password"),
+        login_button=(By.ID, "login-button"),
+    )
+
     def __init__(self, driver):
         super().__init__(driver)
         self.example_element = (By.XPATH, '//div[@class="login_logo"]')
 
     def get_example_text(self):
-        element = self.wait_for_element(self.example_element)
-        return element.text
\ No newline at end of file
+        # Waits for the element and reads its text in the same round trip
+        return self.read_fields({"logo": self.example_element}, "text")["logo"]
\ No newline at end of file
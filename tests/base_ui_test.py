@@ -1,9 +1,13 @@
 # tests/base_ui_test.py
-from selenium.webdriver.remote.webdriver import WebDriver
-from utils.ui_actions import UIActions
-from pages.page_factory import PageFactory
+from typing import TYPE_CHECKING
+
+# Only needed for the annotations; importing them here would load Selenium while collecting API-only runs.
+if TYPE_CHECKING:
+    from selenium.webdriver.remote.webdriver import WebDriver
+    from utils.ui_actions import UIActions
+    from pages.page_factory import PageFactory
 
 class BaseUITest:
-    driver: WebDriver
-    ui_actions: UIActions
-    page: PageFactory
\ No newline at end of file
+    driver: "WebDriver"
+    ui_actions: "UIActions"
+    page: "PageFactory"
\ No newline at end of file
@@ -0,0 +1,72 @@
+import io
+import json
+
+import pytest
+import requests
+from urllib3 import HTTPResponse
+
+from benchmarks.local_server import LocalServer
+from utils.api_actions import APIActions
+from utils.api_pagination import PageIterator, Pagination
+
+
+def _page(url, payload):
+    # A streamed response, as APIActions.iter_items hands to PageIterator.
+    response = requests.Response()
+    response.status_code = 200
+    response.url = url
+    response.headers["Content-Type"] = "application/json"
+    response.raw = HTTPResponse(body=io.BytesIO(json.dumps(payload).encode("utf-8")), status=200,
+                                preload_content=False)
+    return response
+
+
+@pytest.fixture(scope="module")
+def local_server():
+    with LocalServer() as server:
+        yield server
+
+
+@pytest.mark.parametrize("incremental", [True, False])
+def test_link_pagination(local_server, incremental):
+    api = APIActions(local_server.api_url)
+    items = list(api.iter_items("items", pagination={"style": "link", "incremental": incremental}))
+    assert [item["id"] for item in items] == list(range(200))
+
+
+@pytest.mark.parametrize("incremental", [True, False])
+def test_offset_pagination_stops_after_a_short_page(incremental):
+    collection = [{"id": i} for i in range(45)]
+    offsets = []
+
+    def send(url, params):
+        offsets.append(params["offset"])
+        return _page(url, {"data": collection[params["offset"]:params["offset"] + params["limit"]]})
+
+    pagination = Pagination("offset", items_path="data", page_size=20, incremental=incremental)
+    items = list(PageIterator(send, "https://api.example.com/items", None, pagination))
+    assert [item["id"] for item in items] == list(range(45))
+    assert offsets[:3] == [0, 20, 40]
+
+
+def test_cursor_pagination_follows_the_next_cursor():
+    pages = {
+        None: {"results": [1, 2], "meta": {"next": "b"}},
+        "b": {"results": [3, 4], "meta": {"next": "c"}},
+        "c": {"results": [5], "meta": {"next": None}},
+    }
+    cursors = []
+
+    def send(url, params):
+        cursors.append(params.get("after"))
+        return _page(url, pages[params.get("after")])
+
+    pagination = Pagination("cursor", items_path="results", cursor_param="after", next_cursor_path="meta.next")
+    items = list(PageIterator(send, "https://api.example.com/items", {"q": "x"}, pagination))
+    assert items == [1, 2, 3, 4, 5]
+    assert cursors == [None, "b", "c"]
+
+
+def test_unknown_pagination_style():
+    with pytest.raises(ValueError):
+        Pagination("page")
@@ -0,0 +1,25 @@
+from utils.api_recorder import request_key
+
+URL = "https://api.example.com/items"
+
+
+def test_request_key_ignores_parameter_order():
+    assert request_key("get", f"{URL}?b=2&a=1") == request_key("GET", URL, params={"a": 1, "b": 2})
+    assert request_key("GET", URL, params={"a": 1}) != request_key("GET", URL, params={"a": 2})
+
+
+def test_request_key_canonicalizes_json_bodies():
+    assert request_key("POST", URL, json_body={"a": 1, "b": 2}) == request_key("POST", URL, json_body={"b": 2, "a": 1})
+    assert request_key("POST", URL, json_body={"a": 1}) != request_key("PUT", URL, json_body={"a": 1})
+
+
+def test_request_key_separates_identities():
+    anonymous = request_key("GET", URL)
+    alice = request_key("GET", URL, headers={"Authorization": "Bearer alice"})
+    bob = request_key("GET", URL, headers={"authorization": "Bearer bob"})
+    assert len({anonymous, alice, bob}) == 3
+    assert request_key("GET", URL, headers={"AUTHORIZATION": "Bearer alice"}) == alice
+
+
+def test_request_key_ignores_other_headers():
+    assert request_key("GET", URL, headers={"Accept": "application/json"}) == request_key("GET", URL)
@@ -0,0 +1,60 @@
+import pytest
+from utils.config import FrameworkConfig, load_config
+
+CONFIG_YAML = """
+base_url: https://example.com
+browsers: [chrome]
+selenium:
+  timeout: 10
+  headless: false
+auth:
+  password: secret
+"""
+
+
+@pytest.fixture
+def config_path(tmp_path):
+    path = tmp_path / "config.yaml"
+    path.write_text(CONFIG_YAML)
+    return str(path)
+
+
+def test_env_overrides_are_typed_after_the_config_value(config_path):
+    config = load_config(path=config_path, environ={
+        "FRAMEWORK_SELENIUM__TIMEOUT": "20",
+        "FRAMEWORK_SELENIUM__HEADLESS": "true",
+        "FRAMEWORK_AUTH__PASSWORD": "0123",
+        "FRAMEWORK_BROWSERS": "chrome, firefox",
+    })
+    assert config.timeout == 20
+    assert config["selenium"]["headless"] is True
+    assert config["auth"]["password"] == "0123"
+    assert config.browsers == ("chrome", "firefox")
+
+
+def test_env_overrides_of_new_keys(config_path):
+    config = load_config(path=config_path, environ={
+        "FRAMEWORK_REPORTS__ENABLED": "False",
+        "FRAMEWORK_REPORTS__WORKERS": "4",
+        "FRAMEWORK_REPORTS__TOKEN": "1e3",
+        "OTHER_SETTING": "ignored",
+    })
+    assert config["reports"] == {"enabled": False, "workers": 4, "token": "1e3"}
+    assert "other_setting" not in config
+
+
+def test_cli_overrides_win_over_env(config_path):
+    config = load_config(
+        cli_overrides={"selenium__timeout": 30, "base_url": None},
+        path=config_path,
+        environ={"FRAMEWORK_SELENIUM__TIMEOUT": "20", "FRAMEWORK_BASE_URL": "https://staging.example.com"},
+    )
+    assert config.timeout == 30
+    assert config.base_url == "https://staging.example.com"
+
+
+def test_config_is_read_only_and_round_trips(config_path):
+    config = load_config(path=config_path, environ={})
+    with pytest.raises(TypeError):
+        config["selenium"]["timeout"] = 5
+    assert FrameworkConfig.from_json(config.to_json()).to_dict() == config.to_dict()
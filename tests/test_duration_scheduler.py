@@ -0,0 +1,81 @@
+from utils.duration_history import DurationHistory, browser_from_nodeid, predicted_makespan
+from utils.duration_scheduler import DurationScheduling
+
+
+class _Config:
+    def __init__(self, workers):
+        self.workers = workers
+
+    def getvalue(self, name):
+        return [f"{self.workers}*popen"]
+
+    def getoption(self, name):
+        return None
+
+
+class _Node:
+    shutting_down = False
+
+    def __init__(self, name):
+        self.gateway = type("Gateway", (), {"id": name})()
+        self.sent = []
+
+    def send_runtest_some(self, indices):
+        self.sent.extend(indices)
+
+    def shutdown(self):
+        self.shutting_down = True
+
+
+def test_browser_from_nodeid():
+    browsers = ("chrome", "firefox")
+    assert browser_from_nodeid("tests/test_ui.py::test_login[firefox]", browsers) == "firefox"
+    assert browser_from_nodeid("tests/test_ui.py::test_search[chrome-admin]", browsers) == "chrome"
+    assert browser_from_nodeid("tests/test_ui.py::test_search[admin]", browsers) is None
+    assert browser_from_nodeid("tests/test_api.py::test_get_endpoint", browsers) is None
+
+
+def test_predicted_makespan_packs_longest_first():
+    assert predicted_makespan([5, 4, 3, 2], 2) == 7
+    assert predicted_makespan([2, 2, 2], 1) == 6
+    assert predicted_makespan([], 4) == 0
+
+
+def test_history_predictions(tmp_path):
+    path = str(tmp_path / "durations.sqlite")
+    history = DurationHistory(path, smoothing=0.5)
+    history.add("test_a[chrome]", "chrome", 4.0)
+    history.add("test_b[chrome]", "chrome", 2.0)
+    history.save()
+    history.add("test_a[chrome]", "chrome", 8.0)
+    history.save()
+
+    reloaded = DurationHistory(path, smoothing=0.5)
+    assert reloaded.predict("test_a[chrome]", "chrome") == 6.0
+    # Unseen tests get the median of their browser, or the default without any history for it.
+    assert reloaded.predict("test_c[chrome]", "chrome") == 4.0
+    assert reloaded.predict("test_c[firefox]", "firefox") == 1.0
+
+
+def test_scheduler_sends_longest_first_and_pins_browsers(tmp_path):
+    collection = [f"tests/test_ui.py::test_{name}[{browser}]"
+                  for name in ("a", "b", "c") for browser in ("chrome", "firefox")]
+    history = DurationHistory(str(tmp_path / "durations.sqlite"))
+    for duration, nodeid in enumerate(collection, start=1):
+        history.add(nodeid, browser_from_nodeid(nodeid, ("chrome", "firefox")), float(duration))
+    history.save()
+
+    scheduler = DurationScheduling(_Config(2), history=DurationHistory(history.path), browsers=("chrome", "firefox"))
+    nodes = [_Node("gw0"), _Node("gw1")]
+    for node in nodes:
+        scheduler.add_node(node)
+        scheduler.add_node_collection(node, collection)
+    scheduler.schedule()
+
+    for node in nodes:
+        browsers = {browser_from_nodeid(collection[index], scheduler.browsers) for index in node.sent}
+        assert len(browsers) == 1
+        durations = [scheduler.predicted[index] for index in node.sent]
+        assert durations == sorted(durations, reverse=True)
+    assert scheduler.predicted_makespan == predicted_makespan(range(1, 7), 2)
+    assert scheduler.browser_switches == 0
@@ -0,0 +1,28 @@
+import pytest
+import requests
+from selenium.common.exceptions import (InvalidSessionIdException, NoSuchElementException,
+                                        SessionNotCreatedException, StaleElementReferenceException,
+                                        WebDriverException)
+
+from utils.rerun import ASSERTION, OTHER, SESSION, TRANSIENT, classify_failure
+
+
+@pytest.mark.parametrize("error, kind", [
+    (AssertionError("mismatch"), ASSERTION),
+    (StaleElementReferenceException("stale"), TRANSIENT),
+    (InvalidSessionIdException("gone"), SESSION),
+    (WebDriverException("chrome not reachable"), SESSION),
+    (SessionNotCreatedException("version mismatch"), OTHER),
+    (NoSuchElementException("missing"), OTHER),
+    (requests.ConnectionError("refused"), TRANSIENT),
+    (requests.Timeout("slow"), TRANSIENT),
+    (ValueError("bug"), OTHER),
+])
+def test_classify_failure(error, kind):
+    assert classify_failure(error) == kind
+
+
+def test_retried_request_errors_are_not_transient():
+    error = requests.ConnectionError("refused")
+    error.retries_exhausted = True
+    assert classify_failure(error) == OTHER
@@ -0,0 +1,48 @@
+import threading
+import time
+
+import pytest
+
+from utils.session_broker import SessionSlots
+
+
+def test_slot_is_capped(tmp_path):
+    slots = SessionSlots(str(tmp_path), max_sessions=1, poll_interval=0.05)
+    slot = slots.acquire(timeout=1)
+    with pytest.raises(TimeoutError):
+        slots.acquire(timeout=0.2)
+    slot.release()
+    slots.acquire(timeout=1).release()
+
+
+def test_evict_idle_frees_a_slot(tmp_path):
+    slots = SessionSlots(str(tmp_path), max_sessions=1, poll_interval=0.05)
+    idle = slots.acquire(timeout=1)
+
+    def evict_idle():
+        idle.release()
+        return 1
+
+    slot = slots.acquire(timeout=0.2, evict_idle=evict_idle)
+    assert slot.queue_wait < 0.2
+    slot.release()
+
+
+def test_waiters_are_visible_to_the_slot_holder(tmp_path):
+    slots = SessionSlots(str(tmp_path), max_sessions=1, poll_interval=0.05)
+    slot = slots.acquire(timeout=1)
+    assert not slot.contended()
+    acquired = []
+    waiter = threading.Thread(target=lambda: acquired.append(slots.acquire(timeout=5)))
+    waiter.start()
+
+    deadline = time.monotonic() + 5
+    while slots.waiting() == 0 and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert slot.contended()
+    slot.release()
+    waiter.join()
+
+    assert acquired[0].queue_wait > 0
+    assert slots.waiting() == 0
+    acquired[0].release()
@@ -1,4 +1,5 @@
 import pytest
+from selenium.webdriver.common.by import By
 from tests.base_ui_test import BaseUITest
 
 @pytest.mark.ui
@@ -10,4 +11,12 @@ class TestExamplePage(BaseUITest):
 
     def test_example_page2(self):
         self.ui_actions.open_url("https://www.saucedemo.com/")
-        assert self.page.example_page.get_example_text() == "Swag Labs"
\ No newline at end of file
+        assert self.page.example_page.get_example_text() == "Swag Labs"
+
+@pytest.mark.ui
+@pytest.mark.role("standard")
+class TestInventoryPage(BaseUITest):
+    def test_inventory_list_visible(self):
+        # The standard user's cached session is injected before the test, so no login form is needed
+        self.ui_actions.open_url("https://www.saucedemo.com/inventory.html")
+        assert self.ui_actions.is_visible((By.CLASS_NAME, "inventory_list"))
@@ -1,13 +1,232 @@
 import requests
+import time
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from urllib3.util.retry import Retry
+from typing import Any, Iterator, List, Mapping, Optional, Sequence, Tuple, Union
+from utils.api_pagination import PageIterator, Pagination
+from utils.api_recorder import ApiRecorder, LRUCache, request_key
+from utils.config import get_config
+
+# Only these methods are retried automatically; POST and PATCH are never replayed.
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+
+def create_session(pool_size: int = 10, retries: int = 3, backoff_factor: float = 0.3,
+                   status_forcelist: Tuple[int, ...] = (502, 503, 504)) -> requests.Session:
+    """Create a keep-alive session with a bounded connection pool and retries for idempotent methods"""
+    retry = Retry(
+        total=retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=status_forcelist,
+        allowed_methods=IDEMPOTENT_METHODS,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def session_from_config(api_config: Mapping) -> requests.Session:
+    """Create a session using the `api` section of config.yaml"""
+    return create_session(
+        pool_size=api_config.get("pool_size", 10),
+        retries=api_config.get("retries", 3),
+        backoff_factor=api_config.get("backoff_factor", 0.3),
+        status_forcelist=tuple(api_config.get("retry_statuses", (502, 503, 504))),
+    )
+
+
+def timeout_from_config(api_config: Mapping) -> Tuple[float, float]:
+    """(connect, read) timeout in seconds from the `api` section of config.yaml"""
+    return api_config.get("connect_timeout", 5), api_config.get("read_timeout", 30)
+
+
+class BatchResult:
+    """Outcome of one request sent by a batch method"""
+
+    def __init__(self, method: str, endpoint: str, response: Optional[requests.Response] = None,
+                 error: Optional[Exception] = None, latency: float = 0.0):
+        self.method = method
+        self.endpoint = endpoint
+        self.response = response
+        self.error = error
+        self.latency = latency
+
+    @property
+    def ok(self) -> bool:
+        """True when a response was received and its status is below 400"""
+        return self.error is None and self.response is not None and self.response.ok
+
+    @property
+    def status_code(self) -> Optional[int]:
+        return self.response.status_code if self.response is not None else None
+
+    def json(self):
+        return APIActions._json(self.response) if self.response is not None else None
+
+    def __repr__(self) -> str:
+        outcome = self.status_code if self.error is None else type(self.error).__name__
+        return f"BatchResult({self.method} {self.endpoint} -> {outcome} in {self.latency:.3f}s)"
+
 
 class APIActions:
-    def __init__(self, base_url):
+    def __init__(self, base_url, session: Optional[requests.Session] = None,
+                 timeout: Optional[Union[float, Tuple[float, float]]] = None,
+                 recorder: Optional[ApiRecorder] = None, cache: Optional[LRUCache] = None):
         self.base_url = base_url
+        # recorder: record/replay store (see utils/api_recorder.py); cache: LRU cache for live GETs
+        self.recorder = recorder
+        self.cache = cache
+        api_config = get_config().get("api", {})
+        self.session = session if session is not None else session_from_config(api_config)
+        self.timeout = timeout if timeout is not None else timeout_from_config(api_config)
+        self.batch_concurrency = api_config.get("batch_concurrency", 8)
+        self.pagination = api_config.get("pagination", {})
+        self.last_response: Optional[requests.Response] = None
+
+    def _send_url(self, method: str, url: str, **kwargs) -> requests.Response:
+        kwargs.setdefault("timeout", self.timeout)
+        mode = self.recorder.mode if self.recorder is not None else "live"
+        # requests auth objects are not part of the key, so their responses are never cached.
+        use_cache = (self.cache is not None and mode == "live" and method.upper() == "GET" and not kwargs.get("stream")
+                     and kwargs.get("auth") is None and self.session.auth is None)
+        if mode == "live" and not use_cache:
+            return self._live_request(method, url, **kwargs)
+
+        headers = CaseInsensitiveDict(self.session.headers)
+        headers.update(kwargs.get("headers") or {})
+        key = request_key(method, url, kwargs.get("params"), kwargs.get("json"), kwargs.get("data"), headers)
+        if mode == "replay":
+            return self.recorder.replay(key, method, url)
+        if use_cache:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+        response = self._live_request(method, url, **kwargs)
+        if mode == "record":
+            response = self.recorder.record(key, response)
+        if use_cache and response.ok:
+            response.content  # Read the body now so the cached response can be decoded repeatedly
+            self.cache.put(key, response)
+        return response
+
+    def _live_request(self, method: str, url: str, **kwargs) -> requests.Response:
+        try:
+            return self.session.request(method, url, **kwargs)
+        except requests.RequestException as e:
+            # The adapter already retried; tells the smart rerun plugin not to re-run the test on top of that.
+            try:
+                retries = self.session.get_adapter(url).max_retries
+            except (requests.RequestException, AttributeError):
+                retries = None
+            e.retries_exhausted = bool(getattr(retries, "total", 0))
+            raise
+
+    def _send(self, method: str, endpoint: str, **kwargs) -> requests.Response:
+        return self._send_url(method, f"{self.base_url}/{endpoint}", **kwargs)
+
+    def request(self, method: str, endpoint: str, **kwargs) -> requests.Response:
+        """Send a request and return the raw response"""
+        response = self._send(method, endpoint, **kwargs)
+        self.last_response = response
+        return response
+
+    @property
+    def status_code(self) -> Optional[int]:
+        """Status code of the last response"""
+        return self.last_response.status_code if self.last_response is not None else None
+
+    @property
+    def headers(self) -> Optional[Mapping]:
+        """Headers of the last response"""
+        return self.last_response.headers if self.last_response is not None else None
+
+    @staticmethod
+    def _json(response: requests.Response):
+        # Empty bodies (e.g. 204 No Content) have no JSON to decode.
+        return response.json() if response.content else None
 
     def get(self, endpoint, params=None):
-        response = requests.get(f"{self.base_url}/{endpoint}", params=params)
-        return response.json()
+        response = self.request("GET", endpoint, params=params)
+        return self._json(response)
 
     def post(self, endpoint, data=None):
-        response = requests.post(f"{self.base_url}/{endpoint}", json=data)
-        return response.json()
\ No newline at end of file
+        response = self.request("POST", endpoint, json=data)
+        return self._json(response)
+
+    def put(self, endpoint, data=None):
+        response = self.request("PUT", endpoint, json=data)
+        return self._json(response)
+
+    def patch(self, endpoint, data=None):
+        response = self.request("PATCH", endpoint, json=data)
+        return self._json(response)
+
+    def delete(self, endpoint, params=None):
+        response = self.request("DELETE", endpoint, params=params)
+        return self._json(response)
+
+    # Batch Operations
+    def request_many(self, calls: Sequence[Mapping[str, Any]], concurrency: Optional[int] = None,
+                     timeout: Optional[Union[float, Tuple[float, float]]] = None) -> List[BatchResult]:
+        """Send many requests concurrently on a bounded thread pool.
+
+        Each call is a mapping with `method` and `endpoint` plus any keyword accepted by
+        requests (params, json, headers, ...). Results are returned in input order; a failing
+        call is reported in its BatchResult and never aborts the rest of the batch.
+        """
+        def run(call):
+            call = dict(call)
+            method, endpoint = call.pop("method"), call.pop("endpoint")
+            if timeout is not None:
+                call.setdefault("timeout", timeout)
+            started = time.perf_counter()
+            try:
+                response = self._send(method, endpoint, **call)
+                return BatchResult(method, endpoint, response=response, latency=time.perf_counter() - started)
+            except Exception as e:
+                return BatchResult(method, endpoint, error=e, latency=time.perf_counter() - started)
+
+        if not calls:
+            return []
+        workers = min(concurrency or self.batch_concurrency, len(calls))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="api-batch") as executor:
+            return list(executor.map(run, calls))
+
+    def get_many(self, requests_list: Sequence[Union[str, Tuple[str, Optional[dict]]]],
+                 concurrency: Optional[int] = None,
+                 timeout: Optional[Union[float, Tuple[float, float]]] = None) -> List[BatchResult]:
+        """GET many endpoints concurrently. Items are endpoints or (endpoint, params) tuples."""
+        calls = []
+        for item in requests_list:
+            endpoint, params = (item, None) if isinstance(item, str) else item
+            calls.append({"method": "GET", "endpoint": endpoint, "params": params})
+        return self.request_many(calls, concurrency=concurrency, timeout=timeout)
+
+    def post_many(self, requests_list: Sequence[Tuple[str, Any]], concurrency: Optional[int] = None,
+                  timeout: Optional[Union[float, Tuple[float, float]]] = None) -> List[BatchResult]:
+        """POST many (endpoint, data) pairs concurrently"""
+        calls = [{"method": "POST", "endpoint": endpoint, "json": data} for endpoint, data in requests_list]
+        return self.request_many(calls, concurrency=concurrency, timeout=timeout)
+
+    # Pagination
+    def iter_items(self, endpoint: str, params: Optional[dict] = None,
+                   pagination: Optional[Union[Pagination, Mapping]] = None) -> Iterator[Any]:
+        """Iterate over every item of a paginated endpoint, prefetching the next page in the background.
+
+        Pagination settings come from `api.pagination.<endpoint>` (or `api.pagination.default`)
+        in config.yaml unless given explicitly.
+        """
+        if pagination is None:
+            pagination = self.pagination.get(endpoint, self.pagination.get("default"))
+        if not isinstance(pagination, Pagination):
+            pagination = Pagination.from_config(pagination)
+
+        def send(url, page_params):
+            return self._send_url("GET", url, params=page_params, stream=True)
+
+        return iter(PageIterator(send, f"{self.base_url}/{endpoint}", params, pagination))
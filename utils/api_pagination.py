@@ -0,0 +1,145 @@
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urljoin
+from typing import Any, Callable, Iterator, Mapping, Optional
+
+try:
+    import ijson  # Decodes large JSON pages item by item instead of buffering them (in requirements.txt)
+except ImportError:
+    ijson = None
+
+_warned_no_ijson = False
+
+
+def _get_path(data: Any, dotted_path: str) -> Any:
+    """Read a value from nested dicts using a dotted path ("" returns the data itself)"""
+    for key in filter(None, dotted_path.split(".")):
+        if not isinstance(data, Mapping):
+            return None
+        data = data.get(key)
+    return data
+
+
+class Pagination:
+    """How an endpoint pages through its results.
+
+    Styles:
+      - link:   follow the `rel="next"` URL of the Link response header
+      - offset: send offset/limit query parameters until a short page is returned
+      - cursor: send the cursor found at `next_cursor_path` in the body until it is empty
+    """
+
+    STYLES = ("link", "offset", "cursor")
+
+    def __init__(self, style: str = "link", items_path: str = "", cursor_param: str = "cursor",
+                 next_cursor_path: str = "next_cursor", offset_param: str = "offset",
+                 limit_param: str = "limit", page_size: int = 100, incremental: bool = True):
+        if style not in self.STYLES:
+            raise ValueError(f"Unsupported pagination style: {style}")
+        self.style = style
+        self.items_path = items_path
+        self.cursor_param = cursor_param
+        self.next_cursor_path = next_cursor_path
+        self.offset_param = offset_param
+        self.limit_param = limit_param
+        self.page_size = page_size
+        self.incremental = incremental
+        global _warned_no_ijson
+        if incremental and ijson is None and style != "cursor" and not _warned_no_ijson:
+            _warned_no_ijson = True
+            print("Warning: ijson is not installed, so paginated API responses are buffered whole "
+                  "instead of decoded incrementally (pip install ijson)")
+
+    @classmethod
+    def from_config(cls, settings: Optional[Mapping]) -> "Pagination":
+        return cls(**dict(settings or {}))
+
+    @property
+    def streams_body(self) -> bool:
+        # Cursor pages must be decoded completely to find the next cursor.
+        return self.incremental and ijson is not None and self.style != "cursor"
+
+
+class PageIterator:
+    """Yields the items of a paginated collection while the next page is fetched in the background.
+
+    `send(url, params)` must return a requests.Response opened with stream=True. At most the
+    page being consumed and the prefetched page are held at any time; with `ijson` installed,
+    link/offset pages are decoded incrementally so only the items in flight stay in memory.
+    """
+
+    def __init__(self, send: Callable, url: str, params: Optional[Mapping], pagination: Pagination):
+        self._send = send
+        self.url = url
+        self.params = dict(params or {})
+        self.pagination = pagination
+
+    def __iter__(self) -> Iterator[Any]:
+        pagination = self.pagination
+        params = dict(self.params)
+        if pagination.style == "offset":
+            params.setdefault(pagination.limit_param, pagination.page_size)
+            params.setdefault(pagination.offset_param, 0)
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="api-prefetch")
+        pending = executor.submit(self._fetch, self.url, params)
+        try:
+            while pending is not None:
+                response = pending.result()
+                pending = None
+                try:
+                    response.raise_for_status()
+                    if pagination.style == "cursor":
+                        data = response.json()
+                        cursor = _get_path(data, pagination.next_cursor_path)
+                        if cursor:
+                            params = {**params, pagination.cursor_param: cursor}
+                            pending = executor.submit(self._fetch, self.url, params)
+                        items = _get_path(data, pagination.items_path) or []
+                        del data
+                        yield from items
+                    elif pagination.style == "link":
+                        next_url = response.links.get("next", {}).get("url")
+                        if next_url:
+                            pending = executor.submit(self._fetch, urljoin(response.url, next_url), None)
+                        yield from self._items(response)
+                    else:
+                        offset = int(params[pagination.offset_param]) + int(params[pagination.limit_param])
+                        params = {**params, pagination.offset_param: offset}
+                        pending = executor.submit(self._fetch, self.url, params)
+                        count = 0
+                        for item in self._items(response):
+                            count += 1
+                            yield item
+                        if count < int(params[pagination.limit_param]):
+                            # Short page: the collection is exhausted, drop the speculative prefetch.
+                            self._discard(pending)
+                            pending = None
+                finally:
+                    response.close()
+        finally:
+            if pending is not None:
+                self._discard(pending)
+            executor.shutdown(wait=False)
+
+    def _fetch(self, url: str, params: Optional[Mapping]):
+        response = self._send(url, params)
+        if not self.pagination.streams_body:
+            # Download the whole body on the prefetch thread so it is ready when consumed.
+            response.content
+        return response
+
+    def _items(self, response) -> Iterator[Any]:
+        if self.pagination.streams_body:
+            response.raw.decode_content = True
+            prefix = f"{self.pagination.items_path}.item" if self.pagination.items_path else "item"
+            yield from ijson.items(response.raw, prefix)
+        else:
+            yield from _get_path(response.json(), self.pagination.items_path) or []
+
+    @staticmethod
+    def _discard(future) -> None:
+        def close(done):
+            try:
+                done.result().close()
+            except Exception:
+                pass
+        future.add_done_callback(close)
@@ -0,0 +1,180 @@
+import base64
+import dbm.dumb
+import glob
+import hashlib
+import io
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Mapping, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+from urllib3 import HTTPResponse
+
+API_MODES = ("live", "record", "replay")
+
+
+class ReplayMissError(LookupError):
+    """Raised in replay mode when no recording matches a request"""
+
+
+# Headers that carry the caller's identity: responses to different identities must never share a key.
+_IDENTITY_HEADERS = ("authorization", "proxy-authorization", "cookie", "x-api-key")
+
+
+def request_key(method: str, url: str, params: Any = None, json_body: Any = None, data: Any = None,
+                headers: Optional[Mapping[str, str]] = None) -> str:
+    """Stable key for a request: method, URL, sorted query parameters, canonical body and identity headers"""
+    parts = urlsplit(url)
+    query = parse_qsl(parts.query, keep_blank_values=True)
+    if params:
+        items = params.items() if hasattr(params, "items") else params
+        for name, value in items:
+            values = value if isinstance(value, (list, tuple)) else [value]
+            query.extend((str(name), str(v)) for v in values if v is not None)
+    normalized_url = urlunsplit((parts.scheme, parts.netloc.lower(), parts.path, urlencode(sorted(query)), ""))
+    if json_body is not None:
+        body = json.dumps(json_body, sort_keys=True, separators=(",", ":"))
+    elif isinstance(data, bytes):
+        body = data.decode("utf-8", "replace")
+    elif isinstance(data, dict):
+        body = urlencode(sorted(data.items()))
+    else:
+        body = "" if data is None else str(data)
+    fields = [method.upper(), normalized_url, body]
+    identity = sorted((name.lower(), value) for name, value in (headers or {}).items()
+                      if name.lower() in _IDENTITY_HEADERS and value is not None)
+    if identity:
+        # Only a digest is kept in the key; requests without identity headers keep their previous keys.
+        fields.append(hashlib.sha256(json.dumps(identity).encode("utf-8")).hexdigest())
+    raw = "\n".join(fields)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _serialize(response: requests.Response) -> bytes:
+    return json.dumps({
+        "status": response.status_code,
+        "reason": response.reason,
+        "url": response.url,
+        "headers": dict(response.headers),
+        "body": base64.b64encode(response.content).decode("ascii"),
+        "recorded": time.time(),
+    }).encode("utf-8")
+
+
+def _recorded(value: bytes) -> float:
+    # Entries recorded before timestamps were stored count as the oldest.
+    return json.loads(value).get("recorded", 0.0)
+
+
+def _build_response(entry: Dict[str, Any]) -> requests.Response:
+    """Rebuild a requests.Response from a stored entry, readable both buffered and streamed"""
+    headers = {
+        name: value for name, value in entry["headers"].items()
+        # The stored body is already decoded and complete.
+        if name.lower() not in ("content-encoding", "content-length", "transfer-encoding")
+    }
+    response = requests.Response()
+    response.status_code = entry["status"]
+    response.reason = entry.get("reason")
+    response.url = entry["url"]
+    response.headers = CaseInsensitiveDict(headers)
+    response.encoding = get_encoding_from_headers(response.headers)
+    response.raw = HTTPResponse(
+        body=io.BytesIO(base64.b64decode(entry["body"])),
+        headers=headers,
+        status=entry["status"],
+        preload_content=False,
+    )
+    return response
+
+
+class ApiRecorder:
+    """Records API responses to, or replays them from, an on-disk hashed key/value store.
+
+    Stores use dbm.dumb (an in-memory hash index over a data file), so each lookup is O(1).
+    In record mode every process (xdist worker) writes its own store `<path>.<worker>`, starting it empty;
+    replay preloads every store under `<path>.*` into memory and never touches the network. Stores of
+    an older recording may still be around (e.g. from a run with more workers), so when several stores
+    hold the same request the most recently recorded response wins.
+    """
+
+    def __init__(self, path: str, mode: str = "live", worker_id: Optional[str] = None):
+        if mode not in API_MODES:
+            raise ValueError(f"Unsupported API mode: {mode}")
+        self.path = path
+        self.mode = mode
+        self._lock = threading.Lock()
+        self._db = None
+        self._entries: Dict[str, bytes] = {}
+        if mode == "record":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            self._db = dbm.dumb.open(f"{path}.{worker_id or 'main'}", "n")
+        elif mode == "replay":
+            self._preload()
+
+    def _preload(self) -> None:
+        for index_file in sorted(glob.glob(f"{glob.escape(self.path)}.*.dir")):
+            db = dbm.dumb.open(index_file[:-len(".dir")], "r")
+            try:
+                for key in db.keys():
+                    key, value = key.decode("ascii"), db[key]
+                    if key not in self._entries or _recorded(value) >= _recorded(self._entries[key]):
+                        self._entries[key] = value
+            finally:
+                db.close()
+
+    def record(self, key: str, response: requests.Response) -> requests.Response:
+        """Store the response and return an equivalent one (the original body has been consumed)"""
+        value = _serialize(response)
+        with self._lock:
+            self._db[key] = value
+        return _build_response(json.loads(value))
+
+    def replay(self, key: str, method: str, url: str) -> requests.Response:
+        entry = self._entries.get(key)
+        if entry is None:
+            raise ReplayMissError(f"No recorded response for {method.upper()} {url}")
+        return _build_response(json.loads(entry))
+
+    def __len__(self) -> int:
+        return len(self._entries) if self._db is None else len(self._db)
+
+    def close(self) -> None:
+        if self._db is not None:
+            with self._lock:
+                self._db.close()
+                self._db = None
+
+
+class LRUCache:
+    """Small thread-safe LRU cache of live GET responses"""
+
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = maxsize
+        self._items: "OrderedDict[str, requests.Response]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[requests.Response]:
+        with self._lock:
+            response = self._items.get(key)
+            if response is None:
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return response
+
+    def put(self, key: str, response: requests.Response) -> None:
+        with self._lock:
+            self._items[key] = response
+            self._items.move_to_end(key)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
@@ -0,0 +1,116 @@
+import gzip
+import hashlib
+import os
+import queue
+import threading
+from typing import Dict, List, Mapping, Optional, Tuple
+
+
+class ArtifactWriter:
+    """Writes failure artifacts from a bounded queue on a background thread.
+
+    Files are named after a hash of their content, so identical screenshots or error pages are stored
+    once. Text artifacts are gzip-compressed when `compress` is on (PNG data is already compressed).
+    When the queue is full, submit() drops the artifact instead of blocking the test run.
+    """
+
+    def __init__(self, directory: str, queue_size: int = 32, compress: bool = True):
+        self.directory = directory
+        self.compress = compress
+        self.counters = {"written": 0, "deduplicated": 0, "dropped": 0}
+        self._queue: "queue.Queue[Optional[Tuple[str, bytes]]]" = queue.Queue(maxsize=queue_size)
+        self._known = set()
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="artifact-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, data: bytes, extension: str) -> Optional[str]:
+        """Queue an artifact and return the path it will have, or None if it was dropped"""
+        compress = self.compress and extension != "png"
+        name = f"{hashlib.sha256(data).hexdigest()[:20]}.{extension}" + (".gz" if compress else "")
+        path = os.path.join(self.directory, name)
+        with self._lock:
+            if name in self._known:
+                self.counters["deduplicated"] += 1
+                return path
+        try:
+            self._queue.put_nowait((path, data))
+        except queue.Full:
+            with self._lock:
+                self.counters["dropped"] += 1
+            return None
+        with self._lock:
+            self._known.add(name)
+        return path
+
+    def close(self, timeout: float = 30) -> Dict[str, int]:
+        """Finish the queued writes and stop the thread"""
+        self._queue.put(None)
+        self._thread.join(timeout)
+        return dict(self.counters)
+
+    def _run(self) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            path, data = item
+            try:
+                self._write(path, data)
+            except OSError as e:
+                print(f"Warning: could not write artifact {path}: {e}")
+
+    def _write(self, path: str, data: bytes) -> None:
+        # Another worker (or an earlier run) may already have stored the same content.
+        if os.path.exists(path):
+            with self._lock:
+                self.counters["deduplicated"] += 1
+            return
+        if path.endswith(".gz"):
+            data = gzip.compress(data, compresslevel=6)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        with self._lock:
+            self.counters["written"] += 1
+
+
+def capture_failure(driver, writer: ArtifactWriter, limits: Mapping) -> List[Tuple[str, Optional[str]]]:
+    """Grab screenshot, page source and browser logs in memory and queue them for writing.
+
+    Returns (label, path) pairs; path is None when an artifact could not be captured or was dropped.
+    """
+    captured = []
+    if limits.get("screenshot", True):
+        try:
+            captured.append(("Screenshot", writer.submit(driver.get_screenshot_as_png(), "png")))
+        except Exception:
+            captured.append(("Screenshot", None))
+    if limits.get("page_source", True):
+        try:
+            source = driver.page_source.encode("utf-8")
+            max_bytes = limits.get("max_page_source_kb", 2048) * 1024
+            captured.append(("Page source", writer.submit(source[:max_bytes], "html")))
+        except Exception:
+            captured.append(("Page source", None))
+    if limits.get("browser_logs", True):
+        try:
+            entries = _browser_log(driver)
+        except Exception:
+            entries = None
+        if entries:
+            entries = entries[-limits.get("max_log_entries", 500):]
+            lines = [f"{entry.get('level')} {entry.get('message')}" for entry in entries]
+            captured.append(("Browser log", writer.submit("\n".join(lines).encode("utf-8"), "log")))
+    return captured
+
+
+def _browser_log(driver) -> Optional[List[dict]]:
+    # Sent as a raw command: sessions on a shared driver service or a hub are plain Remote drivers, which
+    # have no get_log(). Only Chromium browsers serve the log (see goog:loggingPrefs in browser_setup).
+    if driver.caps.get("browserName") not in ("chrome", "MicrosoftEdge", "msedge"):
+        return None
+    from selenium.webdriver.remote.command import Command
+    return driver.execute(Command.GET_LOG, {"type": "browser"})["value"]
@@ -0,0 +1,200 @@
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, List, Mapping, Optional
+from urllib.parse import urljoin, urlsplit
+
+from selenium.common.exceptions import TimeoutException
+from utils.waits import VISIBLE
+
+# Reads both web storages of the current origin in one call.
+CAPTURE_STORAGE_SCRIPT = """
+function dump(storage) {
+    var out = {};
+    for (var i = 0; i < storage.length; i++) { var key = storage.key(i); out[key] = storage.getItem(key); }
+    return out;
+}
+return {local: dump(window.localStorage), session: dump(window.sessionStorage)};
+"""
+
+INJECT_STORAGE_SCRIPT = """
+var local = arguments[0], session = arguments[1];
+for (var key in local) { window.localStorage.setItem(key, local[key]); }
+for (var key in session) { window.sessionStorage.setItem(key, session[key]); }
+"""
+
+CLEAR_STORAGE_SCRIPT = "window.localStorage.clear(); window.sessionStorage.clear();"
+
+
+class AuthState:
+    """Cookies and local/session storage of a logged-in role, with an expiry time"""
+
+    def __init__(self, role: str, origin: str, cookies: List[dict], local_storage: Dict[str, str],
+                 session_storage: Dict[str, str], created_at: float, expires_at: float):
+        self.role = role
+        self.origin = origin
+        self.cookies = cookies
+        self.local_storage = local_storage
+        self.session_storage = session_storage
+        self.created_at = created_at
+        self.expires_at = expires_at
+
+    def expired(self, now: Optional[float] = None) -> bool:
+        return (now or time.time()) >= self.expires_at
+
+    def to_dict(self) -> Dict[str, Any]:
+        return dict(vars(self))
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "AuthState":
+        return cls(**data)
+
+
+class AuthStateCache:
+    """Logs in once per role and replays the captured session into later tests instead of the login UI.
+
+    States live in memory for the worker and in `<state_path>/<role>.json` on disk, so other workers and
+    later runs reuse them until they expire. When `verify` is configured, every injection is checked by
+    loading the verify page; a rejected state is dropped and the role logs in again through the UI.
+    """
+
+    def __init__(self, base_url: str, auth_config: Mapping[str, Any], root: str = "."):
+        self.base_url = base_url
+        self.roles = auth_config.get("roles", {})
+        self.login_config = auth_config.get("login", {})
+        self.verify_config = auth_config.get("verify") or {}
+        self.ttl = auth_config.get("ttl", 1800)
+        self.inject_path = auth_config.get("inject_path", "/")
+        self.path = os.path.join(root, auth_config.get("state_path", ".auth_state"))
+        self._states: Dict[str, AuthState] = {}
+        self._lock = threading.Lock()
+
+    # Public API
+    def apply(self, ui_actions, role: str) -> str:
+        """Put the browser in the logged-in state of `role`, logging in through the UI only when needed.
+
+        Returns "injected" (cached state accepted), "login" (no usable state) or "relogin" (state rejected).
+        """
+        if role not in self.roles:
+            raise ValueError(f"Unknown auth role: {role}")
+        outcome = "login"
+        state = self.get(role)
+        if state is not None:
+            self._inject(ui_actions, state)
+            if self._verified(ui_actions):
+                return "injected"
+            # The server no longer accepts the stored session.
+            outcome = "relogin"
+            self.invalidate(role)
+            self._clear(ui_actions)
+        self._save(self.login(ui_actions, role))
+        return outcome
+
+    def get(self, role: str) -> Optional[AuthState]:
+        """The unexpired cached state of a role, from memory or disk"""
+        with self._lock:
+            state = self._states.get(role)
+            if state is None:
+                state = self._load(role)
+            if state is None or state.expired():
+                self._states.pop(role, None)
+                return None
+            self._states[role] = state
+            return state
+
+    def invalidate(self, role: str) -> None:
+        """Forget a role's state in memory and on disk"""
+        with self._lock:
+            self._states.pop(role, None)
+            try:
+                os.remove(self._file(role))
+            except FileNotFoundError:
+                pass
+
+    def login(self, ui_actions, role: str) -> AuthState:
+        """Log in through the UI with the role's credentials and capture the resulting state"""
+        credentials = self.roles[role]
+        login = self.login_config
+        ui_actions.open_url(self._url(login.get("url", "/")))
+        ui_actions.type_text(tuple(login["username"]), credentials["username"])
+        ui_actions.type_text(tuple(login["password"]), credentials["password"])
+        ui_actions.click(tuple(login["submit"]))
+        if login.get("success"):
+            ui_actions.waits.until(tuple(login["success"]), VISIBLE, ui_actions.default_timeout)
+        return self.capture(ui_actions.driver, role)
+
+    def capture(self, driver, role: str) -> AuthState:
+        """Read cookies and both storages of the current page into an AuthState"""
+        now = time.time()
+        cookies = driver.get_cookies()
+        storage = driver.execute_script(CAPTURE_STORAGE_SCRIPT) or {}
+        expires_at = now + self.ttl
+        # A session cookie that expires before the TTL ends the cached state with it.
+        cookie_expiries = [cookie["expiry"] for cookie in cookies if cookie.get("expiry")]
+        if cookie_expiries:
+            expires_at = min(expires_at, min(cookie_expiries))
+        parts = urlsplit(driver.current_url)
+        return AuthState(
+            role=role,
+            origin=f"{parts.scheme}://{parts.netloc}",
+            cookies=cookies,
+            local_storage=storage.get("local", {}),
+            session_storage=storage.get("session", {}),
+            created_at=now,
+            expires_at=expires_at,
+        )
+
+    # Internals
+    def _url(self, path: str) -> str:
+        return urljoin(self.base_url, path)
+
+    def _file(self, role: str) -> str:
+        return os.path.join(self.path, f"{role}.json")
+
+    def _load(self, role: str) -> Optional[AuthState]:
+        try:
+            with open(self._file(role), encoding="utf-8") as f:
+                return AuthState.from_dict(json.load(f))
+        except (OSError, ValueError, TypeError):
+            return None
+
+    def _save(self, state: AuthState) -> None:
+        with self._lock:
+            self._states[state.role] = state
+            os.makedirs(self.path, exist_ok=True)
+            # Write-then-rename so a worker never reads a half-written file from another worker.
+            tmp_path = f"{self._file(state.role)}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(state.to_dict(), f)
+            os.replace(tmp_path, self._file(state.role))
+
+    def _inject(self, ui_actions, state: AuthState) -> None:
+        # Cookies and storage can only be set on a page of their origin; load a cheap one first.
+        ui_actions.open_url(urljoin(state.origin, self.inject_path))
+        now = time.time()
+        for cookie in state.cookies:
+            if cookie.get("expiry") and cookie["expiry"] <= now:
+                continue
+            ui_actions.add_cookie(cookie)
+        if state.local_storage or state.session_storage:
+            ui_actions.execute_script(INJECT_STORAGE_SCRIPT, state.local_storage, state.session_storage)
+
+    def _verified(self, ui_actions) -> bool:
+        if not self.verify_config:
+            return True
+        ui_actions.open_url(self._url(self.verify_config["url"]))
+        try:
+            ui_actions.waits.until(tuple(self.verify_config["locator"]), VISIBLE,
+                                   self.verify_config.get("timeout", 5))
+            return True
+        except TimeoutException:
+            return False
+
+    @staticmethod
+    def _clear(ui_actions) -> None:
+        ui_actions.delete_all_cookies()
+        try:
+            ui_actions.execute_script(CLEAR_STORAGE_SCRIPT)
+        except Exception:
+            pass
@@ -0,0 +1,78 @@
+from typing import Any, Dict, Mapping, Sequence, Union
+from utils.locators import JS_HELPERS, to_query
+
+# Properties that can be read in a batch. "attribute:<name>" reads any attribute/property.
+PROPERTIES = ("present", "text", "visible", "enabled", "selected", "tag")
+
+BATCH_READ_SCRIPT = JS_HELPERS + """
+function readAttribute(el, name) {
+    var prop = el[name];
+    if (prop !== undefined && prop !== null && typeof prop !== 'object' && typeof prop !== 'function') {
+        if (typeof prop === 'boolean') { return prop ? 'true' : null; }
+        return String(prop);
+    }
+    return el.getAttribute(name);
+}
+var fields = arguments[0], result = {};
+for (var i = 0; i < fields.length; i++) {
+    var field = fields[i], el = findAll(field.kind, field.query)[0], values = {};
+    for (var j = 0; j < field.props.length; j++) {
+        var prop = field.props[j];
+        if (prop === 'present') { values[prop] = !!el; continue; }
+        if (!el) { values[prop] = null; continue; }
+        if (prop === 'text') { values[prop] = isVisible(el) ? el.innerText.trim() : ''; }
+        else if (prop === 'visible') { values[prop] = isVisible(el); }
+        else if (prop === 'enabled') { values[prop] = !el.disabled; }
+        else if (prop === 'selected') { values[prop] = !!(el.checked || el.selected); }
+        else if (prop === 'tag') { values[prop] = el.tagName.toLowerCase(); }
+        else if (prop.indexOf('attribute:') === 0) { values[prop] = readAttribute(el, prop.slice(10)); }
+    }
+    values.__present = !!el;
+    result[field.name] = values;
+}
+return result;
+"""
+
+
+def _validate(properties: Sequence[str]) -> None:
+    for prop in properties:
+        if prop not in PROPERTIES and not prop.startswith("attribute:"):
+            raise ValueError(f"Unsupported batch read property: {prop}")
+
+
+def read_fields(driver, fields: Mapping[str, tuple], properties: Union[str, Sequence[str]] = ("text",),
+                waits=None, timeout: float = 0) -> Dict[str, Any]:
+    """Read properties of many locators with a single execute_script call.
+
+    Returns {name: {property: value}}, or {name: value} when `properties` is a single string.
+    Missing elements read as None (and False for "present"). With a wait engine and a timeout,
+    the read is retried until every field is present.
+    """
+    single = isinstance(properties, str)
+    props = [properties] if single else list(properties)
+    _validate(props)
+    payload = []
+    for name, locator in fields.items():
+        kind, query = to_query(locator)
+        payload.append({"name": name, "kind": kind, "query": query, "props": props})
+
+    def read():
+        return driver.execute_script(BATCH_READ_SCRIPT, payload)
+
+    def read_when_all_present():
+        values = read()
+        return values if all(value["__present"] for value in values.values()) else None
+
+    if waits is not None and timeout:
+        result = waits.until_true(
+            read_when_all_present,
+            timeout,
+            f"Timed out after {timeout}s waiting for fields: {', '.join(fields)}",
+        )
+    else:
+        result = read()
+    for values in result.values():
+        values.pop("__present", None)
+    if single:
+        return {name: values[properties] for name, values in result.items()}
+    return result
@@ -0,0 +1,123 @@
+import queue
+import threading
+import time
+from typing import Callable, Dict, List
+
+
+class BrowserLauncher:
+    """Launches browsers on a background thread so they are ready before tests ask for them.
+
+    Launches up to `warm_sessions[browser_name]` sessions per browser at start. `acquire` hands out a
+    warmed session instantly when one is ready (a hit) and otherwise launches one synchronously (a miss).
+    Handed-out sessions are not replaced automatically, since the DriverPool keeps reusing them;
+    `refill` queues a replacement when the pool has dropped a driver and will need a new one.
+    """
+
+    def __init__(self, factory: Callable[[str], object], warm_sessions: Dict[str, int]):
+        self._factory = factory
+        self.warm_sessions = {name: count for name, count in warm_sessions.items() if count > 0}
+        self._ready: Dict[str, queue.Queue] = {name: queue.Queue() for name in self.warm_sessions}
+        self._requests: queue.Queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stopped = threading.Event()
+        self.hits = 0
+        self.misses = 0
+        self.startup_times: List[float] = []
+
+    def start(self) -> None:
+        """Start the background thread and queue the initial warm-up launches"""
+        if self._thread is not None or not self.warm_sessions:
+            return
+        self._thread = threading.Thread(target=self._run, name="browser-launcher", daemon=True)
+        self._thread.start()
+        for browser_name, count in self.warm_sessions.items():
+            for _ in range(count):
+                self._requests.put(browser_name)
+
+    def acquire(self, browser_name: str):
+        """Return a ready driver for the browser, launching one if none is warm"""
+        ready = self._ready.get(browser_name)
+        if ready is not None:
+            try:
+                driver = ready.get_nowait()
+            except queue.Empty:
+                driver = None
+            if driver is not None:
+                with self._lock:
+                    self.hits += 1
+                return driver
+        with self._lock:
+            self.misses += 1
+        return self._launch(browser_name)
+
+    def refill(self, browser_name: str) -> None:
+        """Launch a session for the browser in the background, up to its warm_sessions count"""
+        if browser_name in self._ready and not self._stopped.is_set():
+            self._requests.put(browser_name)
+
+    def stop(self) -> None:
+        """Stop the background thread and quit every session that was never handed out"""
+        self._stopped.set()
+        self._requests.put(None)
+        if self._thread is not None:
+            self._thread.join(timeout=60)
+            self._thread = None
+        for ready in self._ready.values():
+            while not ready.empty():
+                try:
+                    ready.get_nowait().quit()
+                except Exception:
+                    pass
+
+    def stats(self) -> dict:
+        """Hit/miss counts and per-launch startup times in seconds"""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "startup_times": list(self.startup_times)}
+
+    def _launch(self, browser_name: str):
+        started = time.perf_counter()
+        driver = self._factory(browser_name)
+        with self._lock:
+            self.startup_times.append(time.perf_counter() - started)
+        return driver
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            browser_name = self._requests.get()
+            if browser_name is None or self._stopped.is_set():
+                break
+            ready = self._ready[browser_name]
+            # Skip refill requests once the browser already has enough warm sessions
+            if ready.qsize() >= self.warm_sessions[browser_name]:
+                continue
+            try:
+                driver = self._launch(browser_name)
+            except Exception as e:
+                print(f"Warning: Background launch of {browser_name} failed: {e}")
+                continue
+            if self._stopped.is_set():
+                driver.quit()
+                break
+            ready.put(driver)
+
+
+def merge_launcher_stats(all_stats: List[dict]) -> dict:
+    """Combine the stats reported by several launchers (one per xdist worker)"""
+    merged = {"hits": 0, "misses": 0, "startup_times": []}
+    for stats in all_stats:
+        merged["hits"] += stats.get("hits", 0)
+        merged["misses"] += stats.get("misses", 0)
+        merged["startup_times"].extend(stats.get("startup_times", []))
+    return merged
+
+
+def format_launcher_stats(stats: dict) -> List[str]:
+    """Human readable summary lines for the terminal report"""
+    times = sorted(stats["startup_times"])
+    lines = [f"warm hits: {stats['hits']}, misses: {stats['misses']}, launches: {len(times)}"]
+    if times:
+        mean = sum(times) / len(times)
+        p95 = times[min(len(times) - 1, int(len(times) * 0.95))]
+        lines.append(f"startup latency mean: {mean:.2f}s, p95: {p95:.2f}s, max: {times[-1]:.2f}s")
+    return lines
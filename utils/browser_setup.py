@@ -1,63 +1,204 @@
 from selenium import webdriver
-import yaml
+import os
+import threading
 from selenium.webdriver.firefox.options import Options as FirefoxOptions
+from selenium.webdriver.common.driver_finder import DriverFinder
+from utils.config import get_config
+from utils.launch_profiles import LaunchProfile, launch_profile_from_config
+from utils.session_broker import RemoteSessionBroker, SessionSlots
 
+# Driver services (chromedriver/msedgedriver) shared by every session in this process, one per xdist worker.
+_shared_services = {}
+_shared_services_lock = threading.Lock()
 
-def get_driver(browser_override=None, config_dict=None):
-    # Use the provided config dictionary if available; otherwise load from file.
-    if config_dict is None:
-        with open('config/config.yaml', 'r') as file:
-            config = yaml.safe_load(file)
+
+def get_shared_service(browser, options):
+    """Start the driver service for the browser once and return (service, browser_path)"""
+    with _shared_services_lock:
+        if browser not in _shared_services:
+            if browser == 'chrome':
+                from selenium.webdriver.chrome.service import Service as ChromeService
+                service = ChromeService()
+            elif browser == 'edge':
+                from selenium.webdriver.edge.service import Service as EdgeService
+                service = EdgeService()
+            else:
+                raise ValueError(f"Shared driver service is not supported for: {browser}")
+            finder = DriverFinder(service, options)
+            service.path = service.env_path() or finder.get_driver_path()
+            service.start()
+            _shared_services[browser] = (service, finder.get_browser_path())
+        return _shared_services[browser]
+
+
+def stop_shared_services():
+    """Stop every shared driver service and remote session broker started by this process"""
+    with _shared_services_lock:
+        for service, _ in _shared_services.values():
+            try:
+                service.stop()
+            except Exception:
+                pass
+        _shared_services.clear()
+        for broker in _session_brokers.values():
+            broker.close()
+        _session_brokers.clear()
+
+
+# Remote session brokers of this process, one per hub URL.
+_session_brokers = {}
+_HUB_URLS = {
+    "browserstack": "https://hub-cloud.browserstack.com/wd/hub",
+    "saucelabs": "https://ondemand.saucelabs.com/wd/hub",
+}
+
+
+def get_session_broker(cloud, hub_url):
+    """Create the broker for the hub once per process, with the session cap shared by every worker"""
+    with _shared_services_lock:
+        if hub_url not in _session_brokers:
+            max_sessions = cloud.get("max_sessions", 0)
+            slots = None
+            if max_sessions:
+                root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+                slots = SessionSlots(os.path.join(root, cloud.get("slot_directory", ".session_slots")), max_sessions)
+            _session_brokers[hub_url] = RemoteSessionBroker(
+                hub_url, slots, slot_timeout=cloud.get("slot_timeout", 600), timeout=cloud.get("command_timeout", 120)
+            )
+        return _session_brokers[hub_url]
+
+
+def session_broker_stats():
+    """Stats of every remote session broker of this process"""
+    with _shared_services_lock:
+        return [broker.stats() for broker in _session_brokers.values()]
+
+
+def _remote_options(browser, capabilities, enable_bidi=True):
+    # W3C browser options carrying the capabilities; browser-specific entries go through the options API
+    # because the options object rebuilds them when the session is created.
+    if browser == "firefox":
+        options = FirefoxOptions()
+    elif browser == "edge":
+        from selenium.webdriver.edge.options import Options as EdgeOptions
+        options = EdgeOptions()
+    elif browser == "chrome":
+        from selenium.webdriver.chrome.options import Options as ChromeOptions
+        options = ChromeOptions()
     else:
-        config = config_dict
+        raise ValueError(f"Unsupported browser: {browser}")
+    # Asks the hub for a BiDi WebSocket (network profiles); hubs without BiDi just leave it out.
+    options.enable_bidi = enable_bidi
+    for key, value in capabilities.items():
+        if key in ("goog:chromeOptions", "ms:edgeOptions", "moz:firefoxOptions"):
+            for argument in value.get("args", []):
+                options.add_argument(argument)
+            prefs = value.get("prefs")
+            if prefs and browser == "firefox":
+                for name, pref in prefs.items():
+                    options.set_preference(name, pref)
+            elif prefs:
+                options.add_experimental_option("prefs", prefs)
+        elif key == "pageLoadStrategy":
+            options.page_load_strategy = value
+        else:
+            options.set_capability(key, value)
+    return options
+
+
+def get_remote_driver(browser, cloud, launch_profile=None, evict_idle=None, browser_logs=True):
+    """Open a session on the cloud provider's hub, or on cloud.hub_url (Selenium Grid, stub server).
+
+    `evict_idle` quits this process's idle sessions when the session cap is reached (see SessionSlots.acquire).
+    """
+    provider = cloud.get("name", "").lower()
+    hub_url = cloud.get("hub_url")
+    if not hub_url:
+        if provider not in _HUB_URLS:
+            raise ValueError(f"Unsupported cloud provider: {provider}")
+        if not (cloud.get("username") and cloud.get("access_key")):
+            raise ValueError("Cloud execution requires valid cloud_provider credentials.")
+        hub_url = _HUB_URLS[provider]
+    capabilities = launch_profile.cloud_capabilities(browser, provider) if launch_profile else {}
+    # Provider credentials and settings travel in the provider's W3C extension capability.
+    if provider == "browserstack":
+        capabilities["bstack:options"] = {
+            "userName": cloud.get("username"), "accessKey": cloud.get("access_key"), "sessionName": "Selenium Test",
+            **capabilities.get("bstack:options", {}),
+        }
+    elif provider == "saucelabs":
+        capabilities["sauce:options"] = {
+            "username": cloud.get("username"), "accessKey": cloud.get("access_key"), "name": "Selenium Test",
+            **capabilities.get("sauce:options", {}),
+        }
+    options = _remote_options(browser, capabilities, cloud.get("bidi", True))
+    if browser_logs:
+        _enable_browser_log(options, browser)
+    return get_session_broker(cloud, hub_url).open(options, evict_idle)
+
+
+def _enable_browser_log(options, browser):
+    # Chromium keeps console messages for failure artifacts (artifacts.browser_logs) only when asked to.
+    if browser in ("chrome", "edge"):
+        options.set_capability("goog:loggingPrefs" if browser == "chrome" else "ms:loggingPrefs", {"browser": "ALL"})
+
+
+def _driver_on_shared_service(browser, options):
+    # Open a new session against the already running driver service instead of spawning another one.
+    service, browser_path = get_shared_service(browser, options)
+    if browser_path:
+        options.binary_location = browser_path
+    return webdriver.Remote(command_executor=service.service_url, options=options)
+
+
+def get_driver(browser_override=None, config_dict=None, launch_profile=None, evict_idle=None):
+    # Use the provided config dictionary if available; otherwise use the run configuration.
+    config = config_dict if config_dict is not None else get_config()
     
     # Use override if provided, else get from config (defaulting to chrome).
     browser = browser_override if browser_override else config.get('browser', 'chrome')
 
+    # Launch profile: a LaunchProfile, a profile name, or None for launch_profiles.default.
+    if not isinstance(launch_profile, LaunchProfile):
+        launch_profile = launch_profile_from_config(config, launch_profile)
+
     # Check the execution mode from config ("local" or "cloud")
     execution = config.get("execution", "local")
+    shared_service = config.get("launcher", {}).get("shared_service", False)
+    browser_logs = config.get("artifacts", {}).get("browser_logs", True)
     if execution == "cloud":
-        # In cloud mode, use cloud_provider credentials.
-        cloud = config.get('cloud_provider', {})
-        if cloud.get("username") and cloud.get("access_key"):
-            provider = cloud.get("name", "").lower()
-            if provider == "browserstack":
-                desired_cap = {
-                    "browserName": browser,
-                    "browserstack.user": cloud.get("username"),
-                    "browserstack.key": cloud.get("access_key"),
-                    "name": "Selenium Test"
-                }
-                remote_url = "https://hub-cloud.browserstack.com/wd/hub"
-                return webdriver.Remote(command_executor=remote_url, desired_capabilities=desired_cap)
-            elif provider == "saucelabs":
-                desired_cap = {
-                    "browserName": browser,
-                    "username": cloud.get("username"),
-                    "accessKey": cloud.get("access_key"),
-                    "name": "Selenium Test"
-                }
-                remote_url = "https://ondemand.saucelabs.com/wd/hub"
-                return webdriver.Remote(command_executor=remote_url, desired_capabilities=desired_cap)
-            else:
-                raise ValueError(f"Unsupported cloud provider: {provider}")
-        else:
-            raise ValueError("Cloud execution requires valid cloud_provider credentials.")
+        # In cloud mode, sessions are opened through the remote session broker (session cap, keep-alive).
+        return get_remote_driver(browser, config.get('cloud_provider', {}), launch_profile, evict_idle, browser_logs)
     else:
         # Local execution ignores cloud_provider settings.
         if browser == 'chrome':
             from selenium.webdriver.chrome.options import Options as ChromeOptions
             options = ChromeOptions()
             options.enable_bidi = True
+            if browser_logs:
+                _enable_browser_log(options, browser)
+            if launch_profile:
+                launch_profile.apply(options, browser)
+            if shared_service:
+                return _driver_on_shared_service(browser, options)
             return webdriver.Chrome(options=options)
         elif browser == 'edge':
             from selenium.webdriver.edge.options import Options as EdgeOptions
             options = EdgeOptions()
             options.enable_bidi = True
+            if browser_logs:
+                _enable_browser_log(options, browser)
+            if launch_profile:
+                launch_profile.apply(options, browser)
+            if shared_service:
+                return _driver_on_shared_service(browser, options)
             return webdriver.Edge(options=options)
         elif browser == 'firefox':
+            # geckodriver serves a single session per process, so Firefox always gets its own service.
             options = FirefoxOptions()
             options.enable_bidi = True
+            if launch_profile:
+                launch_profile.apply(options, browser)
             return webdriver.Firefox(options=options)
         else:
             raise ValueError(f"Unsupported browser: {browser}") 
\ No newline at end of file
@@ -0,0 +1,164 @@
+import json
+import os
+import re
+from collections.abc import Mapping
+from types import MappingProxyType
+from typing import Optional, Tuple
+
+CONFIG_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "config", "config.yaml")
+
+# Environment variables starting with this prefix override config values.
+# Nested keys are separated by a double underscore, e.g. FRAMEWORK_SELENIUM__TIMEOUT=20.
+ENV_PREFIX = "FRAMEWORK_"
+
+
+def _freeze(value):
+    if isinstance(value, Mapping):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def _thaw(value):
+    if isinstance(value, Mapping):
+        return {key: _thaw(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [_thaw(item) for item in value]
+    return value
+
+
+class FrameworkConfig(Mapping):
+    """Immutable view of config.yaml with environment and command-line overrides applied.
+
+    Behaves like a read-only dict (nested sections are read-only too, lists become tuples)
+    and exposes typed accessors for the most used settings.
+    """
+
+    def __init__(self, data: Mapping):
+        self._data = _freeze(data)
+
+    def __getitem__(self, key):
+        return self._data[key]
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __repr__(self) -> str:
+        return f"FrameworkConfig({self.to_dict()!r})"
+
+    @property
+    def execution(self) -> str:
+        return self.get("execution", "local")
+
+    @property
+    def browsers(self) -> Tuple[str, ...]:
+        return tuple(self.get("browsers", ("chrome",)))
+
+    @property
+    def base_url(self) -> Optional[str]:
+        return self.get("base_url")
+
+    @property
+    def api_base_url(self) -> Optional[str]:
+        return self.get("api_base_url")
+
+    @property
+    def timeout(self) -> int:
+        return self.get("selenium", {}).get("timeout", 10)
+
+    def to_dict(self) -> dict:
+        """Plain, mutable copy of the configuration (JSON serializable)"""
+        return _thaw(self._data)
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict())
+
+    @classmethod
+    def from_json(cls, text: str) -> "FrameworkConfig":
+        return cls(json.loads(text))
+
+
+def _apply_override(config: dict, path: list, value) -> None:
+    section = config
+    for key in path[:-1]:
+        if not isinstance(section.get(key), dict):
+            section[key] = {}
+        section = section[key]
+    current = section.get(path[-1])
+    # Comma-separated strings override lists, e.g. FRAMEWORK_BROWSERS=chrome,firefox
+    if isinstance(current, list) and isinstance(value, str):
+        value = [item.strip() for item in value.split(",") if item.strip()]
+    section[path[-1]] = value
+
+
+def _env_overrides(environ: Mapping) -> dict:
+    return {
+        name[len(ENV_PREFIX):].lower(): raw
+        for name, raw in environ.items()
+        if name.startswith(ENV_PREFIX) and len(name) > len(ENV_PREFIX)
+    }
+
+
+# Plain decimal numbers only: "0123" or "1e3" stay strings, since they are as likely to be a secret or an ID.
+_NUMBER = re.compile(r"-?(0|[1-9][0-9]*)(\.[0-9]+)?")
+
+
+def _env_value(config: dict, path: list, raw: str):
+    """Type an environment value after the config value it replaces.
+
+    Strings (passwords, URLs, paths) are kept verbatim. Values replacing a number or boolean are parsed
+    as YAML; for keys without a typed value, only true/false and plain decimal numbers are converted.
+    """
+    import yaml
+
+    current = config
+    for key in path:
+        current = current.get(key) if isinstance(current, dict) else None
+    if not raw or isinstance(current, (str, list)):
+        return raw
+    if isinstance(current, (bool, int, float)):
+        return yaml.safe_load(raw)
+    if raw.lower() in ("true", "false"):
+        return raw.lower() == "true"
+    if _NUMBER.fullmatch(raw):
+        return float(raw) if "." in raw else int(raw)
+    return raw
+
+
+def load_config(cli_overrides: Optional[Mapping] = None, path: str = CONFIG_PATH,
+                environ: Optional[Mapping] = None) -> FrameworkConfig:
+    """Parse config.yaml and layer environment then command-line overrides on top.
+
+    Override keys use double underscores for nested sections (e.g. "selenium__timeout").
+    None values in cli_overrides are ignored.
+    """
+    import yaml
+
+    with open(path, "r") as file:
+        config = yaml.safe_load(file) or {}
+    for key, raw in _env_overrides(os.environ if environ is None else environ).items():
+        _apply_override(config, key.split("__"), _env_value(config, key.split("__"), raw))
+    for key, value in (cli_overrides or {}).items():
+        if value is not None:
+            _apply_override(config, key.split("__"), value)
+    return FrameworkConfig(config)
+
+
+_active_config: Optional[FrameworkConfig] = None
+
+
+def set_config(config: FrameworkConfig) -> None:
+    """Install the configuration used by get_config() in this process"""
+    global _active_config
+    _active_config = config
+
+
+def get_config() -> FrameworkConfig:
+    """Return the configuration for this process, loading it from disk on first use only"""
+    if _active_config is None:
+        set_config(load_config())
+    return _active_config
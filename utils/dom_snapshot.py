@@ -0,0 +1,238 @@
+import re
+from lxml import etree
+from cssselect import HTMLTranslator, SelectorError
+from selenium.common.exceptions import NoSuchElementException
+from selenium.webdriver.common.by import By
+from typing import Dict, List, Optional
+from utils.locators import JS_HELPERS, to_query
+
+# Serializes the current document (and every open shadow root) in one call. Each element becomes
+# {t: tag, a: attributes, v: visible, p: live form state, c: children, s: shadow children};
+# text nodes become plain strings. Children of a hidden element are hidden without asking the browser.
+SNAPSHOT_SCRIPT = JS_HELPERS + """
+function serialize(el, parentVisible) {
+    var node = {t: el.localName, a: {}, v: parentVisible && isVisible(el), c: []};
+    for (var i = 0; i < el.attributes.length; i++) {
+        node.a[el.attributes[i].name] = el.attributes[i].value;
+    }
+    if ('value' in el || 'checked' in el || 'selected' in el || 'disabled' in el) {
+        node.p = {value: el.value === undefined ? null : String(el.value), checked: !!el.checked,
+                  selected: !!el.selected, disabled: !!el.disabled};
+    }
+    appendChildren(el, node.c, node.v);
+    if (el.shadowRoot) {
+        node.s = [];
+        appendChildren(el.shadowRoot, node.s, node.v);
+    }
+    return node;
+}
+function appendChildren(parent, out, visible) {
+    for (var child = parent.firstChild; child; child = child.nextSibling) {
+        if (child.nodeType === 1) { out.push(serialize(child, visible)); }
+        else if (child.nodeType === 3 && child.data) { out.push(child.data); }
+    }
+}
+return serialize(document.documentElement, true);
+"""
+
+# Elements whose rendered text starts on a new line, used to approximate WebElement.text.
+_BLOCK_TAGS = frozenset((
+    "address article aside blockquote br dd div dl dt fieldset figcaption figure footer form h1 h2 h3 "
+    "h4 h5 h6 header hr li main nav ol option p pre section table tbody td tfoot th thead tr ul"
+).split())
+_XML_NAME = re.compile(r"^[A-Za-z_][\w.-]*$")
+_XML_INVALID_CHARS = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f\ud800-\udfff\ufffe\uffff]")
+
+
+def _xml_safe(text: str) -> str:
+    return _XML_INVALID_CHARS.sub("", text)
+
+
+class StaleSnapshotError(Exception):
+    """Raised when a snapshot is queried after the page may have changed"""
+
+
+class SnapshotElement:
+    """Read-only element of a DomSnapshot, mirroring the WebElement read API"""
+
+    def __init__(self, snapshot: "DomSnapshot", node):
+        self._snapshot = snapshot
+        self._node = node
+
+    @property
+    def tag_name(self) -> str:
+        return self._node.tag
+
+    @property
+    def text(self) -> str:
+        self._snapshot._check()
+        return self._snapshot._text(self._node)
+
+    def get_attribute(self, name: str) -> Optional[str]:
+        self._snapshot._check()
+        state = self._snapshot._state(self._node)
+        if state and name in ("value", "checked", "selected", "disabled"):
+            value = state[name]
+            if isinstance(value, bool):
+                return "true" if value else None
+            return value
+        return self._node.get(name)
+
+    def is_displayed(self) -> bool:
+        self._snapshot._check()
+        return self._snapshot._visible(self._node)
+
+    def is_enabled(self) -> bool:
+        self._snapshot._check()
+        state = self._snapshot._state(self._node)
+        return not state["disabled"] if state else True
+
+    def is_selected(self) -> bool:
+        self._snapshot._check()
+        state = self._snapshot._state(self._node)
+        return bool(state and (state["checked"] or state["selected"]))
+
+    def find_element(self, locator: tuple) -> "SnapshotElement":
+        return self._snapshot._first(self._snapshot._query(locator, self._node), locator)
+
+    def find_elements(self, locator: tuple) -> List["SnapshotElement"]:
+        return self._snapshot._query(locator, self._node)
+
+    def __repr__(self) -> str:
+        return f"SnapshotElement(<{self._node.tag}>)"
+
+
+class DomSnapshot:
+    """The whole DOM captured in one driver call and queried locally with (By, value) locators"""
+
+    def __init__(self, serialized: dict):
+        self._meta: Dict[etree._Element, tuple] = {}
+        self._shadow_roots: Dict[etree._Element, etree._Element] = {}
+        self._css_cache: Dict[tuple, etree.XPath] = {}
+        self.stale = False
+        self.root = self._build(serialized)
+
+    @classmethod
+    def capture(cls, driver) -> "DomSnapshot":
+        """Serialize the current page (in the current frame) with a single execute_script call"""
+        return cls(driver.execute_script(SNAPSHOT_SCRIPT))
+
+    def invalidate(self) -> None:
+        """Mark the snapshot as outdated; further queries raise StaleSnapshotError"""
+        self.stale = True
+
+    # Queries
+    def find_element(self, locator: tuple) -> SnapshotElement:
+        return self._first(self._query(locator, self.root), locator)
+
+    def find_elements(self, locator: tuple) -> List[SnapshotElement]:
+        return self._query(locator, self.root)
+
+    def find_shadow_element(self, host_locator: tuple, shadow_css: str) -> SnapshotElement:
+        """Same path as UIActions.get_shadow_element: locate the host, then CSS inside its shadow root"""
+        host = self.find_element(host_locator)._node
+        shadow_root = self._shadow_roots.get(host)
+        if shadow_root is None:
+            raise NoSuchElementException(f"Element {host_locator} has no open shadow root in the snapshot")
+        locator = (By.CSS_SELECTOR, shadow_css)
+        return self._first(self._query(locator, shadow_root), locator)
+
+    def get_text(self, locator: tuple) -> str:
+        return self.find_element(locator).text
+
+    def get_attribute(self, locator: tuple, attribute: str) -> Optional[str]:
+        return self.find_element(locator).get_attribute(attribute)
+
+    def is_visible(self, locator: tuple) -> bool:
+        return any(element.is_displayed() for element in self.find_elements(locator))
+
+    def is_enabled(self, locator: tuple) -> bool:
+        return self.find_element(locator).is_enabled()
+
+    def is_selected(self, locator: tuple) -> bool:
+        return self.find_element(locator).is_selected()
+
+    # Internals
+    def _check(self) -> None:
+        if self.stale:
+            raise StaleSnapshotError("The DOM snapshot was invalidated by a page interaction; take a new one")
+
+    def _query(self, locator: tuple, context) -> List[SnapshotElement]:
+        self._check()
+        kind, query = to_query(locator)
+        if kind == "css":
+            # Like the browser, the document itself can match; an element only searches its descendants.
+            prefix = "descendant-or-self::" if context is self.root else "descendant::"
+            xpath = self._css_cache.get((query, prefix))
+            if xpath is None:
+                try:
+                    xpath = etree.XPath(HTMLTranslator().css_to_xpath(query, prefix=prefix))
+                except SelectorError as e:
+                    raise ValueError(f"Invalid CSS selector {query!r}: {e}")
+                self._css_cache[(query, prefix)] = xpath
+            nodes = xpath(context)
+        else:
+            # Absolute XPath ("//...") is evaluated against the tree that contains the context node.
+            nodes = context.xpath(query)
+        return [SnapshotElement(self, node) for node in nodes if isinstance(node, etree._Element)]
+
+    @staticmethod
+    def _first(elements: List[SnapshotElement], locator: tuple) -> SnapshotElement:
+        if not elements:
+            raise NoSuchElementException(f"No element matching {locator} in the DOM snapshot")
+        return elements[0]
+
+    def _visible(self, node) -> bool:
+        return self._meta[node][0]
+
+    def _state(self, node) -> Optional[dict]:
+        return self._meta[node][1]
+
+    def _text(self, node) -> str:
+        parts: List[str] = []
+        self._collect_text(node, parts)
+        lines = (" ".join(line.split()) for line in "".join(parts).split("\n"))
+        return "\n".join(line for line in lines if line)
+
+    def _collect_text(self, node, parts: List[str]) -> None:
+        if not self._visible(node):
+            return
+        block = node.tag in _BLOCK_TAGS
+        if block:
+            parts.append("\n")
+        if node.text:
+            parts.append(node.text)
+        for child in node:
+            self._collect_text(child, parts)
+            if child.tail:
+                parts.append(child.tail)
+        if block:
+            parts.append("\n")
+
+    def _build(self, serialized: dict, parent=None):
+        tag = serialized["t"] if _XML_NAME.match(serialized["t"] or "") else "unknown"
+        node = etree.Element(tag) if parent is None else etree.SubElement(parent, tag)
+        for name, value in serialized["a"].items():
+            # Framework attributes such as @click or :class are not valid XML names and cannot be queried anyway.
+            if _XML_NAME.match(name):
+                node.set(name, _xml_safe(value))
+        self._meta[node] = (serialized["v"], serialized.get("p"))
+        self._append_children(node, serialized["c"])
+        if "s" in serialized:
+            shadow_root = etree.Element("shadow-root")
+            self._meta[shadow_root] = (serialized["v"], None)
+            self._append_children(shadow_root, serialized["s"])
+            self._shadow_roots[node] = shadow_root
+        return node
+
+    def _append_children(self, node, children: list) -> None:
+        last = None
+        for child in children:
+            if isinstance(child, str):
+                child = _xml_safe(child)
+                if last is None:
+                    node.text = (node.text or "") + child
+                else:
+                    last.tail = (last.tail or "") + child
+            else:
+                last = self._build(child, node)
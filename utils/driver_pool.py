@@ -0,0 +1,119 @@
+from typing import Callable, Dict, List, Optional, Tuple
+
+_CDP_BROWSERS = ("chrome", "MicrosoftEdge")
+
+
+class PooledDriver:
+    """A pooled WebDriver together with its pool key and usage count"""
+
+    def __init__(self, key: Tuple[str, str, Optional[str]], driver):
+        self.key = key
+        self.driver = driver
+        self.uses = 0
+
+
+class DriverPool:
+    """Keeps WebDriver sessions alive across tests within one process (one per xdist worker).
+
+    Drivers are keyed by (browser_name, execution, launch_profile) and are reset between tests
+    instead of being quit. A driver is recycled after `max_uses` tests or as soon as it fails a health check.
+    """
+
+    def __init__(self, factory: Callable[[str, Optional[str]], object], max_uses: int = 25,
+                 on_discard: Optional[Callable[[str, Optional[str]], None]] = None):
+        self._factory = factory
+        self.max_uses = max_uses
+        # Called with (browser_name, launch_profile) when a released driver is quit, e.g. to launch its replacement early.
+        self._on_discard = on_discard
+        self._idle: Dict[Tuple[str, str, Optional[str]], List[PooledDriver]] = {}
+        self._in_use: List[PooledDriver] = []
+
+    def acquire(self, browser_name: str, execution: str = "local", fresh: bool = False,
+                launch_profile: Optional[str] = None) -> PooledDriver:
+        """Return a healthy driver for the key, creating one if none is idle"""
+        key = (browser_name, execution, launch_profile)
+        idle = self._idle.setdefault(key, [])
+        entry = None
+        while idle and not fresh:
+            candidate = idle.pop()
+            if self.is_healthy(candidate.driver):
+                entry = candidate
+                break
+            self._quit(candidate)
+        if entry is None:
+            entry = PooledDriver(key, self._factory(browser_name, launch_profile))
+        entry.uses += 1
+        self._in_use.append(entry)
+        return entry
+
+    def release(self, entry: PooledDriver, discard: bool = False) -> None:
+        """Return a driver to the pool, resetting it, or quit it if it should not be reused"""
+        if entry in self._in_use:
+            self._in_use.remove(entry)
+        if discard or entry.uses >= self.max_uses or not self.reset(entry.driver):
+            self._quit(entry)
+            if self._on_discard is not None:
+                self._on_discard(entry.key[0], entry.key[2])
+            return
+        self._idle.setdefault(entry.key, []).append(entry)
+
+    @staticmethod
+    def is_healthy(driver) -> bool:
+        """Check that the browser session still responds"""
+        try:
+            return len(driver.window_handles) > 0
+        except Exception:
+            return False
+
+    @staticmethod
+    def reset(driver) -> bool:
+        """Bring a driver back to a blank state. Returns False if the session is unusable."""
+        try:
+            handles = driver.window_handles
+            # Close every window except the first one
+            for handle in handles[1:]:
+                driver.switch_to.window(handle)
+                driver.close()
+            driver.switch_to.window(handles[0])
+            # Web storage is per origin, so clear it before leaving the current page
+            driver.execute_script(
+                "try { window.localStorage.clear(); window.sessionStorage.clear(); } catch (e) {}"
+            )
+            driver.delete_all_cookies()
+            # Chromium browsers can drop cookies for every domain in one call. Every Remote driver has
+            # execute_cdp_cmd, but it raises on other browsers, so check the session's browser instead.
+            if driver.caps.get("browserName") in _CDP_BROWSERS:
+                try:
+                    driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+                except Exception:
+                    pass
+            driver.get("about:blank")
+            return True
+        except Exception:
+            return False
+
+    def evict_idle(self) -> int:
+        """Quit every idle driver, e.g. to free capped remote session slots; returns how many were quit"""
+        entries = [entry for idle in self._idle.values() for entry in idle]
+        self._idle.clear()
+        for entry in entries:
+            self._quit(entry)
+        return len(entries)
+
+    def close_all(self) -> None:
+        """Quit every driver owned by the pool"""
+        for entries in self._idle.values():
+            for entry in entries:
+                self._quit(entry)
+        self._idle.clear()
+        for entry in list(self._in_use):
+            self._quit(entry)
+        self._in_use.clear()
+
+    @staticmethod
+    def _quit(entry: PooledDriver) -> None:
+        try:
+            entry.driver.quit()
+        except Exception as e:
+            # The session may still be alive on a remote hub and count against its session limit.
+            print(f"Warning: could not quit {entry.key[0]} driver ({entry.key[1]}): {e}")
@@ -0,0 +1,107 @@
+import heapq
+import sqlite3
+import statistics
+import time
+from typing import Dict, Iterable, Mapping, Optional, Sequence, Tuple
+
+
+def browser_from_nodeid(nodeid: str, browsers: Iterable[str]) -> Optional[str]:
+    """The browser a test item runs on, read from its parametrize id (e.g. "test_login[chrome]")"""
+    if not nodeid.endswith("]") or "[" not in nodeid:
+        return None
+    known = set(browsers)
+    for part in nodeid[nodeid.rindex("[") + 1:-1].split("-"):
+        if part in known:
+            return part
+    return None
+
+
+def predicted_makespan(durations: Sequence[float], workers: int) -> float:
+    """Finish time when the durations are handed out longest-first to the least busy worker"""
+    loads = [0.0] * max(workers, 1)
+    for duration in sorted(durations, reverse=True):
+        heapq.heapreplace(loads, loads[0] + duration)
+    return max(loads)
+
+
+class DurationHistory:
+    """Per-test durations from previous runs in a local SQLite file, keyed by nodeid and browser.
+
+    Each stored value is an exponentially weighted average of the full runtest protocol time
+    (setup + call + teardown), so a single slow run does not dominate the prediction.
+    """
+
+    def __init__(self, path: str, smoothing: float = 0.5, default_duration: float = 1.0):
+        self.path = path
+        self.smoothing = smoothing
+        self.default_duration = default_duration
+        self._durations: Dict[Tuple[str, Optional[str]], float] = {}
+        self._new: Dict[Tuple[str, Optional[str]], float] = {}
+        self._load()
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.path, timeout=30)
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS durations ("
+            "nodeid TEXT NOT NULL, browser TEXT NOT NULL, duration REAL NOT NULL, runs INTEGER NOT NULL, "
+            "updated REAL NOT NULL, PRIMARY KEY (nodeid, browser))"
+        )
+        return connection
+
+    def _load(self) -> None:
+        try:
+            connection = self._connect()
+            rows = connection.execute("SELECT nodeid, browser, duration FROM durations").fetchall()
+            connection.close()
+        except sqlite3.Error:
+            return
+        for nodeid, browser, duration in rows:
+            self._durations[(nodeid, browser or None)] = duration
+
+    def predict(self, nodeid: str, browser: Optional[str] = None) -> float:
+        """Expected duration; unseen tests get the median of their browser's tests (or the default)"""
+        known = self._durations.get((nodeid, browser))
+        if known is not None:
+            return known
+        same_browser = [duration for (_, other), duration in self._durations.items() if other == browser]
+        return statistics.median(same_browser) if same_browser else self.default_duration
+
+    def predictions(self, nodeids: Sequence[str], browsers: Mapping[str, Optional[str]]) -> Dict[str, float]:
+        """predict() for many items, computing each browser's fallback median only once"""
+        fallback: Dict[Optional[str], float] = {}
+        result = {}
+        for nodeid in nodeids:
+            browser = browsers.get(nodeid)
+            known = self._durations.get((nodeid, browser))
+            if known is None:
+                if browser not in fallback:
+                    fallback[browser] = self.predict("", browser)
+                known = fallback[browser]
+            result[nodeid] = known
+        return result
+
+    def add(self, nodeid: str, browser: Optional[str], duration: float) -> None:
+        """Accumulate the duration of one phase (setup, call or teardown) of a test in this run"""
+        key = (nodeid, browser)
+        self._new[key] = self._new.get(key, 0.0) + duration
+
+    def save(self) -> None:
+        """Blend this run's durations into the stored averages"""
+        if not self._new:
+            return
+        now = time.time()
+        connection = self._connect()
+        with connection:
+            for (nodeid, browser), duration in self._new.items():
+                previous = self._durations.get((nodeid, browser))
+                if previous is not None:
+                    duration = self.smoothing * duration + (1 - self.smoothing) * previous
+                connection.execute(
+                    "INSERT INTO durations (nodeid, browser, duration, runs, updated) VALUES (?, ?, ?, 1, ?) "
+                    "ON CONFLICT (nodeid, browser) DO UPDATE SET duration = excluded.duration, "
+                    "runs = runs + 1, updated = excluded.updated",
+                    (nodeid, browser or "", duration, now),
+                )
+                self._durations[(nodeid, browser)] = duration
+        connection.close()
+        self._new.clear()
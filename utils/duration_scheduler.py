@@ -0,0 +1,150 @@
+import time
+from typing import Dict, List, Optional
+
+from xdist.scheduler import LoadScheduling
+
+from utils.duration_history import DurationHistory, browser_from_nodeid, predicted_makespan
+
+# Items queued on a worker at once. Small queues keep longest-first ordering effective until the end.
+QUEUE_SIZE = 2
+
+
+class DurationScheduling(LoadScheduling):
+    """xdist scheduler that hands out items longest-first and keeps each worker on one browser.
+
+    Workers are split across browsers in proportion to each browser's predicted work. A worker only
+    takes items of another browser (re-pinning itself) when its own browser has nothing left, so
+    pooled and pre-warmed drivers stay in use. Items without a browser fit on any worker.
+    """
+
+    def __init__(self, config, log=None, history: Optional[DurationHistory] = None, browsers=()):
+        super().__init__(config, log)
+        self.history = history
+        self.browsers = tuple(browsers)
+        self.predicted: Dict[int, float] = {}
+        self.item_browser: Dict[int, Optional[str]] = {}
+        self.node_browser: Dict[object, Optional[str]] = {}
+        self.browser_switches = 0
+        self.workers = 0
+        self.predicted_makespan = 0.0
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+
+    def schedule(self) -> None:
+        if self.collection is not None:
+            return super().schedule()
+        if not self._check_nodes_have_same_collection():
+            self.log("**Different tests collected, aborting run**")
+            return
+        self.collection = next(iter(self.node2collection.values()))
+        if not self.collection:
+            return
+        browsers = {nodeid: browser_from_nodeid(nodeid, self.browsers) for nodeid in self.collection}
+        if self.history is not None:
+            durations = self.history.predictions(self.collection, browsers)
+        else:
+            durations = dict.fromkeys(self.collection, 1.0)
+        for index, nodeid in enumerate(self.collection):
+            self.predicted[index] = durations[nodeid]
+            self.item_browser[index] = browsers[nodeid]
+        self.pending[:] = sorted(range(len(self.collection)), key=self.predicted.__getitem__, reverse=True)
+        self.workers = len(self.nodes)
+        self.predicted_makespan = predicted_makespan(list(self.predicted.values()), self.workers)
+        self._pin_nodes()
+        self.started = time.monotonic()
+        for node in self.nodes:
+            self._send_tests(node, QUEUE_SIZE)
+        if not self.pending:
+            for node in self.nodes:
+                node.shutdown()
+
+    def check_schedule(self, node, duration: float = 0) -> None:
+        if node.shutting_down:
+            return
+        if self.pending:
+            missing = QUEUE_SIZE - len(self.node2pending[node])
+            if missing > 0:
+                self._send_tests(node, missing)
+        else:
+            node.shutdown()
+
+    def mark_test_complete(self, node, item_index: int, duration: float = 0) -> None:
+        super().mark_test_complete(node, item_index, duration)
+        self.finished = time.monotonic()
+
+    def mark_test_pending(self, item: str) -> None:
+        self.pending.insert(0, self.collection.index(item))
+        self._resort()
+        for node in self.node2pending:
+            self.check_schedule(node)
+
+    def remove_node(self, node) -> Optional[str]:
+        # Same as LoadScheduling.remove_node, but the returned items are put back in longest-first order.
+        self.node_browser.pop(node, None)
+        pending = self.node2pending.pop(node)
+        if not pending:
+            return None
+        crashitem = self.collection[pending.pop(0)]
+        self.pending.extend(pending)
+        self._resort()
+        for other in self.node2pending:
+            self.check_schedule(other)
+        return crashitem
+
+    @property
+    def actual_makespan(self) -> Optional[float]:
+        if self.started is None or self.finished is None:
+            return None
+        return self.finished - self.started
+
+    def _resort(self) -> None:
+        self.pending.sort(key=lambda index: self.predicted.get(index, 0.0), reverse=True)
+
+    def _pin_nodes(self) -> None:
+        # Share the workers between browsers in proportion to their predicted work (largest remainder).
+        work: Dict[Optional[str], float] = {}
+        for index in self.pending:
+            browser = self.item_browser[index]
+            if browser is not None:
+                work[browser] = work.get(browser, 0.0) + self.predicted[index]
+        nodes = self.nodes
+        if not work:
+            return
+        total = sum(work.values())
+        shares = {browser: len(nodes) * amount / total for browser, amount in work.items()}
+        counts = {browser: max(1, int(share)) for browser, share in shares.items()}
+        by_remainder = sorted(shares, key=lambda browser: shares[browser] - int(shares[browser]), reverse=True)
+        while sum(counts.values()) < len(nodes):
+            for browser in by_remainder:
+                if sum(counts.values()) < len(nodes):
+                    counts[browser] += 1
+        assignment: List[Optional[str]] = [browser for browser in sorted(counts, key=work.get, reverse=True)
+                                           for _ in range(counts[browser])]
+        for node, browser in zip(nodes, assignment):
+            self.node_browser[node] = browser
+
+    def _next_index(self, node) -> int:
+        # Longest pending item of the worker's browser, then browser-less items, then the longest of any.
+        pinned = self.node_browser.get(node)
+        fallback = None
+        for position, index in enumerate(self.pending):
+            browser = self.item_browser.get(index)
+            if browser == pinned:
+                return position
+            if browser is None and fallback is None:
+                fallback = position
+        if fallback is not None:
+            return fallback
+        position = 0
+        if pinned is not None:
+            self.browser_switches += 1
+        self.node_browser[node] = self.item_browser.get(self.pending[position])
+        return position
+
+    def _send_tests(self, node, num: int) -> None:
+        indices = []
+        for _ in range(min(num, len(self.pending))):
+            indices.append(self.pending.pop(self._next_index(node)))
+        if indices:
+            self.node2pending[node].extend(indices)
+            node.send_runtest_some(indices)
@@ -0,0 +1,242 @@
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+# Opt-in timing of framework calls (instrumentation.enabled in config.yaml or --instrument).
+# install() wraps the methods once per process (the UI side once the UI machinery is loaded, see
+# install_ui()); when it is never called nothing is patched, so a disabled run pays no overhead at all.
+
+# Per-test aggregate columns, in report order: (key, HTML header).
+COLUMNS = (
+    ("ui_s", "UI (s)"),
+    ("wait_s", "Wait (s)"),
+    ("page_load_s", "Page load (s)"),
+    ("api_s", "API (s)"),
+    ("commands", "Commands"),
+    ("http_kib", "HTTP (KiB)"),
+)
+
+# WebDriver commands that load a page.
+_PAGE_LOAD_COMMANDS = frozenset(("get", "goBack", "goForward", "refresh"))
+# Background threads whose driver commands do not belong to the running test.
+_IGNORED_THREADS = ("browser-launcher",)
+
+_originals: List[tuple] = []
+_installed = False
+_installed_ui = False
+_local = threading.local()
+_current: Optional["TestRecorder"] = None
+
+
+class TestRecorder:
+    """Timings, counters and trace events of one test"""
+
+    __test__ = False  # Not a pytest test class
+
+    def __init__(self, nodeid: str):
+        self.nodeid = nodeid
+        self.events: List[dict] = []
+        self.totals = {"ui": 0.0, "page": 0.0, "api": 0.0, "wait": 0.0, "page_load": 0.0,
+                       "commands": 0, "http_bytes": 0}
+        self._lock = threading.Lock()
+
+    def add_event(self, name: str, category: str, start: float, duration: float, outermost: bool) -> None:
+        with self._lock:
+            self.events.append({
+                "name": name, "cat": category, "ph": "X",
+                "ts": round(start * 1e6), "dur": round(duration * 1e6),
+                "tid": threading.get_ident(), "args": {"test": self.nodeid},
+            })
+            # Nested calls (e.g. scroll_into_view -> execute_script) only count once in the totals.
+            if outermost:
+                self.totals[category] += duration
+
+    def add(self, key: str, value) -> None:
+        with self._lock:
+            self.totals[key] += value
+
+    def summary(self) -> Dict[str, Any]:
+        """Aggregates shown in the HTML report, keyed as in COLUMNS"""
+        totals = self.totals
+        return {
+            "ui_s": round(totals["ui"] + totals["page"], 3),
+            "wait_s": round(totals["wait"], 3),
+            "page_load_s": round(totals["page_load"], 3),
+            "api_s": round(totals["api"], 3),
+            "commands": totals["commands"],
+            "http_kib": round(totals["http_bytes"] / 1024, 1),
+        }
+
+
+def begin_test(nodeid: str) -> None:
+    global _current
+    _current = TestRecorder(nodeid) if _installed else None
+
+
+def current() -> Optional[TestRecorder]:
+    return _current
+
+
+def _depth(category: str) -> Dict[str, int]:
+    depths = getattr(_local, "depths", None)
+    if depths is None:
+        depths = _local.depths = {}
+    depths.setdefault(category, 0)
+    return depths
+
+
+def _timed(method: Callable, name: str, category: str) -> Callable:
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        recorder = _current
+        if recorder is None:
+            return method(*args, **kwargs)
+        depths = _depth(category)
+        depths[category] += 1
+        start = time.perf_counter()
+        try:
+            return method(*args, **kwargs)
+        finally:
+            depths[category] -= 1
+            recorder.add_event(name, category, start, time.perf_counter() - start, depths[category] == 0)
+    return wrapper
+
+
+def _patch(owner, attribute: str, replacement: Callable) -> None:
+    _originals.append((owner, attribute, owner.__dict__[attribute]))
+    setattr(owner, attribute, replacement)
+
+
+def _instrument_class(cls, category: str, names=None) -> None:
+    for name, member in list(vars(cls).items()):
+        if not callable(member) or isinstance(member, (staticmethod, classmethod)):
+            continue
+        if (names is None and not name.startswith("_")) or (names is not None and name in names):
+            _patch(cls, name, _timed(member, f"{cls.__name__}.{name}", category))
+
+
+def _count_command(execute: Callable) -> Callable:
+    @functools.wraps(execute)
+    def wrapper(self, driver_command, params=None):
+        recorder = _current
+        if recorder is None or threading.current_thread().name in _IGNORED_THREADS:
+            return execute(self, driver_command, params)
+        start = time.perf_counter()
+        try:
+            return execute(self, driver_command, params)
+        finally:
+            recorder.add("commands", 1)
+            if driver_command in _PAGE_LOAD_COMMANDS:
+                duration = time.perf_counter() - start
+                recorder.add_event(f"page load ({driver_command})", "page_load", start, duration, True)
+    return wrapper
+
+
+def _count_http_bytes(send: Callable) -> Callable:
+    @functools.wraps(send)
+    def wrapper(self, request, **kwargs):
+        response = send(self, request, **kwargs)
+        recorder = _current
+        if recorder is not None:
+            sent = len(request.body) if isinstance(request.body, (bytes, str)) else 0
+            # Streamed bodies are not read here; fall back to the announced length.
+            received = (len(response._content) if isinstance(response._content, bytes)
+                        else int(response.headers.get("Content-Length") or 0))
+            recorder.add("http_bytes", sent + received)
+        return response
+    return wrapper
+
+
+def install() -> None:
+    """Wrap APIActions and HTTP sends, and the UI side too if it is already loaded (see install_ui)"""
+    global _installed
+    if _installed:
+        return
+    _installed = True
+    import requests
+    from utils.api_actions import APIActions
+
+    _instrument_class(APIActions, "api")
+    _patch(requests.Session, "send", _count_http_bytes(requests.Session.send))
+    if "selenium.webdriver.remote.webdriver" in sys.modules:
+        install_ui()
+
+
+def install_ui() -> None:
+    """Wrap UIActions, BasePage.wait_for_element, waits and driver commands.
+
+    Called once the UI machinery is imported, so instrumented API-only runs never load Selenium.
+    Does nothing unless install() was called first.
+    """
+    global _installed_ui
+    if not _installed or _installed_ui:
+        return
+    _installed_ui = True
+    from selenium.webdriver.remote.webdriver import WebDriver
+    from selenium.webdriver.support.ui import WebDriverWait
+    from pages.base_page import BasePage
+    from utils.ui_actions import UIActions
+    from utils.waits import WaitEngine
+
+    _instrument_class(UIActions, "ui")
+    _instrument_class(BasePage, "page", names=("wait_for_element",))
+    # WaitEngine may delegate to WebDriverWait; the depth guard keeps such time from counting twice.
+    _instrument_class(WaitEngine, "wait", names=("until", "until_true"))
+    _instrument_class(WebDriverWait, "wait", names=("until", "until_not"))
+    _patch(WebDriver, "execute", _count_command(WebDriver.execute))
+
+
+def uninstall() -> None:
+    """Restore every patched method"""
+    global _current, _installed, _installed_ui
+    while _originals:
+        owner, attribute, original = _originals.pop()
+        setattr(owner, attribute, original)
+    _current = None
+    _installed = _installed_ui = False
+
+
+class TraceWriter:
+    """Collects the trace events and per-test summaries of a process and writes them as a Chrome trace.
+
+    The file opens in chrome://tracing or https://ui.perfetto.dev; its "tests" key maps every test
+    to the same aggregates as the HTML report columns.
+    """
+
+    def __init__(self, pid: int = 0):
+        self.pid = pid
+        self.events: List[dict] = []
+        self.tests: Dict[str, Dict[str, Any]] = {}
+
+    def add(self, recorder: TestRecorder) -> None:
+        for event in recorder.events:
+            event["pid"] = self.pid
+        self.events.extend(recorder.events)
+        self.tests[recorder.nodeid] = recorder.summary()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"traceEvents": self.events, "displayTimeUnit": "ms", "tests": self.tests}
+
+    def write(self, path: str) -> None:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f)
+
+
+def merge_traces(paths, path: str) -> None:
+    """Merge per-worker trace files into one and remove them"""
+    merged = TraceWriter()
+    for worker_path in paths:
+        try:
+            with open(worker_path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            continue
+        merged.events.extend(data.get("traceEvents", []))
+        merged.tests.update(data.get("tests", {}))
+        os.remove(worker_path)
+    merged.write(path)
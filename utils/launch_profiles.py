@@ -0,0 +1,157 @@
+import itertools
+import os
+from typing import Mapping, Optional, Tuple
+
+# Chromium switches that stop work no test needs: updates, sync, extensions, background networking.
+_CHROMIUM_QUIET_ARGS = (
+    "--disable-background-networking",
+    "--disable-component-update",
+    "--disable-default-apps",
+    "--disable-extensions",
+    "--disable-sync",
+    "--disable-client-side-phishing-detection",
+    "--disable-background-timer-throttling",
+    "--disable-renderer-backgrounding",
+    "--disable-backgrounding-occluded-windows",
+    "--disable-features=Translate,OptimizationHints,MediaRouter",
+    "--metrics-recording-only",
+    "--no-first-run",
+    "--no-default-browser-check",
+)
+# Firefox preferences with the same purpose.
+_FIREFOX_QUIET_PREFS = {
+    "app.update.enabled": False,
+    "app.update.auto": False,
+    "browser.safebrowsing.malware.enabled": False,
+    "browser.safebrowsing.phishing.enabled": False,
+    "datareporting.healthreport.uploadEnabled": False,
+    "datareporting.policy.dataSubmissionEnabled": False,
+    "toolkit.telemetry.enabled": False,
+    "extensions.update.enabled": False,
+    "browser.shell.checkDefaultBrowser": False,
+    "network.prefetch-next": False,
+}
+
+# Numbers user-data-dir slots within this process, so concurrent browsers never share a profile directory.
+_profile_slots = itertools.count()
+
+
+class LaunchProfile:
+    """Browser launch settings for one `launch_profiles.profiles.<name>` entry of config.yaml"""
+
+    def __init__(self, name: str, headless: bool = False, page_load_strategy: str = "normal",
+                 window_size: Optional[Tuple[int, int]] = None, disable_background_services: bool = False,
+                 disable_images: bool = False, disk_cache_dir: Optional[str] = None,
+                 user_data_dir: Optional[str] = None, extra_args=()):
+        if page_load_strategy not in ("normal", "eager", "none"):
+            raise ValueError(f"Unsupported page_load_strategy: {page_load_strategy}")
+        self.name = name
+        self.headless = headless
+        self.page_load_strategy = page_load_strategy
+        self.window_size = tuple(window_size) if window_size else None
+        self.disable_background_services = disable_background_services
+        self.disable_images = disable_images
+        self.disk_cache_dir = disk_cache_dir
+        self.user_data_dir = user_data_dir
+        self.extra_args = tuple(extra_args)
+
+    @classmethod
+    def from_config(cls, name: str, settings: Optional[Mapping]) -> "LaunchProfile":
+        return cls(name, **dict(settings or {}))
+
+    def _user_data_dir(self, browser: str) -> Optional[str]:
+        # Template fields: {browser}, {worker} (xdist worker id) and {slot} (per-process counter).
+        if not self.user_data_dir:
+            return None
+        path = self.user_data_dir.format(
+            browser=browser, worker=os.environ.get("PYTEST_XDIST_WORKER", "main"), slot=next(_profile_slots)
+        )
+        return os.path.abspath(path)
+
+    def apply(self, options, browser: str) -> None:
+        """Apply the profile to ChromeOptions/EdgeOptions (chromium) or FirefoxOptions"""
+        options.page_load_strategy = self.page_load_strategy
+        if browser in ("chrome", "edge"):
+            self._apply_chromium(options, browser)
+        elif browser == "firefox":
+            self._apply_firefox(options, browser)
+        for arg in self.extra_args:
+            options.add_argument(arg)
+
+    def _apply_chromium(self, options, browser: str) -> None:
+        if self.headless:
+            options.add_argument("--headless=new")
+        if self.window_size:
+            options.add_argument(f"--window-size={self.window_size[0]},{self.window_size[1]}")
+        if self.disable_background_services:
+            for arg in _CHROMIUM_QUIET_ARGS:
+                options.add_argument(arg)
+        if self.disable_images:
+            options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+        if self.disk_cache_dir:
+            options.add_argument(f"--disk-cache-dir={os.path.abspath(self.disk_cache_dir)}")
+        user_data_dir = self._user_data_dir(browser)
+        if user_data_dir:
+            options.add_argument(f"--user-data-dir={user_data_dir}")
+
+    def _apply_firefox(self, options, browser: str) -> None:
+        if self.headless:
+            options.add_argument("-headless")
+        if self.window_size:
+            options.add_argument(f"--width={self.window_size[0]}")
+            options.add_argument(f"--height={self.window_size[1]}")
+        if self.disable_background_services:
+            for name, value in _FIREFOX_QUIET_PREFS.items():
+                options.set_preference(name, value)
+        if self.disable_images:
+            options.set_preference("permissions.default.image", 2)
+        if self.disk_cache_dir:
+            options.set_preference("browser.cache.disk.parent_directory", os.path.abspath(self.disk_cache_dir))
+        user_data_dir = self._user_data_dir(browser)
+        if user_data_dir:
+            os.makedirs(user_data_dir, exist_ok=True)
+            options.add_argument("-profile")
+            options.add_argument(user_data_dir)
+
+    def cloud_capabilities(self, browser: str, provider: str) -> dict:
+        """Capabilities expressing the profile for BrowserStack or Sauce Labs sessions.
+
+        Local-only settings (disk cache, user-data-dir) have no cloud equivalent and are skipped.
+        """
+        caps = {"pageLoadStrategy": self.page_load_strategy}
+        args = []
+        if self.headless:
+            args.append("--headless=new" if browser in ("chrome", "edge") else "-headless")
+        if self.disable_background_services and browser in ("chrome", "edge"):
+            args.extend(_CHROMIUM_QUIET_ARGS)
+        args.extend(self.extra_args)
+        if browser in ("chrome", "edge"):
+            key = "goog:chromeOptions" if browser == "chrome" else "ms:edgeOptions"
+            browser_options = {"args": args}
+            if self.disable_images:
+                browser_options["prefs"] = {"profile.managed_default_content_settings.images": 2}
+            caps[key] = browser_options
+        elif browser == "firefox":
+            prefs = dict(_FIREFOX_QUIET_PREFS) if self.disable_background_services else {}
+            if self.disable_images:
+                prefs["permissions.default.image"] = 2
+            caps["moz:firefoxOptions"] = {"args": args, "prefs": prefs}
+        if self.window_size:
+            resolution = f"{self.window_size[0]}x{self.window_size[1]}"
+            if provider == "browserstack":
+                caps["bstack:options"] = {"resolution": resolution}
+            elif provider == "saucelabs":
+                caps["sauce:options"] = {"screenResolution": resolution}
+        return caps
+
+
+def launch_profile_from_config(config: Mapping, name: Optional[str] = None) -> Optional[LaunchProfile]:
+    """Look up a profile by name (default: launch_profiles.default); None when nothing is configured"""
+    section = config.get("launch_profiles", {})
+    name = name or section.get("default")
+    if not name:
+        return None
+    profiles = section.get("profiles", {})
+    if name not in profiles:
+        raise ValueError(f"Unknown launch profile: {name}")
+    return LaunchProfile.from_config(name, profiles[name])
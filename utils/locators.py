@@ -0,0 +1,75 @@
+from selenium.webdriver.common.by import By
+from typing import Tuple
+
+
+def xpath_literal(text: str) -> str:
+    """Quote a string for use inside an XPath expression"""
+    if '"' not in text:
+        return f'"{text}"'
+    if "'" not in text:
+        return f"'{text}'"
+    parts = text.split('"')
+    return "concat(" + ", '\"', ".join(f'"{part}"' for part in parts) + ")"
+
+
+def _css_string(text: str) -> str:
+    return '"' + text.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+def to_query(locator: tuple) -> Tuple[str, str]:
+    """Translate a (By, value) locator into ("css" | "xpath", query) usable from JavaScript"""
+    by, value = locator
+    if by == By.CSS_SELECTOR:
+        return "css", value
+    if by == By.XPATH:
+        return "xpath", value
+    if by == By.ID:
+        return "css", f"[id={_css_string(value)}]"
+    if by == By.NAME:
+        return "css", f"[name={_css_string(value)}]"
+    if by == By.CLASS_NAME:
+        return "css", f"[class~={_css_string(value)}]"
+    if by == By.TAG_NAME:
+        return "css", value
+    if by == By.LINK_TEXT:
+        return "xpath", f"//a[normalize-space(.)={xpath_literal(value.strip())}]"
+    if by == By.PARTIAL_LINK_TEXT:
+        return "xpath", f"//a[contains(., {xpath_literal(value)})]"
+    raise ValueError(f"Unsupported locator strategy: {by}")
+
+
+# JavaScript helpers shared by the in-page wait, batch read and snapshot scripts.
+# findAll(kind, query, root) resolves a to_query() result; isVisible/isClickable mirror
+# Selenium's displayed/enabled checks closely enough for waiting purposes.
+JS_HELPERS = """
+function findAll(kind, query, root) {
+    root = root || document;
+    if (kind === 'css') {
+        return Array.prototype.slice.call(root.querySelectorAll(query));
+    }
+    var doc = root.ownerDocument || root;
+    var result = doc.evaluate(query, root, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    var nodes = [];
+    for (var i = 0; i < result.snapshotLength; i++) {
+        var node = result.snapshotItem(i);
+        if (node.nodeType === 1) { nodes.push(node); }
+    }
+    return nodes;
+}
+function isVisible(el) {
+    if (!el || !el.isConnected) { return false; }
+    if (typeof el.checkVisibility === 'function' &&
+        !el.checkVisibility({opacityProperty: true, visibilityProperty: true})) {
+        return false;
+    }
+    var style = window.getComputedStyle(el);
+    if (style.display === 'none' || style.visibility === 'hidden' || style.visibility === 'collapse') {
+        return false;
+    }
+    var rect = el.getBoundingClientRect();
+    return rect.width > 0 && rect.height > 0;
+}
+function isClickable(el) {
+    return isVisible(el) && !el.disabled && el.getAttribute('aria-disabled') !== 'true';
+}
+"""
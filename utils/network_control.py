@@ -0,0 +1,184 @@
+import fnmatch
+import threading
+from typing import Any, Dict, Mapping, Optional
+from urllib.parse import urlsplit
+
+# Resource type guessed from the file extension when the browser does not report a request destination.
+_EXTENSION_TYPES = {
+    "image": (".png", ".jpg", ".jpeg", ".gif", ".webp", ".avif", ".svg", ".ico", ".bmp"),
+    "font": (".woff", ".woff2", ".ttf", ".otf", ".eot"),
+    "media": (".mp4", ".webm", ".ogg", ".mp3", ".wav", ".m4a", ".mov"),
+    "style": (".css",),
+    "script": (".js", ".mjs"),
+}
+_DEFAULT_SIZE_ESTIMATES = {"image": 40000, "font": 30000, "media": 250000, "script": 20000, "style": 10000,
+                           "default": 5000}
+
+
+def guess_resource_type(url: str) -> str:
+    path = urlsplit(url).path.lower()
+    for resource_type, extensions in _EXTENSION_TYPES.items():
+        if path.endswith(extensions):
+            return resource_type
+    return "other"
+
+
+def _field(obj: Any, name: str, camel_name: Optional[str] = None) -> Any:
+    # BiDi event payloads arrive either as raw dicts (camelCase) or as generated dataclasses (snake_case).
+    if isinstance(obj, Mapping):
+        return obj.get(camel_name or name)
+    return getattr(obj, name, None)
+
+
+class NetworkProfile:
+    """Blocking and stubbing rules for one `network.profiles.<name>` entry of config.yaml"""
+
+    def __init__(self, name: str, block_urls=(), block_resource_types=(), block_third_party: bool = False,
+                 allow_domains=(), stubs=(), size_estimates: Optional[Mapping[str, int]] = None):
+        self.name = name
+        self.block_urls = tuple(block_urls)
+        self.block_resource_types = frozenset(block_resource_types)
+        self.block_third_party = block_third_party
+        self.allow_domains = tuple(domain.lower() for domain in allow_domains)
+        self.stubs = tuple(dict(stub) for stub in stubs)
+        self.size_estimates = {**_DEFAULT_SIZE_ESTIMATES, **dict(size_estimates or {})}
+
+    @classmethod
+    def from_config(cls, name: str, settings: Optional[Mapping]) -> "NetworkProfile":
+        return cls(name, **dict(settings or {}))
+
+    def stub_for(self, url: str) -> Optional[dict]:
+        for stub in self.stubs:
+            if fnmatch.fnmatchcase(url, stub["url"]):
+                return stub
+        return None
+
+    def block_reason(self, url: str, resource_type: str, first_party_host: Optional[str]) -> Optional[str]:
+        """Why the request should be blocked, or None to let it through"""
+        if resource_type == "document" or not url.startswith(("http://", "https://")):
+            return None
+        for pattern in self.block_urls:
+            if fnmatch.fnmatchcase(url, pattern):
+                return "url"
+        if resource_type in self.block_resource_types:
+            return "resource_type"
+        if self.block_third_party and first_party_host:
+            host = (urlsplit(url).hostname or "").lower()
+            allowed = (first_party_host,) + self.allow_domains
+            if not any(host == domain or host.endswith("." + domain) for domain in allowed):
+                return "third_party"
+        return None
+
+
+class NetworkController:
+    """Applies a NetworkProfile to a driver through its WebDriver BiDi session and counts the effect.
+
+    Counters (per test): requests seen/blocked/stubbed, bytes actually received, an estimate of the
+    bytes saved by blocking (from the profile's size_estimates) and the last page load time.
+    """
+
+    def __init__(self, driver, profile: NetworkProfile, base_url: Optional[str] = None):
+        self.driver = driver
+        self.profile = profile
+        self.first_party_host = (urlsplit(base_url).hostname or "").lower() if base_url else None
+        self._lock = threading.Lock()
+        self._request_handler = None
+        self._response_handler = None
+        self.reset_counters()
+
+    def reset_counters(self) -> None:
+        self.counters: Dict[str, Any] = {
+            "requests": 0, "blocked": 0, "stubbed": 0, "bytes_received": 0, "bytes_saved_estimate": 0,
+        }
+
+    def start(self) -> bool:
+        """Install the request/response handlers. Returns False when the session has no BiDi network module."""
+        # Imported here: conftest loads this module for API-only runs too, which never need Selenium.
+        from selenium.common.exceptions import WebDriverException
+        try:
+            # Sessions started without BiDi raise on first access to driver.network.
+            network = self.driver.network
+            self._request_handler = network.add_request_handler(self._on_request)
+            self._response_handler = network.add_event_handler("response_completed", self._on_response)
+        except (AttributeError, WebDriverException):
+            self.stop()
+            return False
+        return True
+
+    def stop(self) -> None:
+        """Remove the handlers so a pooled driver is left without interception"""
+        if self._request_handler is None and self._response_handler is None:
+            return
+        try:
+            # Also raises (WebDriverException) on sessions without BiDi.
+            network = self.driver.network
+            if self._request_handler is not None:
+                network.remove_request_handler(self._request_handler)
+            if self._response_handler is not None:
+                network.remove_event_handler("response_completed", self._response_handler)
+        except Exception:
+            pass
+        self._request_handler = None
+        self._response_handler = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for the current test, including the last page load time in milliseconds"""
+        with self._lock:
+            stats = dict(self.counters, profile=self.profile.name)
+        try:
+            stats["page_load_ms"] = self.driver.execute_script(
+                "var nav = performance.getEntriesByType('navigation')[0];"
+                "return nav && nav.loadEventEnd ? Math.round(nav.loadEventEnd - nav.startTime) : null;"
+            )
+        except Exception:
+            stats["page_load_ms"] = None
+        return stats
+
+    def _on_request(self, request) -> None:
+        resource_type = request.resource_type or guess_resource_type(request.url)
+        stub = self.profile.stub_for(request.url)
+        reason = None if stub else self.profile.block_reason(request.url, resource_type, self.first_party_host)
+        with self._lock:
+            self.counters["requests"] += 1
+            if stub:
+                self.counters["stubbed"] += 1
+            elif reason:
+                self.counters["blocked"] += 1
+                estimates = self.profile.size_estimates
+                self.counters["bytes_saved_estimate"] += estimates.get(resource_type, estimates["default"])
+        if stub:
+            request.provide_response(
+                status=stub.get("status", 200),
+                headers=dict(stub.get("headers", {})),
+                body=stub.get("body", ""),
+            )
+        elif reason:
+            request.fail()
+
+    def _on_response(self, params) -> None:
+        response = _field(params, "response")
+        size = _field(response, "bytes_received", "bytesReceived") if response is not None else None
+        if isinstance(size, (int, float)):
+            with self._lock:
+                self.counters["bytes_received"] += int(size)
+
+
+def merge_network_stats(all_stats) -> Dict[str, int]:
+    """Sum the per-test counters of several tests"""
+    totals = {"tests": 0, "requests": 0, "blocked": 0, "stubbed": 0, "bytes_received": 0, "bytes_saved_estimate": 0}
+    for stats in all_stats:
+        totals["tests"] += 1
+        for key in totals:
+            if key != "tests":
+                totals[key] += stats.get(key) or 0
+    return totals
+
+
+def profile_from_config(config: Mapping, name: Optional[str]) -> Optional[NetworkProfile]:
+    """Look up a profile by name in the `network` section; None, "" or "none" disables interception"""
+    if not name or name == "none":
+        return None
+    profiles = config.get("network", {}).get("profiles", {})
+    if name not in profiles:
+        raise ValueError(f"Unknown network profile: {name}")
+    return NetworkProfile.from_config(name, profiles[name])
@@ -0,0 +1,245 @@
+import sqlite3
+import sys
+import time
+from typing import Dict, List, Optional, Tuple
+
+import pytest
+from _pytest.runner import runtestprotocol
+
+# Failure kinds. Only transient and session failures are re-run; assertions and anything else fail at once.
+TRANSIENT = "transient"
+SESSION = "session"
+ASSERTION = "assertion"
+OTHER = "other"
+RETRIED = (TRANSIENT, SESSION)
+
+# WebDriverException messages of a crashed or disconnected browser.
+_SESSION_MESSAGES = (
+    "invalid session id", "no such session", "session deleted", "disconnected", "not reachable",
+    "target closed", "tab crashed", "browser has closed",
+)
+
+
+def classify_failure(error: BaseException) -> str:
+    """Sort a test failure into transient, session, assertion or other"""
+    if isinstance(error, AssertionError):
+        return ASSERTION
+    # Selenium and requests are only imported by runs that use them (an error cannot come from a module
+    # that was never loaded), so API-only runs do not pay for the Selenium import here.
+    if "requests" in sys.modules:
+        import requests
+        if isinstance(error, (requests.ConnectionError, requests.Timeout)):
+            # APIActions sessions retry through urllib3 already; another test run would multiply the attempts.
+            return OTHER if getattr(error, "retries_exhausted", False) else TRANSIENT
+    if "selenium" in sys.modules:
+        return _classify_webdriver_error(error)
+    return OTHER
+
+
+def _classify_webdriver_error(error: BaseException) -> str:
+    import urllib3
+    from selenium.common import exceptions
+
+    # Driver and browser problems that are not going to change on a retry (missing driver, version mismatch).
+    if isinstance(error, (exceptions.SessionNotCreatedException, exceptions.NoSuchDriverException)):
+        return OTHER
+    if isinstance(error, (exceptions.InvalidSessionIdException, exceptions.NoSuchWindowException)):
+        return SESSION
+    if isinstance(error, (
+        exceptions.StaleElementReferenceException,
+        exceptions.TimeoutException,
+        exceptions.ElementClickInterceptedException,
+        exceptions.ElementNotInteractableException,
+        exceptions.MoveTargetOutOfBoundsException,
+    )):
+        return TRANSIENT
+    if isinstance(error, exceptions.WebDriverException):
+        message = str(error).lower()
+        return SESSION if any(text in message for text in _SESSION_MESSAGES) else OTHER
+    # The HTTP connection to the driver process itself failed.
+    if isinstance(error, (urllib3.exceptions.MaxRetryError, urllib3.exceptions.ProtocolError,
+                          ConnectionRefusedError, ConnectionResetError)):
+        return SESSION
+    return OTHER
+
+
+class FlakyHistory:
+    """Per-test rerun history from previous runs in a local SQLite file, keyed by nodeid.
+
+    The stored rate is an exponentially weighted share of runs in which the test needed a rerun.
+    """
+
+    def __init__(self, path: str, smoothing: float = 0.3):
+        self.path = path
+        self.smoothing = smoothing
+        self._rates: Dict[str, Tuple[float, int]] = {}
+        self._new: Dict[str, bool] = {}
+        self._load()
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.path, timeout=30)
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS flakiness ("
+            "nodeid TEXT PRIMARY KEY, rate REAL NOT NULL, runs INTEGER NOT NULL, updated REAL NOT NULL)"
+        )
+        return connection
+
+    def _load(self) -> None:
+        try:
+            connection = self._connect()
+            rows = connection.execute("SELECT nodeid, rate, runs FROM flakiness").fetchall()
+            connection.close()
+        except sqlite3.Error:
+            return
+        for nodeid, rate, runs in rows:
+            self._rates[nodeid] = (rate, runs)
+
+    def is_flaky(self, nodeid: str, threshold: float, min_runs: int) -> bool:
+        """True when the test needed reruns in at least `threshold` of its recent runs"""
+        rate, runs = self._rates.get(nodeid, (0.0, 0))
+        return runs >= min_runs and rate >= threshold
+
+    def add(self, nodeid: str, needed_rerun: bool) -> None:
+        """Record whether the test needed a rerun in this run"""
+        self._new[nodeid] = self._new.get(nodeid, False) or needed_rerun
+
+    def save(self) -> None:
+        """Blend this run's outcomes into the stored rates"""
+        if not self._new:
+            return
+        now = time.time()
+        connection = self._connect()
+        with connection:
+            for nodeid, needed_rerun in self._new.items():
+                rate, runs = self._rates.get(nodeid, (0.0, 0))
+                value = 1.0 if needed_rerun else 0.0
+                rate = value if not runs else self.smoothing * value + (1 - self.smoothing) * rate
+                connection.execute(
+                    "INSERT INTO flakiness (nodeid, rate, runs, updated) VALUES (?, ?, 1, ?) "
+                    "ON CONFLICT (nodeid) DO UPDATE SET rate = excluded.rate, runs = runs + 1, "
+                    "updated = excluded.updated",
+                    (nodeid, rate, now),
+                )
+                self._rates[nodeid] = (rate, runs + 1)
+        connection.close()
+        self._new.clear()
+
+
+class SmartReruns:
+    """pytest plugin that re-runs tests according to why they failed.
+
+    Transient failures (stale elements, timeouts, dropped connections) are retried right away on the
+    same pooled browser, which ui_setup resets between attempts; later attempts back off exponentially.
+    Session failures (crashed or disconnected browser) are retried on a fresh driver. Assertions and
+    other errors are not retried. Tests that are known to be flaky from the history are not retried
+    inline: their reruns are batched at the end of the process's run. Tests marked
+    @pytest.mark.flaky are left to pytest-rerunfailures.
+    """
+
+    def __init__(self, max_reruns: int = 2, backoff: float = 0.5, max_backoff: float = 5.0,
+                 history: Optional[FlakyHistory] = None, defer_known_flaky: bool = True,
+                 flaky_threshold: float = 0.2, min_runs: int = 3, record: bool = False):
+        self.max_reruns = max_reruns
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.history = history
+        self.defer_known_flaky = defer_known_flaky
+        self.flaky_threshold = flaky_threshold
+        self.min_runs = min_runs
+        # Only the process that sees every report (xdist controller or plain run) records the history.
+        self.record = record
+        self.counters = {TRANSIENT: 0, SESSION: 0, "recovered": 0, "deferred": 0}
+        self._deferred: List[Tuple[pytest.Item, int]] = []
+        self._needed_rerun: Dict[str, bool] = {}
+
+    def delay(self, attempt: int) -> float:
+        """Seconds to wait before rerun number `attempt`; the first rerun is immediate"""
+        if attempt <= 1:
+            return 0.0
+        return min(self.max_backoff, self.backoff * 2 ** (attempt - 2))
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_makereport(self, item, call):
+        outcome = yield
+        rep = outcome.get_result()
+        if rep.failed and call.excinfo is not None:
+            rep.failure_kind = classify_failure(call.excinfo.value)
+            if rep.failure_kind == SESSION:
+                # ui_setup discards the broken driver at teardown and starts the next attempt on a new one.
+                item.rerun_fresh_driver = True
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_runtest_protocol(self, item, nextitem):
+        if item.get_closest_marker("flaky") is not None:
+            # @pytest.mark.flaky(reruns=N) is pytest-rerunfailures' to handle.
+            return None
+        item.ihook.pytest_runtest_logstart(nodeid=item.nodeid, location=item.location)
+        defer = (self.defer_known_flaky and self.history is not None
+                 and self.history.is_flaky(item.nodeid, self.flaky_threshold, self.min_runs))
+        self._run(item, nextitem, 0, defer)
+        item.ihook.pytest_runtest_logfinish(nodeid=item.nodeid, location=item.location)
+        return True
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtestloop(self, session):
+        outcome = yield
+        deferred, self._deferred = self._deferred, []
+        if outcome.excinfo is not None or session.shouldfail or session.shouldstop:
+            return
+        for position, (item, attempt) in enumerate(deferred):
+            nextitem = deferred[position + 1][0] if position + 1 < len(deferred) else None
+            _point_xdist_at(session, item)
+            item.ihook.pytest_runtest_logstart(nodeid=item.nodeid, location=item.location)
+            self._run(item, nextitem, attempt, False)
+            item.ihook.pytest_runtest_logfinish(nodeid=item.nodeid, location=item.location)
+
+    def _run(self, item, nextitem, attempt: int, defer: bool) -> None:
+        while True:
+            reports = runtestprotocol(item, nextitem=nextitem, log=False)
+            failure = next((report for report in reports if report.failed), None)
+            kind = getattr(failure, "failure_kind", None)
+            retry = kind in RETRIED and attempt < self.max_reruns
+            if retry:
+                self.counters[kind] += 1
+                for report in reports:
+                    if report.failed:
+                        report.outcome = "rerun"
+            elif attempt and failure is None:
+                self.counters["recovered"] += 1
+            for report in reports:
+                item.ihook.pytest_runtest_logreport(report=report)
+            if not retry:
+                return
+            attempt += 1
+            if defer:
+                self.counters["deferred"] += 1
+                self._deferred.append((item, attempt))
+                return
+            delay = self.delay(attempt)
+            if delay:
+                time.sleep(delay)
+
+    def pytest_report_teststatus(self, report):
+        if report.outcome == "rerun":
+            return "rerun", "R", ("RERUN", {"yellow": True})
+        return None
+
+    def pytest_runtest_logreport(self, report) -> None:
+        if not self.record or (report.when == "setup" and report.skipped):
+            return
+        self._needed_rerun[report.nodeid] = self._needed_rerun.get(report.nodeid, False) or report.outcome == "rerun"
+
+    def pytest_sessionfinish(self, session) -> None:
+        if self.history is None or not self.record:
+            return
+        for nodeid, needed_rerun in self._needed_rerun.items():
+            self.history.add(nodeid, needed_rerun)
+        self.history.save()
+
+
+def _point_xdist_at(session, item) -> None:
+    # An xdist worker tags each report with the index of the item it is running; deferred reruns
+    # happen after its loop, so it has to be told which item the following reports belong to.
+    for plugin in session.config.pluginmanager.get_plugins():
+        if type(plugin).__name__ == "WorkerInteractor":
+            plugin.item_index = session.items.index(item)
@@ -0,0 +1,180 @@
+"""Render a paginated HTML report from a results JSONL file (see utils/results_sink.py).
+
+    python -m utils.results_report reports/results.jsonl --output reports/html --page-size 500
+
+The file is read once, line by line. Only the current page, the per-page summaries and a capped
+list of failures are held in memory, so very large runs render in bounded memory.
+"""
+import argparse
+import html
+import json
+import os
+from typing import Any, Dict, List
+
+# Failures linked from the index page; beyond this they are only reachable through the pages.
+MAX_INDEX_FAILURES = 1000
+OUTCOMES = ("passed", "failed", "error", "skipped", "rerun")
+
+_STYLE = """
+body { font-family: Helvetica, Arial, sans-serif; font-size: 12px; margin: 16px; }
+table { border-collapse: collapse; width: 100%; }
+th, td { border: 1px solid #e6e6e6; padding: 4px 6px; text-align: left; vertical-align: top; }
+th { background: #f5f5f5; }
+.passed { color: green; } .failed, .error { color: red; } .skipped, .rerun { color: orange; }
+pre { white-space: pre-wrap; max-height: 400px; overflow: auto; background: #fafafa; margin: 4px 0; }
+nav { margin: 8px 0; }
+"""
+
+
+def _page_name(number: int) -> str:
+    return f"page-{number:05d}.html"
+
+
+def _document(title: str, body: str) -> str:
+    return (f"<!DOCTYPE html><html><head><meta charset=\"utf-8\"><title>{html.escape(title)}</title>"
+            f"<style>{_STYLE}</style></head><body>{body}</body></html>")
+
+
+def _nav(number: int, pages: int) -> str:
+    links = ['<a href="index.html">Index</a>']
+    if number > 1:
+        links.append(f'<a href="{_page_name(number - 1)}">&laquo; Previous</a>')
+    if number < pages:
+        links.append(f'<a href="{_page_name(number + 1)}">Next &raquo;</a>')
+    return f"<nav>{' | '.join(links)} &nbsp; page {number}</nav>"
+
+
+def _row(result: Dict[str, Any], index: int, artifact_prefix: str) -> str:
+    outcome = result.get("outcome", "")
+    startup = result.get("startup_time")
+    artifacts = " ".join(
+        f'<a href="{html.escape(artifact_prefix + path)}">{html.escape(label)}</a>'
+        for label, path in result.get("artifacts", [])
+    )
+    details = ""
+    if result.get("longrepr"):
+        details = f"<details><summary>details</summary><pre>{html.escape(result['longrepr'])}</pre></details>"
+    return (
+        f'<tr id="r{index}"><td class="{outcome}">{outcome}</td><td>{html.escape(result["nodeid"])}{details}</td>'
+        f"<td>{html.escape(str(result.get('browser', '')))}</td>"
+        f"<td>{result.get('duration', 0):.2f}</td>"
+        f"<td>{'' if startup is None else f'{startup:.2f}'}</td>"
+        f"<td>{html.escape(str(result.get('worker', '')))}</td><td>{artifacts}</td></tr>"
+    )
+
+
+class _PageWriter:
+    """Writes one page of rows at a time"""
+
+    def __init__(self, output: str, artifact_prefix: str):
+        self.output = output
+        self.artifact_prefix = artifact_prefix
+        self.number = 0
+        self.rows: List[str] = []
+        self.summaries: List[Dict[str, Any]] = []
+
+    def add(self, result: Dict[str, Any], index: int) -> None:
+        if not self.rows:
+            self.number += 1
+            self.summaries.append({"first": result["nodeid"], "last": "", "counts": dict.fromkeys(OUTCOMES, 0)})
+        self.rows.append(_row(result, index, self.artifact_prefix))
+        summary = self.summaries[-1]
+        summary["last"] = result["nodeid"]
+        outcome = result.get("outcome")
+        summary["counts"][outcome] = summary["counts"].get(outcome, 0) + 1
+
+    def flush(self, last: bool = False) -> None:
+        if not self.rows:
+            return
+        # The "next" link of the last page is written before the total is known; it is left out on the final page.
+        pages = self.number if last else self.number + 1
+        body = (
+            f"<h1>Results, page {self.number}</h1>{_nav(self.number, pages)}"
+            "<table><tr><th>Result</th><th>Test</th><th>Browser</th><th>Duration (s)</th>"
+            "<th>Startup (s)</th><th>Worker</th><th>Artifacts</th></tr>"
+            + "".join(self.rows) + "</table>" + _nav(self.number, pages)
+        )
+        with open(os.path.join(self.output, _page_name(self.number)), "w", encoding="utf-8") as f:
+            f.write(_document(f"Results page {self.number}", body))
+        self.rows = []
+
+
+def render(results_path: str, output: str, page_size: int = 500) -> str:
+    """Render index.html plus one page per `page_size` results into `output`; returns the index path"""
+    os.makedirs(output, exist_ok=True)
+    # Pages of an earlier, longer run would otherwise stay reachable by URL.
+    for name in os.listdir(output):
+        if name.startswith("page-") and name.endswith(".html"):
+            os.remove(os.path.join(output, name))
+    # Artifact paths in the results are relative to the results file.
+    prefix = os.path.relpath(os.path.dirname(os.path.abspath(results_path)), os.path.abspath(output))
+    prefix = "" if prefix == "." else prefix.replace(os.sep, "/") + "/"
+    pages = _PageWriter(output, prefix)
+    totals = dict.fromkeys(OUTCOMES, 0)
+    browsers: Dict[str, Dict[str, int]] = {}
+    failures: List[str] = []
+    total_duration = 0.0
+    count = 0
+    with open(results_path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            result = json.loads(line)
+            count += 1
+            if pages.rows and len(pages.rows) >= page_size:
+                pages.flush()
+            pages.add(result, count)
+            outcome = result.get("outcome", "passed")
+            totals[outcome] = totals.get(outcome, 0) + 1
+            browser = browsers.setdefault(str(result.get("browser", "N/A")), dict.fromkeys(OUTCOMES, 0))
+            browser[outcome] = browser.get(outcome, 0) + 1
+            total_duration += result.get("duration", 0)
+            if outcome in ("failed", "error") and len(failures) < MAX_INDEX_FAILURES:
+                failures.append(
+                    f'<li><a href="{_page_name(pages.number)}#r{count}">{html.escape(result["nodeid"])}</a></li>'
+                )
+    pages.flush(last=True)
+
+    header = "".join(f"<th>{outcome}</th>" for outcome in OUTCOMES)
+    body = [
+        "<h1>Test Results</h1>",
+        f"<p>{count} results, {total_duration:.1f}s of test time, {pages.number} pages.</p>",
+        f"<table><tr><th>Total</th>{header}</tr><tr><td>{count}</td>",
+        "".join(f'<td class="{outcome}">{totals.get(outcome, 0)}</td>' for outcome in OUTCOMES),
+        f"</tr></table><h2>By browser</h2><table><tr><th>Browser</th>{header}</tr>",
+    ]
+    for name, counts in sorted(browsers.items()):
+        cells = "".join(f"<td>{counts.get(outcome, 0)}</td>" for outcome in OUTCOMES)
+        body.append(f"<tr><td>{html.escape(name)}</td>{cells}</tr>")
+    body.append("</table>")
+    if failures:
+        more = totals["failed"] + totals["error"] - len(failures)
+        body.append(f"<h2>Failures</h2><ul>{''.join(failures)}</ul>")
+        if more > 0:
+            body.append(f"<p>{more} more failures are listed on the pages only.</p>")
+    body.append(f"<h2>Pages</h2><table><tr><th>Page</th><th>From</th><th>To</th>{header}</tr>")
+    for number, summary in enumerate(pages.summaries, start=1):
+        body.append(
+            f'<tr><td><a href="{_page_name(number)}">{number}</a></td><td>{html.escape(summary["first"])}</td>'
+            f"<td>{html.escape(summary['last'])}</td>"
+            + "".join(f"<td>{summary['counts'].get(outcome, 0)}</td>" for outcome in OUTCOMES) + "</tr>"
+        )
+    body.append("</table>")
+    index_path = os.path.join(output, "index.html")
+    with open(index_path, "w", encoding="utf-8") as f:
+        f.write(_document("Test Results", "".join(body)))
+    return index_path
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Render a paginated HTML report from a results JSONL file")
+    parser.add_argument("results", help="Results JSONL file written during the run")
+    parser.add_argument("--output", default=os.path.join("reports", "html"), help="Directory for the HTML pages")
+    parser.add_argument("--page-size", type=int, default=500, help="Results per page")
+    options = parser.parse_args(argv)
+    print(render(options.results, options.output, options.page_size))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+import json
+import os
+import time
+from typing import Any, Dict, Optional
+
+import pytest
+
+# Longest failure text kept per result line.
+MAX_LONGREPR_CHARS = 20000
+
+
+class ResultsSink:
+    """pytest plugin that appends one JSON line per finished test to a results file.
+
+    It is registered only in the process that sees every report (the xdist controller, or the
+    single process of a plain run), so workers never write to the file and nothing needs merging.
+    Memory is bounded by the tests currently running: phases are buffered until teardown.
+    """
+
+    def __init__(self, path: str, render_dir: Optional[str] = None, page_size: int = 500):
+        self.path = path
+        self.render_dir = render_dir
+        self.page_size = page_size
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._file = open(path, "w", encoding="utf-8", buffering=1)
+
+    @pytest.hookimpl(trylast=True)
+    def pytest_runtest_logreport(self, report) -> None:
+        if report.when == "setup" and report.nodeid in self._pending:
+            # A rerun attempt whose teardown was never reported; record it before the next attempt starts.
+            self._write(self._pending.pop(report.nodeid))
+        result = self._pending.setdefault(report.nodeid, {
+            "nodeid": report.nodeid,
+            "outcome": "passed",
+            "durations": {},
+        })
+        result["durations"][report.when] = round(report.duration, 4)
+        for name in ("browser", "launch_profile", "startup_time", "instrumentation"):
+            value = getattr(report, name, None)
+            if value is not None:
+                result[name] = value
+        worker = getattr(report, "worker_id", None)
+        if worker:
+            result["worker"] = worker
+        if getattr(report, "artifacts", None):
+            result["artifacts"] = [[label, self._relative(path)] for label, path in report.artifacts if path]
+        if report.outcome == "rerun":
+            result["outcome"] = "rerun"
+        elif report.failed and result["outcome"] not in ("failed", "error"):
+            result["outcome"] = "failed" if report.when == "call" else "error"
+            result["longrepr"] = str(report.longrepr)[:MAX_LONGREPR_CHARS]
+        elif report.skipped and result["outcome"] == "passed":
+            result["outcome"] = "skipped"
+            result["longrepr"] = str(report.longrepr)[:MAX_LONGREPR_CHARS]
+        if report.when == "teardown":
+            self._write(self._pending.pop(report.nodeid))
+
+    def pytest_sessionfinish(self, session) -> None:
+        # Tests interrupted before teardown still get a line.
+        for result in self._pending.values():
+            self._write(result)
+        self._pending.clear()
+        self._file.close()
+        if self.render_dir:
+            from utils.results_report import render
+            render(self.path, self.render_dir, self.page_size)
+
+    def _relative(self, path: str) -> str:
+        # Artifact paths are stored relative to the results file so the run directory can be moved.
+        return os.path.relpath(path, os.path.dirname(os.path.abspath(self.path))).replace(os.sep, "/")
+
+    def _write(self, result: Dict[str, Any]) -> None:
+        result["duration"] = round(sum(result["durations"].values()), 4)
+        result["finished"] = round(time.time(), 3)
+        self._file.write(json.dumps(result, default=str) + "\n")
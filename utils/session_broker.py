@@ -0,0 +1,255 @@
+import contextlib
+import os
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, List, Optional
+
+from selenium.webdriver.chrome.remote_connection import ChromeRemoteConnection
+from selenium.webdriver.edge.remote_connection import EdgeRemoteConnection
+from selenium.webdriver.firefox.remote_connection import FirefoxRemoteConnection
+from selenium.webdriver.remote.client_config import ClientConfig
+from selenium.webdriver.remote.remote_connection import RemoteConnection
+from selenium.webdriver.remote.webdriver import WebDriver
+
+if os.name == "nt":
+    import msvcrt
+else:
+    import fcntl
+
+
+def _try_lock(handle) -> bool:
+    try:
+        if os.name == "nt":
+            handle.seek(0)
+            msvcrt.locking(handle.fileno(), msvcrt.LK_NBLCK, 1)
+        else:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        return True
+    except OSError:
+        return False
+
+
+def _unlock(handle) -> None:
+    try:
+        if os.name == "nt":
+            handle.seek(0)
+            msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+    except OSError:
+        pass
+
+
+class SessionSlot:
+    """One of the capped remote session slots, held by this process until release()"""
+
+    def __init__(self, slots: "SessionSlots", index: int, handle, queue_wait: float):
+        self.index = index
+        self.queue_wait = queue_wait
+        self._slots = slots
+        self._handle = handle
+
+    def contended(self) -> bool:
+        """True when another session is waiting for a free slot"""
+        return self._slots.waiting() > 0
+
+    def release(self) -> None:
+        if self._handle is None:
+            return
+        _unlock(self._handle)
+        self._handle.close()
+        self._handle = None
+
+
+class SessionSlots:
+    """Caps concurrent remote sessions across processes with one lock file per slot.
+
+    The operating system drops the locks of a process that dies, so a crashed xdist worker never
+    keeps a slot. Processes waiting for a slot hold a lock on their own file in the same directory,
+    which lets slot holders see the queue and hand their slot over.
+    """
+
+    def __init__(self, directory: str, max_sessions: int, poll_interval: float = 0.2):
+        self.directory = directory
+        self.max_sessions = max_sessions
+        self.poll_interval = poll_interval
+        os.makedirs(directory, exist_ok=True)
+
+    def acquire(self, timeout: float = 600.0, evict_idle: Optional[Callable[[], int]] = None) -> SessionSlot:
+        """Wait for a free slot; raises TimeoutError after `timeout` seconds.
+
+        When every slot is taken, `evict_idle` is called once before waiting; it should quit the idle
+        sessions of this process and return how many it quit, since this process would otherwise wait on itself.
+        """
+        started = time.monotonic()
+        waiter = None
+        try:
+            while True:
+                for index in range(self.max_sessions):
+                    handle = open(os.path.join(self.directory, f"slot-{index}.lock"), "a+")
+                    if _try_lock(handle):
+                        return SessionSlot(self, index, handle, time.monotonic() - started)
+                    handle.close()
+                if evict_idle is not None:
+                    evicted, evict_idle = evict_idle(), None
+                    if evicted:
+                        continue
+                if waiter is None:
+                    waiter = self._register_waiter()
+                if time.monotonic() - started > timeout:
+                    raise TimeoutError(
+                        f"No remote session slot became free within {timeout}s (max_sessions: {self.max_sessions})"
+                    )
+                time.sleep(self.poll_interval)
+        finally:
+            if waiter is not None:
+                # Removed while still locked, so other processes never take it for a stale waiter. Never raise
+                # here: the slot is already locked. (Windows cannot remove an open file; waiting() cleans it up.)
+                with contextlib.suppress(OSError):
+                    os.remove(waiter.name)
+                _unlock(waiter)
+                waiter.close()
+
+    def waiting(self) -> int:
+        """Number of sessions currently waiting for a slot, in any process"""
+        count = 0
+        for name in os.listdir(self.directory):
+            if not name.startswith("waiting-"):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                handle = open(path, "a+")
+            except OSError:
+                continue
+            with handle:
+                if not _try_lock(handle):
+                    count += 1
+                    continue
+                # Left behind by a process that died while waiting.
+                _unlock(handle)
+            with contextlib.suppress(OSError):
+                os.remove(path)
+        return count
+
+    def _register_waiter(self):
+        handle = open(os.path.join(self.directory, f"waiting-{os.getpid()}-{uuid.uuid4().hex[:8]}.lock"), "a+")
+        _try_lock(handle)
+        return handle
+
+
+class _SharedConnection:
+    """Hub connection shared by every session of the process, so HTTP connections stay alive between sessions"""
+
+    def close(self) -> None:
+        # WebDriver.quit() closes its executor; the shared one is only closed by the broker.
+        pass
+
+    def shutdown(self) -> None:
+        super().close()
+
+
+class _HubConnection(_SharedConnection, RemoteConnection):
+    pass
+
+
+# The browser-specific connections add vendor commands (e.g. CDP, which DriverPool.reset uses on Chromium).
+class _ChromeHubConnection(_SharedConnection, ChromeRemoteConnection):
+    pass
+
+
+class _EdgeHubConnection(_SharedConnection, EdgeRemoteConnection):
+    pass
+
+
+class _FirefoxHubConnection(_SharedConnection, FirefoxRemoteConnection):
+    pass
+
+
+_HUB_CONNECTIONS = {
+    "chrome": _ChromeHubConnection,
+    "MicrosoftEdge": _EdgeHubConnection,
+    "firefox": _FirefoxHubConnection,
+}
+
+
+class BrokeredRemote(WebDriver):
+    """Remote session opened by a RemoteSessionBroker; quitting it frees its slot"""
+
+    slot: Optional[SessionSlot] = None
+
+    def quit(self) -> None:
+        try:
+            super().quit()
+        finally:
+            if self.slot is not None:
+                self.slot.release()
+                self.slot = None
+
+
+def slot_wanted(driver) -> bool:
+    """True when another session is waiting for the slot held by this driver"""
+    return isinstance(driver, BrokeredRemote) and driver.slot is not None and driver.slot.contended()
+
+
+class RemoteSessionBroker:
+    """Opens remote sessions on one hub (cloud provider, Selenium Grid or stub server).
+
+    New sessions wait for a free slot when `slots` caps the number of parallel sessions, and all
+    sessions of a browser share one connection to the hub whose HTTP connections are kept alive.
+    Reusing sessions between tests is left to the DriverPool, which resets them.
+    """
+
+    def __init__(self, hub_url: str, slots: Optional[SessionSlots] = None, slot_timeout: float = 600.0,
+                 timeout: int = 120):
+        self.hub_url = hub_url
+        self.slots = slots
+        self.slot_timeout = slot_timeout
+        self.timeout = timeout
+        self._connections: Dict[str, RemoteConnection] = {}
+        self._lock = threading.Lock()
+        self.sessions: List[Dict[str, float]] = []
+
+    def open(self, options, evict_idle: Optional[Callable[[], int]] = None) -> BrokeredRemote:
+        """Start a session with the given browser options once a slot is free (see SessionSlots.acquire)"""
+        slot = self.slots.acquire(self.slot_timeout, evict_idle) if self.slots is not None else None
+        started = time.perf_counter()
+        try:
+            driver = BrokeredRemote(command_executor=self._connection(options), options=options)
+        except Exception:
+            if slot is not None:
+                slot.release()
+            raise
+        driver.slot = slot
+        with self._lock:
+            self.sessions.append({
+                "queue_wait": slot.queue_wait if slot is not None else 0.0,
+                "create": time.perf_counter() - started,
+            })
+        return driver
+
+    def _connection(self, options) -> RemoteConnection:
+        browser_name = options.capabilities.get("browserName", "")
+        with self._lock:
+            if browser_name not in self._connections:
+                connection_class = _HUB_CONNECTIONS.get(browser_name, _HubConnection)
+                self._connections[browser_name] = connection_class(
+                    remote_server_addr=self.hub_url,
+                    client_config=ClientConfig(self.hub_url, keep_alive=True, timeout=self.timeout),
+                )
+            return self._connections[browser_name]
+
+    def stats(self) -> Dict[str, Any]:
+        """Plain data so xdist workers can send it to the controller"""
+        with self._lock:
+            return {
+                "hub": self.hub_url,
+                "max_sessions": self.slots.max_sessions if self.slots is not None else 0,
+                "sessions": list(self.sessions),
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            for connection in self._connections.values():
+                connection.shutdown()
+            self._connections.clear()
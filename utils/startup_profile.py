@@ -0,0 +1,52 @@
+import sys
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, List
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+class StartupProfile:
+    """Durations of the start-up phases of one pytest process (imports, collection, lazy UI imports)"""
+
+    def __init__(self):
+        self.phases: Dict[str, float] = {}
+
+    def add(self, name: str, seconds: float) -> None:
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    @contextmanager
+    def phase(self, name: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - started)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Phases plus what the process has loaded so far; plain data so xdist workers can send it back"""
+        max_rss = None
+        if resource is not None:
+            # ru_maxrss is in KiB on Linux and in bytes on macOS.
+            max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / (1024 * 1024 if sys.platform == "darwin" else 1024)
+        return {
+            "phases": dict(self.phases),
+            # The WebDriver client is the expensive part of Selenium (selenium.webdriver.common.by alone is cheap).
+            "webdriver_loaded": "selenium.webdriver.remote.webdriver" in sys.modules,
+            "modules": len(sys.modules),
+            "max_rss_mb": max_rss,
+        }
+
+
+def format_startup_profile(name: str, snapshot: Dict[str, Any]) -> List[str]:
+    """Terminal summary lines for one process"""
+    phases = ", ".join(f"{phase}: {seconds:.3f}s" for phase, seconds in snapshot["phases"].items())
+    rss = snapshot.get("max_rss_mb")
+    return [
+        f"{name}: {phases or 'no phases recorded'}",
+        f"{' ' * len(name)}  WebDriver loaded: {'yes' if snapshot['webdriver_loaded'] else 'no'}, "
+        f"modules: {snapshot['modules']}, max RSS: {'n/a' if rss is None else f'{rss:.0f} MB'}",
+    ]
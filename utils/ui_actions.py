@@ -1,31 +1,62 @@
 from selenium import webdriver
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.action_chains import ActionChains
 from selenium.webdriver.common.keys import Keys
 from selenium.common.exceptions import TimeoutException, ElementClickInterceptedException
-from typing import Optional, Union, List
-import yaml
-import os
+from typing import Dict, Mapping, Optional, Sequence, Union, List
+import functools
+import weakref
+from utils.config import get_config
+from utils.waits import ALL_PRESENT, CLICKABLE, PRESENT, WaitEngine
+from utils.batch_read import read_fields
+
+# The current DOM snapshot of each driver, shared by UIActions and page objects so any interaction invalidates it.
+_snapshots = weakref.WeakKeyDictionary()
+
+def capture_snapshot(driver):
+    """Capture a DomSnapshot of the driver's page, replacing (and invalidating) its previous one"""
+    from utils.dom_snapshot import DomSnapshot
+    invalidate_snapshot(driver)
+    snapshot = _snapshots[driver] = DomSnapshot.capture(driver)
+    return snapshot
+
+def invalidate_snapshot(driver) -> None:
+    """Mark the driver's current DOM snapshot (if any) as stale"""
+    snapshot = _snapshots.pop(driver, None)
+    if snapshot is not None:
+        snapshot.invalidate()
+
+def _interacts(method):
+    """Marks a UIActions method that may change the page, invalidating any DOM snapshot"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        self.invalidate_snapshot()
+        return method(self, *args, **kwargs)
+    return wrapper
 
 class UIActions:
     def __init__(self, driver):
         self.driver = driver
         self.default_timeout = self._get_default_timeout()
+        self.waits = WaitEngine(self.driver, self._get_wait_strategy())
         self.actions = ActionChains(self.driver)
 
     def _get_default_timeout(self) -> int:
-        """Read default timeout from config file"""
+        """Read default timeout from the run configuration"""
         try:
-            config_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'config', 'config.yaml')
-            with open(config_path, 'r') as file:
-                config = yaml.safe_load(file)
-                return config.get('selenium', {}).get('timeout', 10)  # Default to 10 if not specified
+            return get_config().timeout
         except Exception as e:
             print(f"Warning: Could not load timeout from config file: {e}")
             return 10
 
+    def _get_wait_strategy(self) -> str:
+        """Read the wait strategy (observer, adaptive or polling) from the run configuration"""
+        try:
+            return get_config().get('selenium', {}).get('wait_strategy', 'observer')
+        except Exception:
+            return 'observer'
+
     def set_default_timeout(self, timeout: int) -> None:
         """Set a new default timeout"""
         self.default_timeout = timeout
@@ -33,42 +64,41 @@ class UIActions:
     def _wait_for_element(self, locator: tuple, timeout: Optional[int] = None) -> any:
         """Wait for element to be present and visible"""
         wait_timeout = timeout if timeout is not None else self.default_timeout
-        return WebDriverWait(self.driver, wait_timeout).until(
-            EC.presence_of_element_located(locator)
-        )
+        return self.waits.until(locator, PRESENT, wait_timeout)
 
     def _wait_for_elements(self, locator: tuple, timeout: Optional[int] = None) -> List:
         """Wait for elements to be present"""
         wait_timeout = timeout if timeout is not None else self.default_timeout
-        return WebDriverWait(self.driver, wait_timeout).until(
-            EC.presence_of_all_elements_located(locator)
-        )
+        return self.waits.until(locator, ALL_PRESENT, wait_timeout)
 
     def _wait_for_clickable(self, locator: tuple, timeout: Optional[int] = None) -> any:
         """Wait for element to be clickable"""
         wait_timeout = timeout if timeout is not None else self.default_timeout
-        return WebDriverWait(self.driver, wait_timeout).until(
-            EC.element_to_be_clickable(locator)
-        )
+        return self.waits.until(locator, CLICKABLE, wait_timeout)
 
     # Basic Navigation
+    @_interacts
     def open_url(self, url: str) -> None:
         """Navigate to specified URL"""
         self.driver.get(url)
 
+    @_interacts
     def refresh_page(self) -> None:
         """Refresh current page"""
         self.driver.refresh()
 
+    @_interacts
     def go_back(self) -> None:
         """Navigate back"""
         self.driver.back()
 
+    @_interacts
     def go_forward(self) -> None:
         """Navigate forward"""
         self.driver.forward()
 
     # Click Actions
+    @_interacts
     def click(self, locator: tuple, timeout: Optional[int] = None) -> None:
         """Click element with automatic wait"""
         element = self._wait_for_clickable(locator, timeout)
@@ -78,17 +108,20 @@ class UIActions:
             # If regular click fails, try JavaScript click
             self.driver.execute_script("arguments[0].click();", element)
 
+    @_interacts
     def double_click(self, locator: tuple, timeout: Optional[int] = None) -> None:
         """Double click element"""
         element = self._wait_for_clickable(locator, timeout)
         self.actions.double_click(element).perform()
 
+    @_interacts
     def right_click(self, locator: tuple, timeout: Optional[int] = None) -> None:
         """Right click element"""
         element = self._wait_for_clickable(locator, timeout)
         self.actions.context_click(element).perform()
 
     # Input Actions
+    @_interacts
     def type_text(self, locator: tuple, text: str, clear_first: bool = True, timeout: Optional[int] = None) -> None:
         """Type text into element"""
         element = self._wait_for_element(locator, timeout)
@@ -96,22 +129,26 @@ class UIActions:
             element.clear()
         element.send_keys(text)
 
+    @_interacts
     def clear_text(self, locator: tuple, timeout: Optional[int] = None) -> None:
         """Clear text from element"""
         element = self._wait_for_element(locator, timeout)
         element.clear()
 
+    @_interacts
     def press_key(self, locator: tuple, key: str, timeout: Optional[int] = None) -> None:
         """Press specific key on element"""
         element = self._wait_for_element(locator, timeout)
         element.send_keys(getattr(Keys, key.upper()))
 
     # Mouse Actions
+    @_interacts
     def hover(self, locator: tuple, timeout: Optional[int] = None) -> None:
         """Hover over element"""
         element = self._wait_for_element(locator, timeout)
         self.actions.move_to_element(element).perform()
 
+    @_interacts
     def drag_and_drop(self, source_locator: tuple, target_locator: tuple, timeout: Optional[int] = None) -> None:
         """Drag and drop element"""
         source = self._wait_for_element(source_locator, timeout)
@@ -119,6 +156,7 @@ class UIActions:
         self.actions.drag_and_drop(source, target).perform()
 
     # Frame Handling
+    @_interacts
     def switch_to_frame(self, frame_reference: Union[str, int, tuple], timeout: Optional[int] = None) -> None:
         """Switch to frame by index, name/ID, or locator"""
         if isinstance(frame_reference, tuple):
@@ -127,16 +165,19 @@ class UIActions:
         else:
             self.driver.switch_to.frame(frame_reference)
 
+    @_interacts
     def switch_to_default_content(self) -> None:
         """Switch back to default content"""
         self.driver.switch_to.default_content()
 
     # Window Handling
+    @_interacts
     def switch_to_window(self, window_index: int = -1) -> None:
         """Switch to window by index (default: last window)"""
         handles = self.driver.window_handles
         self.driver.switch_to.window(handles[window_index])
 
+    @_interacts
     def close_current_window(self) -> None:
         """Close current window"""
         self.driver.close()
@@ -178,13 +219,34 @@ class UIActions:
         element = self._wait_for_element(locator, timeout)
         return element.get_attribute(attribute)
 
+    def read_fields(self, fields: Mapping[str, tuple], properties: Union[str, Sequence[str]] = ("text",),
+                    timeout: Optional[int] = None) -> Dict:
+        """Read text/attribute:<name>/visible/enabled/selected/present of many locators in one round trip"""
+        wait_timeout = timeout if timeout is not None else self.default_timeout
+        return read_fields(self.driver, fields, properties, waits=self.waits, timeout=wait_timeout)
+
+    # DOM Snapshot
+    def snapshot(self):
+        """Capture the DOM (with visibility and open shadow roots) in one call for local, read-only queries.
+
+        The snapshot is invalidated automatically by the next interaction through UIActions
+        (on any UIActions instance of the same driver) or by the next snapshot of the driver.
+        """
+        return capture_snapshot(self.driver)
+
+    def invalidate_snapshot(self) -> None:
+        """Mark the current DOM snapshot (if any) as stale"""
+        invalidate_snapshot(self.driver)
+
     # Select Operations
+    @_interacts
     def select_by_text(self, locator: tuple, text: str, timeout: Optional[int] = None) -> None:
         """Select dropdown option by visible text"""
         from selenium.webdriver.support.ui import Select
         element = self._wait_for_element(locator, timeout)
         Select(element).select_by_visible_text(text)
 
+    @_interacts
     def select_by_value(self, locator: tuple, value: str, timeout: Optional[int] = None) -> None:
         """Select dropdown option by value"""
         from selenium.webdriver.support.ui import Select
@@ -192,36 +254,47 @@ class UIActions:
         Select(element).select_by_value(value)
 
     # JavaScript Operations
+    @_interacts
     def execute_script(self, script: str, *args) -> any:
         """Execute JavaScript code"""
         return self.driver.execute_script(script, *args)
 
+    @_interacts
     def scroll_into_view(self, locator: tuple, timeout: Optional[int] = None) -> None:
         """Scroll element into view"""
         element = self._wait_for_element(locator, timeout)
         self.execute_script("arguments[0].scrollIntoView(true);", element)
 
     # Alert Handling
+    def _wait_for_alert(self, timeout: Optional[int] = None) -> None:
+        """Wait for an alert to be present"""
+        self.waits.until_true(lambda: EC.alert_is_present()(self.driver), timeout or self.default_timeout,
+                              "Timed out waiting for alert")
+
+    @_interacts
     def accept_alert(self, timeout: Optional[int] = None) -> None:
         """Accept alert"""
-        WebDriverWait(self.driver, timeout or self.default_timeout).until(EC.alert_is_present())
+        self._wait_for_alert(timeout)
         self.driver.switch_to.alert.accept()
 
+    @_interacts
     def dismiss_alert(self, timeout: Optional[int] = None) -> None:
         """Dismiss alert"""
-        WebDriverWait(self.driver, timeout or self.default_timeout).until(EC.alert_is_present())
+        self._wait_for_alert(timeout)
         self.driver.switch_to.alert.dismiss()
 
     def get_alert_text(self, timeout: Optional[int] = None) -> str:
         """Get alert text"""
-        WebDriverWait(self.driver, timeout or self.default_timeout).until(EC.alert_is_present())
+        self._wait_for_alert(timeout)
         return self.driver.switch_to.alert.text
 
     # Cookie Handling
+    @_interacts
     def add_cookie(self, cookie_dict: dict) -> None:
         """Add cookie to browser"""
         self.driver.add_cookie(cookie_dict)
 
+    @_interacts
     def delete_all_cookies(self) -> None:
         """Delete all cookies"""
         self.driver.delete_all_cookies()
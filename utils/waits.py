@@ -0,0 +1,145 @@
+import time
+from selenium.common.exceptions import StaleElementReferenceException, TimeoutException, WebDriverException
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+from typing import Any, Callable, Optional
+from utils.locators import JS_HELPERS, to_query
+
+PRESENT = "present"
+ALL_PRESENT = "all_present"
+VISIBLE = "visible"
+CLICKABLE = "clickable"
+
+# Wait strategies (selenium.wait_strategy in config.yaml):
+#   observer - an in-page MutationObserver resolves as soon as the condition holds (one round trip)
+#   adaptive - client-side polling starting at 50 ms and backing off exponentially to 500 ms
+#   polling  - plain WebDriverWait with a fixed 500 ms poll interval
+STRATEGIES = ("observer", "adaptive", "polling")
+
+_EXPECTED_CONDITIONS = {
+    PRESENT: EC.presence_of_element_located,
+    ALL_PRESENT: EC.presence_of_all_elements_located,
+    VISIBLE: EC.visibility_of_element_located,
+    CLICKABLE: EC.element_to_be_clickable,
+}
+
+_OBSERVER_SCRIPT = JS_HELPERS + """
+var kind = arguments[0], query = arguments[1], condition = arguments[2], timeoutMs = arguments[3];
+var done = arguments[arguments.length - 1];
+function check() {
+    var elements = findAll(kind, query);
+    if (condition === 'all_present') { return elements.length ? elements : null; }
+    for (var i = 0; i < elements.length; i++) {
+        var el = elements[i];
+        if (condition === 'present' ||
+            (condition === 'visible' && isVisible(el)) ||
+            (condition === 'clickable' && isClickable(el))) {
+            return el;
+        }
+    }
+    return null;
+}
+var found = check();
+if (found) { done(found); return; }
+var finished = false, observer, ticker, timer;
+function finish(value) {
+    if (finished) { return; }
+    finished = true;
+    observer.disconnect();
+    clearInterval(ticker);
+    clearTimeout(timer);
+    done(value);
+}
+observer = new MutationObserver(function () { var match = check(); if (match) { finish(match); } });
+observer.observe(document, {childList: true, subtree: true, attributes: true, characterData: true});
+// Visibility can also change through layout or CSS transitions without any DOM mutation.
+ticker = setInterval(function () { var match = check(); if (match) { finish(match); } }, 100);
+timer = setTimeout(function () { finish(null); }, timeoutMs);
+"""
+
+
+def poll(predicate: Callable[[], Any], timeout: float, message: str = "",
+         initial_interval: float = 0.05, max_interval: float = 0.5) -> Any:
+    """Call predicate until it returns a truthy value, backing off exponentially between calls"""
+    deadline = time.monotonic() + timeout
+    interval = initial_interval
+    while True:
+        try:
+            value = predicate()
+            if value:
+                return value
+        except StaleElementReferenceException:
+            pass
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise TimeoutException(message)
+        time.sleep(min(interval, remaining))
+        interval = min(interval * 2, max_interval)
+
+
+class WaitEngine:
+    """Waits for locators to meet a condition using the configured strategy"""
+
+    def __init__(self, driver, strategy: str = "observer"):
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unsupported wait strategy: {strategy}")
+        self.driver = driver
+        self.strategy = strategy
+        self._script_timeout: Optional[float] = None
+
+    def until(self, locator: tuple, condition: str = PRESENT, timeout: float = 10) -> Any:
+        """Return the element (or list of elements for ALL_PRESENT) once the condition holds"""
+        message = f"Timed out after {timeout}s waiting for {locator} to be {condition.replace('_', ' ')}"
+        if self.strategy == "polling":
+            return WebDriverWait(self.driver, timeout).until(_EXPECTED_CONDITIONS[condition](locator), message)
+        started = time.monotonic()
+        if self.strategy == "observer":
+            try:
+                result = self._observe(locator, condition, timeout)
+                if result:
+                    return result
+                raise TimeoutException(message)
+            except (TimeoutException, ValueError):
+                raise
+            except WebDriverException:
+                # Navigation or an unsupported driver aborted the script; poll for the remaining time.
+                pass
+        remaining = max(timeout - (time.monotonic() - started), 0)
+        return poll(lambda: self._check(locator, condition), remaining, message)
+
+    def until_true(self, predicate: Callable[[], Any], timeout: float = 10, message: str = "") -> Any:
+        """Wait for an arbitrary predicate (e.g. an alert) with adaptive polling"""
+        if self.strategy == "polling":
+            return WebDriverWait(self.driver, timeout).until(lambda driver: predicate(), message)
+        return poll(predicate, timeout, message)
+
+    def _observe(self, locator: tuple, condition: str, timeout: float) -> Any:
+        kind, query = to_query(locator)
+        # The driver's script timeout must outlast the in-page timer. It is raised only for this wait
+        # when too short, and restored afterwards so pooled drivers keep their own setting.
+        if self._script_timeout is None:
+            script_timeout = self.driver.timeouts.script
+            # A null script timeout means no limit.
+            self._script_timeout = float("inf") if script_timeout is None else script_timeout
+        needed = timeout + 5
+        raised = self._script_timeout < needed
+        if raised:
+            self.driver.set_script_timeout(needed)
+        try:
+            return self.driver.execute_async_script(_OBSERVER_SCRIPT, kind, query, condition, int(timeout * 1000))
+        finally:
+            if raised:
+                self.driver.set_script_timeout(self._script_timeout)
+
+    def _check(self, locator: tuple, condition: str) -> Any:
+        elements = self.driver.find_elements(*locator)
+        if condition == ALL_PRESENT:
+            return elements or None
+        for element in elements:
+            if condition == PRESENT:
+                return element
+            if condition == VISIBLE and element.is_displayed():
+                return element
+            if condition == CLICKABLE and element.is_displayed() and element.is_enabled():
+                return element
+        return None